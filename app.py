@@ -14,6 +14,11 @@ DATA_DIR.mkdir(exist_ok=True)
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from modules.case_datasets import start_prewarm
+
+# Datasets des cas business générés une fois, en arrière-plan, au démarrage du serveur
+start_prewarm()
+
 def load_custom_css():
     st.markdown("""
     <style>
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark du Générateur de Datasets
+Mesure, pour chaque type de dataset, taille et format d'export :
+débit de génération (lignes/s), pic de mémoire (RSS), taille du fichier
+et temps d'écriture. Les résultats sont écrits en JSON pour être comparés
+entre deux commits.
+
+Exemples :
+    python benchmark_datasets.py
+    python benchmark_datasets.py --sizes 10000 100000 --types "Données Marketing"
+    python benchmark_datasets.py --compare benchmarks/ancien.json benchmarks/nouveau.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le répertoire courant au path
+sys.path.insert(0, str(Path(__file__).parent))
+
+RESULTS_DIR = Path("benchmarks")
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_FORMATS = [
+    ("Parquet", "snappy"),
+    ("Parquet", "zstd"),
+    ("Feather (Arrow IPC)", "lz4"),
+    ("CSV compressé (gzip)", "gzip"),
+    ("CSV", "aucune"),
+]
+
+# Seuil de régression signalé par --compare (débit 20 % plus lent)
+REGRESSION_THRESHOLD = 0.20
+
+
+def _peak_rss_mb() -> float:
+    """Pic de mémoire résidente du processus courant (Mo)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sur macOS, en kilo-octets sur Linux
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(dataset_type: str, n_rows: int, formats: list, seed: int = 42) -> list:
+    """
+    Génère un dataset puis l'exporte dans chaque format
+
+    Exécuté dans un processus neuf pour que le pic RSS mesuré ne concerne
+    que ce cas.
+    """
+    from modules.dataset_engine import generate_dataset
+    from modules.export_formats import export_dataframe
+
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    df = generate_dataset(dataset_type, n_rows, seed=seed)
+    gen_s = time.perf_counter() - start
+    rss_generation = _peak_rss_mb()
+
+    results = []
+    for fmt, compression in formats:
+        start = time.perf_counter()
+        data = export_dataframe(df, fmt, compression)
+        write_s = time.perf_counter() - start
+
+        results.append({
+            "dataset_type": dataset_type,
+            "n_rows": n_rows,
+            "format": fmt,
+            "compression": compression,
+            "generation_s": round(gen_s, 4),
+            "rows_per_s": round(n_rows / gen_s) if gen_s > 0 else None,
+            "write_s": round(write_s, 4),
+            "output_bytes": len(data),
+            "baseline_rss_mb": round(rss_before, 1),
+            "generation_peak_rss_mb": round(rss_generation, 1),
+            "peak_rss_mb": round(_peak_rss_mb(), 1)
+        })
+        del data
+
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnu"
+
+
+def run_benchmark(types: list, sizes: list, formats: list) -> dict:
+    """Lance tous les cas (un processus par cas) et retourne le rapport complet"""
+    import numpy as np
+    import pandas as pd
+    from modules.dataset_engine import ENGINE_VERSION
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+
+    for dataset_type in types:
+        for n_rows in sizes:
+            with ctx.Pool(processes=1, maxtasksperchild=1) as pool:
+                case_results = pool.apply(run_case, (dataset_type, n_rows, formats))
+            results.extend(case_results)
+
+            first = case_results[0]
+            print(f"✅ {dataset_type:25s} {n_rows:>10,d} lignes  "
+                  f"{first['rows_per_s']:>12,d} lignes/s  pic RSS {first['peak_rss_mb']:>7.1f} Mo")
+            for r in case_results:
+                print(f"     {r['format']:22s} {r['compression']:8s} "
+                      f"{r['output_bytes'] / 1024**2:>8.2f} Mo  écriture {r['write_s']:.3f} s")
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "engine_version": ENGINE_VERSION,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "cpu_count": multiprocessing.cpu_count()
+        },
+        "results": results
+    }
+
+
+def _index(report: dict) -> dict:
+    return {(r["dataset_type"], r["n_rows"], r["format"], r["compression"]): r
+            for r in report["results"]}
+
+
+def compare_reports(old_path: str, new_path: str, threshold: float = REGRESSION_THRESHOLD) -> bool:
+    """
+    Compare deux rapports JSON
+
+    Returns:
+        True si aucune régression de débit ou de temps d'écriture au-delà du seuil
+    """
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"📊 {old['meta']['commit']} → {new['meta']['commit']}")
+    print()
+
+    old_index, new_index = _index(old), _index(new)
+    regressions = 0
+    for key, new_r in new_index.items():
+        old_r = old_index.get(key)
+        if not old_r:
+            continue
+
+        # rows_per_s vaut None si la génération a été trop rapide pour être mesurée
+        speed_ratio = (new_r["rows_per_s"] / old_r["rows_per_s"]
+                       if new_r["rows_per_s"] and old_r["rows_per_s"] else 1.0)
+        write_ratio = new_r["write_s"] / old_r["write_s"] if old_r["write_s"] else 1.0
+        size_ratio = new_r["output_bytes"] / old_r["output_bytes"]
+        regression = speed_ratio < 1 - threshold or write_ratio > 1 + threshold
+        regressions += regression
+
+        print(f"{'❌' if regression else '✅'} {key[0]:25s} {key[1]:>10,d} {key[2]:22s} {key[3]:8s} "
+              f"débit x{speed_ratio:.2f}  écriture x{write_ratio:.2f}  taille x{size_ratio:.2f}")
+
+    print()
+    if regressions:
+        print(f"⚠️  {regressions} régression(s) au-delà de {threshold:.0%}")
+    else:
+        print("✅ Aucune régression détectée")
+    return regressions == 0
+
+
+def main():
+    from modules.dataset_engine import available_dataset_types
+
+    parser = argparse.ArgumentParser(description="Benchmark du Générateur de Datasets")
+    parser.add_argument("--types", nargs="+", default=available_dataset_types(),
+                        help="Types de datasets à mesurer")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+                        help="Nombres de lignes à mesurer")
+    parser.add_argument("--output", help="Fichier JSON de sortie (défaut : benchmarks/bench_<date>_<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("ANCIEN", "NOUVEAU"),
+                        help="Compare deux rapports JSON au lieu de lancer le benchmark")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Seuil de régression pour --compare (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare_reports(*args.compare, threshold=args.threshold)
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK DU GÉNÉRATEUR DE DATASETS")
+    print("=" * 80)
+    print()
+
+    report = run_benchmark(args.types, args.sizes, DEFAULT_FORMATS)
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}_{report['meta']['commit']}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print()
+    print(f"📁 Résultats : {output}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,12 +1,15 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
 from modules.database import (
     create_business_case_submission, get_business_case_submissions
 )
+from modules.export_formats import format_selector, download_dataframe
+from modules.case_catalog import filter_options, find_cases, get_case
+from modules.case_datasets import CASE_DATASETS, get_case_dataset
+from modules.model_training import MODELS, TRAINING_CASES, train_case_models
 
 DB_AVAILABLE = True
 
@@ -18,110 +21,14 @@ tab1, tab2, tab3 = st.tabs(["📊 Cas Disponibles", "🎯 Mon Projet", "📝 Sou
 with tab1:
     st.header("Cas d'étude disponibles")
     
-    cas_studies = [
-        {
-            "id": 1,
-            "titre": "Analyse des Ventes E-commerce",
-            "niveau": "B1",
-            "domaine": "Retail",
-            "description": "Analysez les données de ventes d'une boutique en ligne pour identifier les tendances et opportunités.",
-            "objectifs": [
-                "Calculer le CA par mois et par catégorie",
-                "Identifier les produits les plus vendus",
-                "Analyser le comportement d'achat des clients",
-                "Créer des visualisations pertinentes"
-            ],
-            "competences": ["Pandas", "Visualisation", "Statistiques descriptives"],
-            "duree": "2-3 heures"
-        },
-        {
-            "id": 2,
-            "titre": "Prédiction du Churn Client",
-            "niveau": "B2",
-            "domaine": "Télécommunications",
-            "description": "Construisez un modèle pour prédire quels clients risquent de quitter l'entreprise.",
-            "objectifs": [
-                "Explorer et nettoyer les données",
-                "Feature engineering",
-                "Entraîner plusieurs modèles (Logistic Regression, Random Forest)",
-                "Comparer les performances",
-                "Proposer des recommandations business"
-            ],
-            "competences": ["Machine Learning", "Classification", "Feature Engineering"],
-            "duree": "4-6 heures"
-        },
-        {
-            "id": 3,
-            "titre": "Segmentation Client (RFM)",
-            "niveau": "B2",
-            "domaine": "Marketing",
-            "description": "Segmentez les clients selon leur comportement d'achat (Récence, Fréquence, Montant).",
-            "objectifs": [
-                "Calculer les métriques RFM",
-                "Appliquer le clustering (K-Means)",
-                "Visualiser les segments",
-                "Proposer des stratégies marketing par segment"
-            ],
-            "competences": ["Clustering", "Marketing Analytics", "Visualisation"],
-            "duree": "3-4 heures"
-        },
-        {
-            "id": 4,
-            "titre": "Dashboard de Pilotage RH",
-            "niveau": "B1",
-            "domaine": "Ressources Humaines",
-            "description": "Créez un tableau de bord interactif pour suivre les KPIs RH.",
-            "objectifs": [
-                "Calculer les KPIs (turnover, absentéisme, etc.)",
-                "Créer des graphiques interactifs",
-                "Analyser la diversité et l'équité",
-                "Identifier les tendances"
-            ],
-            "competences": ["Dashboarding", "KPIs", "Plotly"],
-            "duree": "3-4 heures"
-        },
-        {
-            "id": 5,
-            "titre": "Prévision de la Demande",
-            "niveau": "B3",
-            "domaine": "Supply Chain",
-            "description": "Prédisez la demande future pour optimiser les stocks.",
-            "objectifs": [
-                "Analyser les séries temporelles",
-                "Détecter la saisonnalité et tendances",
-                "Appliquer des modèles de prévision",
-                "Évaluer la précision des prédictions"
-            ],
-            "competences": ["Time Series", "Forecasting", "ARIMA/Prophet"],
-            "duree": "5-7 heures"
-        },
-        {
-            "id": 6,
-            "titre": "Analyse de Sentiment Réseaux Sociaux",
-            "niveau": "B3",
-            "domaine": "Marketing Digital",
-            "description": "Analysez les commentaires clients sur les réseaux sociaux.",
-            "objectifs": [
-                "Nettoyer et prétraiter le texte",
-                "Appliquer l'analyse de sentiment",
-                "Identifier les thèmes récurrents",
-                "Visualiser les insights"
-            ],
-            "competences": ["NLP", "Text Mining", "Sentiment Analysis"],
-            "duree": "4-5 heures"
-        }
-    ]
+    options = filter_options()
     
-    niveau_filter = st.selectbox("Filtrer par niveau", ["Tous", "B1", "B2", "B3"], key="cas_filter")
-    domaine_filter = st.multiselect("Filtrer par domaine", 
-                                     ["Retail", "Télécommunications", "Marketing", 
-                                      "Ressources Humaines", "Supply Chain", "Marketing Digital"])
+    niveau_filter = st.selectbox("Filtrer par niveau", ["Tous"] + options['niveaux'], key="cas_filter")
+    domaine_filter = st.multiselect("Filtrer par domaine", options['domaines'])
+    competence_filter = st.multiselect("Filtrer par compétence", options['competences'])
     
-    filtered_cases = cas_studies
-    if niveau_filter != "Tous":
-        filtered_cases = [c for c in filtered_cases if c["niveau"] == niveau_filter]
-    if domaine_filter:
-        filtered_cases = [c for c in filtered_cases if c["domaine"] in domaine_filter]
+    filtered_cases = find_cases(None if niveau_filter == "Tous" else niveau_filter,
+                                domaine_filter, competence_filter)
     
     for cas in filtered_cases:
         with st.expander(f"📊 {cas['titre']} - {cas['niveau']} - {cas['domaine']}"):
@@ -147,7 +54,7 @@ with tab2:
     if 'current_case' not in st.session_state:
         st.info("👈 Sélectionnez un cas d'étude dans l'onglet 'Cas Disponibles'")
     else:
-        current_case = next((c for c in cas_studies if c['id'] == st.session_state['current_case']), None)
+        current_case = get_case(st.session_state['current_case'])
         
         if current_case:
             st.success(f"**Projet actuel :** {current_case['titre']}")
@@ -214,29 +121,14 @@ fig = px.bar(top_produits.reset_index(),
 fig.show()
                 """, language="python")
                 
+                export_format, export_compression = format_selector("case_dataset")
+                
                 if st.button("💾 Générer le dataset d'exemple"):
-                    np.random.seed(42)
-                    dates = pd.date_range('2023-01-01', '2023-12-31', freq='D')
-                    n_rows = 1000
-                    
-                    df_example = pd.DataFrame({
-                        'date': np.random.choice(dates, n_rows),
-                        'produit': np.random.choice(['Laptop', 'Smartphone', 'Tablette', 'Écouteurs', 'Souris'], n_rows),
-                        'categorie': np.random.choice(['Électronique', 'Accessoires'], n_rows),
-                        'quantite': np.random.randint(1, 10, n_rows),
-                        'prix_unitaire': np.random.uniform(10, 1000, n_rows).round(2),
-                        'client_id': np.random.randint(1, 200, n_rows)
-                    })
+                    # Données identiques pour tous les étudiants : générées une fois puis lues depuis le store
+                    df_example, _, _ = get_case_dataset(current_case['id'])
                     
-                    df_example['montant_total'] = (df_example['quantite'] * df_example['prix_unitaire']).round(2)
-                    
-                    csv = df_example.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Télécharger le CSV",
-                        data=csv,
-                        file_name="ventes_ecommerce.csv",
-                        mime="text/csv"
-                    )
+                    download_dataframe(df_example, CASE_DATASETS[current_case['id']]['fichier'],
+                                       export_format, export_compression, key="download_case_dataset")
                     
                     st.dataframe(df_example.head(10))
             
@@ -268,10 +160,82 @@ models = {
 
 for name, model in models.items():
     model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
-    print(f"{name} - AUC: {roc_auc_score(y_test, y_pred):.3f}")
+    y_score = model.predict_proba(X_test)[:, 1]
+    print(f"{name} - AUC: {roc_auc_score(y_test, y_score):.3f}")
+                """, language="python")
+            
+            elif current_case['id'] == 7:
+                st.markdown("#### Guide pour la Détection de Fraude")
+                st.code("""
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import classification_report, roc_auc_score
+
+# 1. Déséquilibre des classes : environ 2 % de fraudes
+print(df['fraude'].value_counts(normalize=True))
+
+# 2. Features : montant, type, catégorie, heure de la transaction
+X = pd.get_dummies(df[['montant', 'type', 'categorie']])
+X['heure'] = df['date'].dt.hour
+y = df['fraude']
+
+# 3. Split stratifié et pondération des classes
+X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, stratify=y)
+model = RandomForestClassifier(class_weight='balanced')
+model.fit(X_train, y_train)
+
+# 4. L'accuracy est trompeuse : regardez l'AUC et le rappel de la classe 1
+print(roc_auc_score(y_test, model.predict_proba(X_test)[:, 1]))
+print(classification_report(y_test, model.predict(X_test)))
                 """, language="python")
             
+            if current_case['id'] in TRAINING_CASES:
+                case_id = current_case['id']
+                st.markdown("---")
+                st.markdown("### 🧪 Entraîner et comparer les modèles")
+                st.caption(f"Dataset d'exemple : {CASE_DATASETS[case_id]['n_rows']} lignes, "
+                           f"cible `{TRAINING_CASES[case_id]['target']}`")
+                
+                selected_models = st.multiselect("Modèles", list(MODELS), default=list(MODELS),
+                                                 key=f"models_{case_id}")
+                
+                model_params = {name: {} for name in selected_models}
+                with st.expander("⚙️ Hyperparamètres"):
+                    if "Régression logistique" in model_params:
+                        model_params["Régression logistique"]['C'] = st.select_slider(
+                            "C (régression logistique)", options=[0.01, 0.1, 1.0, 10.0, 100.0], value=1.0,
+                            key=f"lr_c_{case_id}")
+                    if "Random Forest" in model_params:
+                        model_params["Random Forest"]['n_estimators'] = st.slider(
+                            "Nombre d'arbres (Random Forest)", 50, 500, 200, step=50, key=f"rf_trees_{case_id}")
+                        model_params["Random Forest"]['max_depth'] = st.selectbox(
+                            "Profondeur max (Random Forest)", [None, 5, 10, 20], key=f"rf_depth_{case_id}")
+                    if "Gradient Boosting" in model_params:
+                        model_params["Gradient Boosting"]['learning_rate'] = st.select_slider(
+                            "Learning rate (Gradient Boosting)", options=[0.01, 0.05, 0.1, 0.3], value=0.1,
+                            key=f"gb_lr_{case_id}")
+                
+                if st.button("🚀 Entraîner", key=f"train_{case_id}") and selected_models:
+                    with st.spinner("Entraînement des modèles en parallèle..."):
+                        training = train_case_models(case_id, model_params)
+                    
+                    st.dataframe(pd.DataFrame([
+                        {
+                            'Modèle': name,
+                            'AUC': round(result['auc'], 3),
+                            'Précision (classe 1)': round(result['report']['1']['precision'], 3),
+                            'Rappel (classe 1)': round(result['report']['1']['recall'], 3),
+                            'F1 (classe 1)': round(result['report']['1']['f1-score'], 3),
+                            'Durée (s)': round(result['duration'], 2),
+                            'Source': "⚡ cache" if result['cached'] else "entraîné"
+                        }
+                        for name, result in training.items()
+                    ]), hide_index=True)
+                    
+                    for name, result in training.items():
+                        with st.expander(f"📄 Rapport de classification - {name}"):
+                            st.code(result['report_text'], language="text")
+            
             st.markdown("---")
             st.markdown("### ✅ Checklist de progression")
             
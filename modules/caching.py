@@ -0,0 +1,50 @@
+"""
+Cache LRU partagé entre les sessions (sans Streamlit)
+Streamlit exécute chaque session dans son propre thread : un cache de
+niveau module est donc lu et modifié en concurrence. LRUCache protège
+chaque opération par un verrou, de sorte que lecture, mise à jour de
+l'ordre et éviction ne peuvent pas s'entrelacer.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """Dictionnaire borné, les entrées les moins récemment utilisées étant évincées"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        """Valeur associée à key (et marquée comme récente), default si absente"""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """Enregistre value sous key, évince au-delà de maxsize et renvoie value"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
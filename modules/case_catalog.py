@@ -0,0 +1,60 @@
+"""
+Catalogue des cas business (sans Streamlit)
+Les cas du pack content/business_cases.json sont enregistrés une fois par
+processus dans la table business_cases, puis gardés en mémoire dans une
+table id -> cas immuable. Les filtres (niveau, domaines, compétences) sont
+résolus par une requête indexée (search_cases) qui ne renvoie que des
+identifiants : afficher un cas ou le cas en cours ne demande qu'une
+consultation de dictionnaire, quelle que soit la taille du catalogue.
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from modules.content_packs import freeze, load_pack
+from modules.database import get_business_cases, save_business_cases, search_cases
+
+
+@lru_cache(maxsize=1)
+def _catalog() -> Mapping[int, Mapping]:
+    """Synchronise le pack avec la base puis charge tout le catalogue"""
+    save_business_cases(load_pack("business_cases")['cases'])
+    return MappingProxyType({case['id']: freeze(case) for case in get_business_cases()})
+
+
+def get_case(case_id: int) -> Optional[Mapping]:
+    """Cas d'identifiant case_id (None s'il n'existe pas)"""
+    return _catalog().get(case_id)
+
+
+def all_cases() -> Tuple[Mapping, ...]:
+    """Tous les cas, par id croissant"""
+    return tuple(_catalog().values())
+
+
+@lru_cache(maxsize=1)
+def filter_options() -> Dict[str, List[str]]:
+    """Valeurs disponibles pour chaque filtre (niveaux, domaines, compétences)"""
+    cases = all_cases()
+    return {
+        'niveaux': sorted({case['niveau'] for case in cases}),
+        'domaines': sorted({case['domaine'] for case in cases}),
+        'competences': sorted({competence for case in cases for competence in case['competences']})
+    }
+
+
+def find_cases(niveau: str = None, domaines: List[str] = None,
+               competences: List[str] = None) -> List[Mapping]:
+    """Cas correspondant aux filtres (voir database.search_cases)"""
+    if not (niveau or domaines or competences):
+        return list(all_cases())
+    catalog = _catalog()
+    return [catalog[case_id] for case_id in search_cases(niveau, domaines, competences)
+            if case_id in catalog]
+
+
+def reload_catalog():
+    """Oublie le catalogue en mémoire (rechargé et resynchronisé au prochain accès)"""
+    _catalog.cache_clear()
+    filter_options.cache_clear()
@@ -0,0 +1,113 @@
+"""
+Datasets d'exemple des cas business (sans Streamlit)
+Les données d'un cas sont déterministes : elles ne dépendent que de
+(case_id, n_rows, seed). Elles sont donc générées une seule fois, rangées
+dans le store Parquet (modules/dataset_store) puis relues par projection
+mémoire, quel que soit le nombre d'étudiants qui ouvrent le cas.
+
+start_prewarm() génère en arrière-plan, au démarrage de l'application,
+les datasets par défaut de tous les cas.
+"""
+
+import threading
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.dataset_engine import ENGINE_VERSION, generate_dataset
+from modules.dataset_store import get_or_store_dataset
+
+# Version des générateurs : à incrémenter dès que leur sortie change
+CASE_DATA_VERSION = 1
+
+DEFAULT_ROWS = 1000
+DEFAULT_SEED = 42
+
+# Date de référence fixe : les datasets des cas ne changent pas d'un jour à l'autre
+CASE_END_DATE = pd.Timestamp('2024-01-01')
+
+_prewarm_thread = None
+_prewarm_lock = threading.Lock()
+
+
+def _ventes_ecommerce(n_rows: int, seed: int) -> pd.DataFrame:
+    """Cas 1 : mêmes tirages que le code du guide (np.random.seed puis np.random.*)"""
+    rng = np.random.RandomState(seed)
+    dates = pd.date_range('2023-01-01', '2023-12-31', freq='D')
+
+    df = pd.DataFrame({
+        'date': rng.choice(dates, n_rows),
+        'produit': rng.choice(['Laptop', 'Smartphone', 'Tablette', 'Écouteurs', 'Souris'], n_rows),
+        'categorie': rng.choice(['Électronique', 'Accessoires'], n_rows),
+        'quantite': rng.randint(1, 10, n_rows),
+        'prix_unitaire': rng.uniform(10, 1000, n_rows).round(2),
+        'client_id': rng.randint(1, 200, n_rows)
+    })
+    df['montant_total'] = (df['quantite'] * df['prix_unitaire']).round(2)
+    return df
+
+
+def _engine(dataset_type: str) -> Callable[[int, int], pd.DataFrame]:
+    """Générateur d'un cas reposant sur le moteur du Générateur de Datasets"""
+    return lambda n_rows, seed: generate_dataset(dataset_type, n_rows, seed=seed, end_date=CASE_END_DATE)
+
+
+# case_id -> générateur (n_rows, seed), taille par défaut et nom du fichier téléchargé
+CASE_DATASETS: Dict[int, Dict] = {
+    1: {'generator': _ventes_ecommerce, 'n_rows': DEFAULT_ROWS, 'fichier': "ventes_ecommerce"},
+    2: {'generator': _engine("Données Clients (CRM)"), 'n_rows': 5000, 'fichier': "clients_churn"},
+    7: {'generator': _engine("Données Financières"), 'n_rows': 20000, 'fichier': "transactions_bancaires"},
+}
+
+
+def case_dataset_params(case_id: int, n_rows: int = DEFAULT_ROWS, seed: int = DEFAULT_SEED) -> Dict:
+    """Paramètres canoniques (et donc clé de stockage) du dataset d'un cas"""
+    return {
+        'dataset_type': f"Cas business {case_id}",
+        'case_id': int(case_id),
+        'n_rows': int(n_rows),
+        'seed': int(seed),
+        'engine_version': [CASE_DATA_VERSION, ENGINE_VERSION]
+    }
+
+
+def get_case_dataset(case_id: int, n_rows: int = None,
+                     seed: int = DEFAULT_SEED) -> Tuple[pd.DataFrame, Dict, bool]:
+    """
+    Dataset d'exemple d'un cas, généré au premier appel puis lu depuis le store
+
+    Args:
+        case_id: Identifiant du cas
+        n_rows: Nombre de lignes (par défaut : taille prévue pour le cas)
+        seed: Graine aléatoire
+
+    Returns:
+        (DataFrame, métadonnées, True si servi depuis le store)
+    """
+    if case_id not in CASE_DATASETS:
+        raise ValueError(f"Aucun dataset d'exemple pour le cas {case_id}")
+    case = CASE_DATASETS[case_id]
+    n_rows = n_rows or case['n_rows']
+    return get_or_store_dataset(case_dataset_params(case_id, n_rows, seed),
+                                lambda: case['generator'](n_rows, seed))
+
+
+def prewarm_case_datasets(seed: int = DEFAULT_SEED) -> int:
+    """
+    Génère les datasets manquants de tous les cas (taille par défaut)
+
+    Returns:
+        Nombre de datasets générés
+    """
+    return sum(not get_case_dataset(case_id, seed=seed)[2] for case_id in CASE_DATASETS)
+
+
+def start_prewarm():
+    """Lance prewarm_case_datasets dans un thread, une seule fois par processus"""
+    global _prewarm_thread
+    with _prewarm_lock:
+        if _prewarm_thread is None:
+            _prewarm_thread = threading.Thread(target=prewarm_case_datasets, name="case-datasets-prewarm",
+                                               daemon=True)
+            _prewarm_thread.start()
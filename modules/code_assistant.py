@@ -1,11 +1,68 @@
 import streamlit as st
 import json
 from pathlib import Path
+from modules.error_classifier import classify
+from modules.code_runner import DEFAULT_LIMITS, SANDBOX_AVAILABLE, run_code
+from modules.content_packs import load_pack
+from modules.search_index import search
 
 st.title("💻 Assistant Code & Debug")
 st.markdown("**Aide au débogage et snippets de code Python/SQL**")
 
-tab1, tab2, tab3, tab4 = st.tabs(["🐛 Analyseur d'Erreurs", "📚 Bibliothèque de Snippets", "🎯 Quiz Python", "💡 Bonnes Pratiques"])
+
+def show_error_analysis(error_text: str):
+    """Affiche l'exception détectée et l'explication du catalogue"""
+    result = classify(error_text)
+    info = result['entry'] if result else None
+    
+    if result:
+        frame = result['user_frame'] or (result['frames'][-1] if result['frames'] else None)
+        location = ""
+        if frame:
+            location = f" — ligne {frame['line']} de `{frame['file']}`"
+            if frame['function']:
+                location += f", dans `{frame['function']}`"
+        st.caption(f"Exception détectée : `{result['exception']}`{location}")
+        if result['chain']:
+            st.caption("Exceptions précédentes : " + " → ".join(f"`{name}`" for name in result['chain']))
+    
+    if info:
+        st.error(f"### {info['titre']}")
+        st.markdown(f"**Explication :** {info['explication']}")
+        st.markdown("**Exemple :**")
+        st.markdown(info['exemple'])
+        st.markdown("**Conseils :**")
+        for conseil in info['conseils']:
+            st.markdown(f"- {conseil}")
+    
+    if not info and error_text:
+        st.info("💡 **Conseils généraux de débogage :**")
+        st.markdown("""
+        1. **Lisez attentivement le message d'erreur** - Il indique souvent la ligne et le type d'erreur
+        2. **Vérifiez les types de données** - Utilisez `type()` et `print()` pour debugger
+        3. **Utilisez try/except** - Pour gérer les erreurs de manière élégante
+        4. **Ajoutez des prints** - Pour suivre l'exécution de votre code
+        5. **Consultez la documentation** - Python docs, Stack Overflow
+        """)
+
+
+def show_run_result(result: dict):
+    """Affiche la sortie d'une exécution (run_code) et l'analyse de l'erreur éventuelle"""
+    if result['stdout']:
+        st.markdown("**Sortie :**")
+        st.code(result['stdout'], language="text")
+    if result['stderr']:
+        st.markdown("**Avertissements :**")
+        st.code(result['stderr'], language="text")
+    
+    if result['ok']:
+        st.success(f"✅ Exécuté en {result['duration'] * 1000:.0f} ms")
+    else:
+        st.code(result['traceback'], language="text")
+        show_error_analysis(result['traceback'])
+
+
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["🐛 Analyseur d'Erreurs", "📚 Bibliothèque de Snippets", "🎯 Quiz Python", "💡 Bonnes Pratiques", "▶️ Exécuter du code"])
 
 with tab1:
     st.header("Analyseur d'Erreurs Python")
@@ -15,423 +72,42 @@ with tab1:
     error_input = st.text_area("Message d'erreur", height=150, placeholder="Exemple: IndexError: list index out of range")
     
     if st.button("Analyser l'erreur"):
-        error_explanations = {
-            "IndexError": {
-                "titre": "IndexError - Indice hors limites",
-                "explication": "Cette erreur survient lorsque vous essayez d'accéder à un indice qui n'existe pas dans une liste, tuple ou chaîne.",
-                "exemple": """```python
-# ❌ Erreur
-ma_liste = [1, 2, 3]
-print(ma_liste[5])  # IndexError!
-
-# ✅ Solution
-if len(ma_liste) > 5:
-    print(ma_liste[5])
-else:
-    print("Indice inexistant")
-```""",
-                "conseils": ["Vérifiez la longueur avec len()", "Utilisez des conditions", "Pensez à la méthode .get() pour les dictionnaires"]
-            },
-            "KeyError": {
-                "titre": "KeyError - Clé inexistante",
-                "explication": "Cette erreur apparaît quand vous cherchez une clé qui n'existe pas dans un dictionnaire.",
-                "exemple": """```python
-# ❌ Erreur
-mon_dict = {'nom': 'Jean', 'age': 25}
-print(mon_dict['ville'])  # KeyError!
-
-# ✅ Solution 1: get()
-print(mon_dict.get('ville', 'Non spécifié'))
-
-# ✅ Solution 2: vérification
-if 'ville' in mon_dict:
-    print(mon_dict['ville'])
-```""",
-                "conseils": ["Utilisez .get() avec une valeur par défaut", "Vérifiez avec 'in'", "Utilisez .keys() pour lister les clés"]
-            },
-            "TypeError": {
-                "titre": "TypeError - Type incompatible",
-                "explication": "L'opération n'est pas supportée pour ce type de données.",
-                "exemple": """```python
-# ❌ Erreur
-resultat = "5" + 10  # TypeError!
-
-# ✅ Solution
-resultat = int("5") + 10  # ou str(10)
-print(resultat)  # 15
-```""",
-                "conseils": ["Vérifiez les types avec type()", "Convertissez avec int(), str(), float()", "Utilisez isinstance() pour vérifier"]
-            },
-            "ValueError": {
-                "titre": "ValueError - Valeur inappropriée",
-                "explication": "La valeur n'est pas appropriée pour l'opération même si le type est correct.",
-                "exemple": """```python
-# ❌ Erreur
-nombre = int("abc")  # ValueError!
-
-# ✅ Solution
-try:
-    nombre = int(input("Entrez un nombre: "))
-except ValueError:
-    print("Veuillez entrer un nombre valide")
-    nombre = 0
-```""",
-                "conseils": ["Utilisez try/except", "Validez les entrées utilisateur", "Vérifiez le format des données"]
-            },
-            "AttributeError": {
-                "titre": "AttributeError - Attribut inexistant",
-                "explication": "L'objet n'a pas l'attribut ou la méthode demandée.",
-                "exemple": """```python
-# ❌ Erreur
-ma_liste = [1, 2, 3]
-ma_liste.append(4)  # OK
-ma_liste.push(5)  # AttributeError! (push n'existe pas)
-
-# ✅ Solution
-ma_liste.append(5)  # Utilisez la bonne méthode
-```""",
-                "conseils": ["Vérifiez la documentation", "Utilisez dir(objet) pour lister les attributs", "Attention aux typos"]
-            },
-            "ImportError": {
-                "titre": "ImportError / ModuleNotFoundError",
-                "explication": "Le module ou package n'a pas pu être importé.",
-                "exemple": """```python
-# ❌ Erreur
-import pandas  # ModuleNotFoundError!
-
-# ✅ Solution: Installer d'abord
-# pip install pandas
-import pandas as pd
-```""",
-                "conseils": ["Installez avec pip install", "Vérifiez l'orthographe du module", "Utilisez des environnements virtuels"]
-            }
-        }
-        
-        detected = False
-        for error_type, info in error_explanations.items():
-            if error_type.lower() in error_input.lower():
-                detected = True
-                st.error(f"### {info['titre']}")
-                st.markdown(f"**Explication :** {info['explication']}")
-                st.markdown("**Exemple :**")
-                st.markdown(info['exemple'])
-                st.markdown("**Conseils :**")
-                for conseil in info['conseils']:
-                    st.markdown(f"- {conseil}")
-                break
-        
-        if not detected and error_input:
-            st.info("💡 **Conseils généraux de débogage :**")
-            st.markdown("""
-            1. **Lisez attentivement le message d'erreur** - Il indique souvent la ligne et le type d'erreur
-            2. **Vérifiez les types de données** - Utilisez `type()` et `print()` pour debugger
-            3. **Utilisez try/except** - Pour gérer les erreurs de manière élégante
-            4. **Ajoutez des prints** - Pour suivre l'exécution de votre code
-            5. **Consultez la documentation** - Python docs, Stack Overflow
-            """)
+        show_error_analysis(error_input)
 
 with tab2:
     st.header("Bibliothèque de Snippets")
     
-    category = st.selectbox(
-        "Catégorie",
-        ["Pandas", "NumPy", "Matplotlib/Plotly", "Scikit-learn", "SQL", "Statistiques"]
-    )
+    snippets_pack = load_pack("snippets")
     
-    if category == "Pandas":
-        st.subheader("🐼 Snippets Pandas")
-        
-        with st.expander("📥 Charger des données"):
-            st.code("""
-# CSV
-df = pd.read_csv('fichier.csv')
-df = pd.read_csv('fichier.csv', sep=';', encoding='utf-8')
-
-# Excel
-df = pd.read_excel('fichier.xlsx', sheet_name='Sheet1')
-
-# JSON
-df = pd.read_json('fichier.json')
-
-# SQL
-import sqlite3
-conn = sqlite3.connect('database.db')
-df = pd.read_sql('SELECT * FROM table', conn)
-            """, language="python")
-        
-        with st.expander("🔍 Exploration des données"):
-            st.code("""
-# Informations générales
-df.info()
-df.describe()
-df.head(10)
-df.tail()
-
-# Dimensions
-df.shape
-len(df)
-
-# Colonnes et types
-df.columns
-df.dtypes
-
-# Valeurs manquantes
-df.isnull().sum()
-df.isna().sum()
-
-# Valeurs uniques
-df['colonne'].unique()
-df['colonne'].nunique()
-df['colonne'].value_counts()
-            """, language="python")
-        
-        with st.expander("🧹 Nettoyage des données"):
-            st.code("""
-# Supprimer les doublons
-df = df.drop_duplicates()
-
-# Gérer les valeurs manquantes
-df = df.dropna()  # Supprimer
-df = df.fillna(0)  # Remplacer par 0
-df['col'] = df['col'].fillna(df['col'].mean())  # Par la moyenne
-
-# Renommer colonnes
-df = df.rename(columns={'ancien': 'nouveau'})
-
-# Changer le type
-df['colonne'] = df['colonne'].astype(int)
-
-# Supprimer des colonnes
-df = df.drop(['col1', 'col2'], axis=1)
-
-# Filtrer les données
-df = df[df['age'] > 18]
-df = df[(df['age'] > 18) & (df['ville'] == 'Paris')]
-            """, language="python")
-        
-        with st.expander("📊 Agrégation et groupement"):
-            st.code("""
-# GroupBy
-df.groupby('categorie')['ventes'].sum()
-df.groupby(['region', 'produit'])['ventes'].agg(['sum', 'mean', 'count'])
-
-# Pivot table
-pd.pivot_table(df, values='ventes', index='region', 
-               columns='produit', aggfunc='sum')
-
-# Tri
-df = df.sort_values('colonne', ascending=False)
-df = df.sort_values(['col1', 'col2'], ascending=[True, False])
-            """, language="python")
+    query = st.text_input("🔎 Rechercher un snippet", placeholder="Ex: read_csv, train_test_split, LEFT JOIN...")
     
-    elif category == "NumPy":
-        st.subheader("🔢 Snippets NumPy")
-        
-        with st.expander("📐 Création de tableaux"):
-            st.code("""
-import numpy as np
-
-# Tableaux de base
-arr = np.array([1, 2, 3, 4, 5])
-arr_2d = np.array([[1, 2, 3], [4, 5, 6]])
-
-# Tableaux spéciaux
-zeros = np.zeros((3, 4))
-ones = np.ones((2, 3))
-identity = np.eye(5)
-
-# Séquences
-np.arange(0, 10, 2)  # [0, 2, 4, 6, 8]
-np.linspace(0, 1, 5)  # [0, 0.25, 0.5, 0.75, 1]
-
-# Aléatoires
-np.random.rand(3, 3)  # Uniforme [0, 1)
-np.random.randn(3, 3)  # Normale N(0,1)
-np.random.randint(0, 10, size=(3, 3))  # Entiers
-            """, language="python")
-        
-        with st.expander("🧮 Opérations"):
-            st.code("""
-# Opérations mathématiques
-arr + 5
-arr * 2
-arr ** 2
-np.sqrt(arr)
-np.exp(arr)
-np.log(arr)
-
-# Statistiques
-arr.mean()
-arr.std()
-arr.min()
-arr.max()
-arr.sum()
-
-# Axes
-arr_2d.sum(axis=0)  # Somme par colonne
-arr_2d.mean(axis=1)  # Moyenne par ligne
-            """, language="python")
-    
-    elif category == "Scikit-learn":
-        st.subheader("🤖 Snippets Scikit-learn")
-        
-        with st.expander("📊 Préparation des données"):
-            st.code("""
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-
-# Split train/test
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# Normalisation
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-# Encodage
-le = LabelEncoder()
-y_encoded = le.fit_transform(y)
-            """, language="python")
-        
-        with st.expander("🎯 Modèles de classification"):
-            st.code("""
-from sklearn.linear_model import LogisticRegression
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, classification_report
-
-# Régression logistique
-model = LogisticRegression()
-model.fit(X_train, y_train)
-y_pred = model.predict(X_test)
-
-# Arbre de décision
-dt = DecisionTreeClassifier(max_depth=5, random_state=42)
-dt.fit(X_train, y_train)
-
-# Random Forest
-rf = RandomForestClassifier(n_estimators=100, random_state=42)
-rf.fit(X_train, y_train)
-
-# Évaluation
-accuracy = accuracy_score(y_test, y_pred)
-print(classification_report(y_test, y_pred))
-            """, language="python")
-        
-        with st.expander("📈 Modèles de régression"):
-            st.code("""
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score
-
-# Régression linéaire
-model = LinearRegression()
-model.fit(X_train, y_train)
-y_pred = model.predict(X_test)
-
-# Coefficients
-print("Coefficients:", model.coef_)
-print("Intercept:", model.intercept_)
-
-# Évaluation
-mse = mean_squared_error(y_test, y_pred)
-r2 = r2_score(y_test, y_pred)
-print(f"MSE: {mse:.2f}")
-print(f"R²: {r2:.2f}")
-            """, language="python")
+    if query:
+        snippets = [document.item for document, _ in search(query, limit=10, kinds=['snippet'])]
+        if not snippets:
+            st.info("Aucun snippet ne correspond à cette recherche")
+    else:
+        category = st.selectbox("Catégorie", list(snippets_pack['categories']))
+        st.subheader(snippets_pack['categories'][category])
+        snippets = [snippet for snippet in snippets_pack['snippets'] if snippet['categorie'] == category]
+        if not snippets:
+            st.info("Pas encore de snippets dans cette catégorie")
     
-    elif category == "SQL":
-        st.subheader("🗄️ Snippets SQL")
-        
-        with st.expander("📋 Requêtes de base"):
-            st.code("""
--- SELECT simple
-SELECT * FROM clients;
-SELECT nom, email FROM clients;
-
--- WHERE
-SELECT * FROM commandes WHERE montant > 100;
-SELECT * FROM clients WHERE ville = 'Paris' AND age >= 18;
-
--- ORDER BY
-SELECT * FROM produits ORDER BY prix DESC;
-
--- LIMIT
-SELECT * FROM ventes ORDER BY date DESC LIMIT 10;
-
--- DISTINCT
-SELECT DISTINCT categorie FROM produits;
-            """, language="sql")
-        
-        with st.expander("📊 Agrégations"):
-            st.code("""
--- COUNT, SUM, AVG, MIN, MAX
-SELECT COUNT(*) FROM clients;
-SELECT SUM(montant) FROM commandes;
-SELECT AVG(prix) FROM produits;
-SELECT MIN(date), MAX(date) FROM ventes;
-
--- GROUP BY
-SELECT categorie, COUNT(*) as nb_produits
-FROM produits
-GROUP BY categorie;
-
-SELECT client_id, SUM(montant) as total
-FROM commandes
-GROUP BY client_id
-HAVING total > 1000;
-            """, language="sql")
-        
-        with st.expander("🔗 JOINs"):
-            st.code("""
--- INNER JOIN
-SELECT c.nom, co.montant
-FROM clients c
-INNER JOIN commandes co ON c.id = co.client_id;
-
--- LEFT JOIN
-SELECT c.nom, co.montant
-FROM clients c
-LEFT JOIN commandes co ON c.id = co.client_id;
-
--- Plusieurs JOINs
-SELECT c.nom, co.date, p.nom as produit
-FROM clients c
-INNER JOIN commandes co ON c.id = co.client_id
-INNER JOIN produits p ON co.produit_id = p.id;
-            """, language="sql")
+    for snippet in snippets:
+        label = f"{snippet['titre']} · {snippet['categorie']}" if query else snippet['titre']
+        with st.expander(label):
+            st.code(snippet['code'], language=snippet['langage'])
+            if snippet['langage'] == 'python' and SANDBOX_AVAILABLE:
+                if st.button("▶️ Exécuter", key=f"run_snippet_{snippet['categorie']}_{snippet['titre']}"):
+                    # Le snippet est aussi chargé dans l'onglet Exécuter pour pouvoir le modifier
+                    st.session_state.runner_code = snippet['code']
+                    with st.spinner("Exécution..."):
+                        show_run_result(run_code(snippet['code']))
+                    st.caption("💡 Code chargé dans l'onglet « ▶️ Exécuter du code » pour le modifier")
 
 with tab3:
     st.header("🎯 Quiz Python")
     
-    quiz_questions = [
-        {
-            "question": "Quelle est la sortie de: `print(type([1, 2, 3]))`",
-            "options": ["<class 'list'>", "<class 'tuple'>", "<class 'array'>", "<class 'dict'>"],
-            "correct": 0
-        },
-        {
-            "question": "Comment ajouter un élément à la fin d'une liste ?",
-            "options": [".append()", ".add()", ".push()", ".insert()"],
-            "correct": 0
-        },
-        {
-            "question": "Quelle méthode retourne les clés d'un dictionnaire ?",
-            "options": [".keys()", ".get_keys()", ".values()", ".items()"],
-            "correct": 0
-        },
-        {
-            "question": "Comment lire un fichier CSV avec pandas ?",
-            "options": ["pd.read_csv()", "pd.load_csv()", "pd.import_csv()", "pd.open_csv()"],
-            "correct": 0
-        },
-        {
-            "question": "Quelle bibliothèque pour le machine learning ?",
-            "options": ["scikit-learn", "pandas", "matplotlib", "requests"],
-            "correct": 0
-        }
-    ]
+    quiz_questions = load_pack("quiz")['questions']
     
     score = 0
     for i, q in enumerate(quiz_questions):
@@ -502,3 +178,24 @@ except pd.errors.EmptyDataError:
 except Exception as e:
     print(f"Erreur inattendue: {e}")
     """, language="python")
+
+with tab5:
+    st.header("▶️ Exécuter du code Python")
+    
+    st.markdown("**Testez un snippet ou votre propre code.** `pd`, `np` et `sklearn` sont déjà importés.")
+    st.caption(f"Limites : {DEFAULT_LIMITS['cpu_seconds']} s de calcul, "
+               f"{DEFAULT_LIMITS['memory_mb']} Mo de mémoire, {DEFAULT_LIMITS['wall_seconds']} s au total")
+    
+    # Programme d'exemple, remplacé par le dernier snippet exécuté depuis la bibliothèque
+    st.session_state.setdefault(
+        "runner_code",
+        "df = pd.DataFrame({'ventes': [120, 340, 90], 'region': ['Nord', 'Sud', 'Est']})\nprint(df.describe())"
+    )
+    code_input = st.text_area("Code", height=250, key="runner_code")
+    
+    if not SANDBOX_AVAILABLE:
+        st.warning("⚠️ L'exécution de code n'est pas disponible : le serveur ne peut pas l'isoler "
+                   "(Linux avec espaces de noms utilisateur autorisés requis)")
+    elif st.button("▶️ Exécuter", key="run_code"):
+        with st.spinner("Exécution..."):
+            show_run_result(run_code(code_input))
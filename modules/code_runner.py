@@ -0,0 +1,287 @@
+"""
+Exécution isolée du code des étudiants (sans Streamlit)
+Un pool de processus « chauds » importe pandas, NumPy et scikit-learn une
+seule fois au démarrage. Chaque exécution se fait dans un processus fils
+obtenu par os.fork() depuis un de ces processus : le fils hérite des modules
+déjà chargés (démarrage en quelques millisecondes) et reçoit ses propres
+limites (temps CPU, mémoire, taille des fichiers, nombre de processus)
+via resource.setrlimit. Le processus chaud n'exécute jamais le code
+lui-même et reste donc propre d'une exécution à l'autre.
+
+Le fils s'isole avec modules/sandbox (espaces de noms Linux, racine
+minimale sans le dépôt, réseau coupé) puis crée un petit-fils, premier
+processus de son espace de PID, qui perd toute capacité et ne garde
+qu'un environnement réduit avant d'exécuter le code. Aucun privilège
+n'est nécessaire : le serveur n'a pas à être lancé en root.
+
+Nécessite Linux (espaces de noms utilisateur autorisés) et le module
+resource ; sinon SANDBOX_AVAILABLE vaut False et rien n'est exécuté.
+"""
+
+import io
+import json
+import os
+import select
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing import get_context
+from typing import Dict
+
+from modules import sandbox
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SANDBOX_AVAILABLE = resource is not None and sandbox.AVAILABLE
+
+# Limites par défaut d'une exécution
+DEFAULT_LIMITS = {
+    'cpu_seconds': 5,
+    'wall_seconds': 10,
+    'memory_mb': 512,
+    'file_mb': 10,
+    'output_chars': 20_000
+}
+
+# Modules importés une fois par processus chaud (et noms prédéfinis pour le code)
+PRELOADED = {"pd": "pandas", "np": "numpy", "sklearn": "sklearn"}
+
+POOL_SIZE = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+_namespace = {}
+
+
+def _warm_up():
+    """Initialisation d'un processus chaud : imports lourds faits une seule fois"""
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+    import importlib
+    for name, module in PRELOADED.items():
+        try:
+            _namespace[name] = importlib.import_module(module)
+        except ImportError:
+            pass
+    # Le processus chaud n'a besoin d'aucun secret du serveur : ses fils n'en héritent pas
+    sandbox.reset_environment()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _address_space() -> int:
+    """Taille virtuelle actuelle du processus en octets (0 si inconnue)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _apply_limits(limits: Dict, baseline: int):
+    """Limites du processus (les imports déjà faits, baseline octets, ne comptent pas dans le budget mémoire)"""
+    cpu = limits['cpu_seconds']
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    if baseline:
+        memory = baseline + limits['memory_mb'] * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    file_size = limits['file_mb'] * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_FSIZE, (file_size, file_size))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit] + f"\n... (sortie tronquée à {limit} caractères)"
+
+
+def _send(write_fd: int, limits: Dict, stdout: str = '', stderr: str = '', error: str = None):
+    """Envoie le résultat en JSON au processus chaud et termine le processus"""
+    result = json.dumps({
+        'stdout': _truncate(stdout, limits['output_chars']),
+        'stderr': _truncate(stderr, limits['output_chars']),
+        'traceback': error
+    }).encode()
+    with os.fdopen(write_fd, 'wb') as pipe:
+        pipe.write(result)
+    os._exit(0)
+
+
+def _run(code: str, limits: Dict, write_fd: int, baseline: int):
+    """Corps du petit-fils isolé : perd ses privilèges, applique les limites, exécute"""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    error = None
+    try:
+        # Seul le tube du résultat reste ouvert (pas ceux du pool vers le serveur)
+        os.closerange(3, write_fd)
+        os.closerange(write_fd + 1, os.sysconf("SC_OPEN_MAX"))
+        # Une erreur ici empêche l'exécution : le code ne tourne jamais avec des privilèges
+        sandbox.drop_privileges()
+        _apply_limits(limits, baseline)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            exec(compile(code, "<votre code>", "exec"), {"__name__": "__main__", **_namespace})
+    except MemoryError:
+        error = "MemoryError: limite de mémoire atteinte"
+    except BaseException as exc:
+        # Traceback à partir du code de l'étudiant (sans la frame de _run)
+        error = ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__.tb_next))
+    _send(write_fd, limits, stdout.getvalue(), stderr.getvalue(), error)
+
+
+def _child(code: str, limits: Dict, write_fd: int, root: str):
+    """
+    Corps du processus fils : s'isole, lance le code dans un petit-fils
+    (premier processus du nouvel espace de PID) et se termine comme lui
+    """
+    try:
+        baseline = _address_space()
+        sandbox.isolate(root)
+        pid = os.fork()
+    except BaseException as exc:
+        _send(write_fd, limits, error=f"SystemError: isolation du code impossible ({exc})")
+    if pid == 0:
+        _run(code, limits, write_fd, baseline)
+    os.close(write_fd)
+    _, status = os.waitpid(pid, 0)
+    if os.WIFSIGNALED(status):
+        sig = os.WTERMSIG(status)
+        if sig != signal.SIGKILL:
+            signal.signal(sig, signal.SIG_DFL)
+        os.kill(os.getpid(), sig)
+    os._exit(os.WEXITSTATUS(status) if os.WIFEXITED(status) else 1)
+
+
+def _execute(code: str, limits: Dict) -> Dict:
+    """Exécuté dans un processus chaud : fork, attente bornée, récupération du résultat"""
+    # Point de montage de la racine isolée (vide vu de l'extérieur)
+    root = tempfile.mkdtemp(prefix="code_runner_")
+    read_fd, write_fd = os.pipe()
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.setpgid(0, 0)
+        os.close(read_fd)
+        _child(code, limits, write_fd, root)
+    # Fils et petit-fils forment un groupe, arrêté d'un seul signal en cas de dépassement
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    os.close(write_fd)
+
+    chunks = []
+    deadline = start + limits['wall_seconds']
+    timed_out = False
+    with os.fdopen(read_fd, 'rb') as pipe:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                timed_out = True
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                break
+            ready, _, _ = select.select([pipe], [], [], remaining)
+            if ready:
+                chunk = os.read(pipe.fileno(), 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    _, status = os.waitpid(pid, 0)
+    duration = time.perf_counter() - start
+    shutil.rmtree(root, ignore_errors=True)
+
+    result = {'stdout': '', 'stderr': '', 'traceback': None}
+    if chunks:
+        try:
+            result.update(json.loads(b''.join(chunks)))
+        except ValueError:
+            pass
+
+    signaled = os.WIFSIGNALED(status)
+    if timed_out:
+        result['traceback'] = f"TimeoutError: exécution interrompue après {limits['wall_seconds']} s"
+    elif signaled and os.WTERMSIG(status) in (signal.SIGXCPU, signal.SIGKILL):
+        result['traceback'] = f"TimeoutError: limite de {limits['cpu_seconds']} s de temps CPU atteinte"
+    elif signaled or not chunks:
+        result['traceback'] = result['traceback'] or "SystemError: le processus d'exécution s'est arrêté brutalement"
+
+    result.update({
+        'ok': result['traceback'] is None,
+        'timed_out': timed_out,
+        'duration': duration
+    })
+    return result
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Pool de processus chauds (créé et préchauffé au premier appel)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=POOL_SIZE, mp_context=get_context("spawn"),
+                                        initializer=_warm_up)
+            for _ in range(POOL_SIZE):
+                _pool.submit(_ping)
+        return _pool
+
+
+def shutdown_pool():
+    """Arrête les processus chauds"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def run_code(code: str, **limits) -> Dict:
+    """
+    Exécute du code Python avec des limites de ressources
+
+    Les noms pd, np et sklearn sont prédéfinis.
+
+    Args:
+        code: Code source
+        **limits: Remplace les valeurs de DEFAULT_LIMITS (cpu_seconds, wall_seconds,
+                  memory_mb, file_mb, output_chars)
+
+    Returns:
+        ok, stdout, stderr, traceback (None si succès), timed_out, duration (s)
+    """
+    if not SANDBOX_AVAILABLE:
+        raise RuntimeError("L'exécution de code nécessite Linux avec les espaces de noms utilisateur "
+                           "autorisés (isolation du code, voir modules/sandbox)")
+    limits = {**DEFAULT_LIMITS, **limits}
+    start = time.perf_counter()
+    try:
+        future = get_pool().submit(_execute, code, limits)
+    except BrokenProcessPool:
+        # Pool cassé avant l'envoi (le code n'a pas tourné) : on le recrée
+        shutdown_pool()
+        future = get_pool().submit(_execute, code, limits)
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # Le processus chaud est mort pendant l'exécution : le code n'est jamais
+        # relancé, le pool sera recréé pour l'exécution suivante
+        shutdown_pool()
+        return {
+            'ok': False,
+            'stdout': '',
+            'stderr': '',
+            'traceback': "SystemError: le processus d'exécution a été interrompu",
+            'timed_out': False,
+            'duration': time.perf_counter() - start
+        }
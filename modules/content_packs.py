@@ -0,0 +1,92 @@
+"""
+Contenus statiques des pages (sans Streamlit)
+Questions d'entretien, cas business, tutoriels, snippets, quiz et sets de
+flashcards sont stockés dans des packs versionnés content/<nom>.json :
+
+    {"version": 1, "<section>": ..., "<section>": ...}
+
+Chaque pack est lu une seule fois par processus, au premier accès à l'une
+de ses sections, et chaque section n'est convertie qu'à son premier accès
+en structure immuable (MappingProxyType et tuples). Les reruns et toutes
+les sessions partagent donc les mêmes objets, sans copie ni risque qu'une
+page modifie le contenu des autres.
+"""
+
+import json
+import threading
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Iterator
+
+CONTENT_DIR = Path(__file__).resolve().parent.parent / "content"
+
+# Version de format la plus récente comprise par ce module
+FORMAT_VERSION = 1
+
+
+def freeze(value: Any) -> Any:
+    """Copie immuable d'une valeur JSON (dict -> MappingProxyType, list -> tuple)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ContentPack(Mapping):
+    """Pack de contenu en lecture seule, chargé section par section"""
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = path
+        self._raw = None
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        """Lit le fichier au premier besoin"""
+        if self._raw is None:
+            with open(self.path, encoding='utf-8') as f:
+                raw = json.load(f)
+            version = raw.get('version')
+            if not isinstance(version, int) or version > FORMAT_VERSION:
+                raise ValueError(f"Version du pack '{self.name}' non prise en charge : {version}")
+            self._raw = raw
+        return self._raw
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._load()['version']
+
+    def __getitem__(self, section: str) -> Any:
+        frozen = self._sections.get(section)
+        if frozen is not None:
+            return frozen
+        with self._lock:
+            if section not in self._sections:
+                raw = self._load()
+                if section == 'version' or section not in raw:
+                    raise KeyError(section)
+                # La version figée remplace la version JSON, qui n'est plus gardée
+                self._sections[section] = freeze(raw.pop(section))
+            return self._sections[section]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            names = list(self._sections) + [key for key in self._load() if key != 'version']
+        return iter(names)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ContentPack({self.name!r})"
+
+
+@lru_cache(maxsize=None)
+def load_pack(name: str) -> ContentPack:
+    """Pack content/<name>.json, partagé par tout le processus"""
+    return ContentPack(name, CONTENT_DIR / f"{name}.json")
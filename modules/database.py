@@ -7,7 +7,8 @@ import sqlite3
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple, Any
+from types import MappingProxyType
+from typing import List, Dict, Optional, Tuple, Any, NamedTuple
 import hashlib
 import secrets
 
@@ -70,7 +71,7 @@ class Database:
         return [dict(row) for row in rows]
 
 
-def init_database():
+def init_database(verbose: bool = True):
     """
     Initialise la base de données avec toutes les tables
     """
@@ -154,6 +155,28 @@ def init_database():
             )
         """)
         
+        # Table des tâches de projet (une ligne par tâche, ordonnées par position)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS project_tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                nom TEXT NOT NULL,
+                done INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Anciennes tâches stockées en JSON dans projects.taches : copie dans project_tasks
+        db.execute("SELECT id, taches FROM projects WHERE taches IS NOT NULL")
+        for row in db.fetchall():
+            db.cursor.executemany(
+                "INSERT INTO project_tasks (project_id, position, nom, done) VALUES (?, ?, ?, ?)",
+                _task_rows(row['id'], json.loads(row['taches'] or '[]'))
+            )
+        db.execute("UPDATE projects SET taches = NULL WHERE taches IS NOT NULL")
+        
         # Table des flashcards
         db.execute("""
             CREATE TABLE IF NOT EXISTS flashcards (
@@ -166,10 +189,39 @@ def init_database():
                 date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 dernier_revu TIMESTAMP,
                 difficulte TEXT,
+                ease REAL DEFAULT 2.5,
+                interval_days REAL DEFAULT 0,
+                repetitions INTEGER DEFAULT 0,
+                due_at TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
             )
         """)
         
+        # Bases créées avant la répétition espacée : ajout des colonnes manquantes
+        _add_missing_columns(db, "flashcards", FLASHCARD_SCHEDULE_COLUMNS)
+        # Les échéances sont en heure locale (timestamp()) : date_creation, rempli par
+        # CURRENT_TIMESTAMP en UTC, est converti ; dernier_revu est déjà local
+        db.execute("""
+            UPDATE flashcards
+            SET due_at = COALESCE(datetime(dernier_revu), datetime(date_creation, 'localtime'))
+            WHERE due_at IS NULL
+        """)
+        
+        # Journal des révisions de flashcards (ajout seul, pour les statistiques)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS review_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                flashcard_id INTEGER NOT NULL,
+                user_id INTEGER,
+                matiere TEXT,
+                difficulte TEXT NOT NULL,
+                ease REAL,
+                interval_days REAL,
+                reviewed_at TIMESTAMP NOT NULL,
+                FOREIGN KEY (flashcard_id) REFERENCES flashcards(id) ON DELETE CASCADE
+            )
+        """)
+        
         # Table des portfolios
         db.execute("""
             CREATE TABLE IF NOT EXISTS portfolios (
@@ -187,6 +239,10 @@ def init_database():
             )
         """)
         
+        # Numéro de version des portfolios : incrémenté à chaque écriture (triggers plus bas),
+        # sert de clé au cache de rendu HTML
+        _add_missing_columns(db, "portfolios", {'version': 'INTEGER DEFAULT 0'})
+        
         # Table des projets de portfolio
         db.execute("""
             CREATE TABLE IF NOT EXISTS portfolio_projects (
@@ -262,6 +318,16 @@ def init_database():
             )
         """)
         
+        # Compétences des cas business (une ligne par couple, pour la recherche par compétence)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS business_case_competences (
+                case_id INTEGER NOT NULL,
+                competence TEXT NOT NULL,
+                PRIMARY KEY (competence, case_id),
+                FOREIGN KEY (case_id) REFERENCES business_cases(id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        
         # Table de tracking des progrès étudiants
         db.execute("""
             CREATE TABLE IF NOT EXISTS student_progress (
@@ -278,6 +344,22 @@ def init_database():
             )
         """)
         
+        # Table des datasets générés (fichiers Parquet stockés dans data/datasets)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS datasets (
+                dataset_key TEXT PRIMARY KEY,
+                dataset_type TEXT NOT NULL,
+                params TEXT NOT NULL,
+                n_rows INTEGER NOT NULL,
+                n_cols INTEGER NOT NULL,
+                file_path TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_access TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                access_count INTEGER DEFAULT 0
+            )
+        """)
+        
         # Index pour améliorer les performances
         db.execute("CREATE INDEX IF NOT EXISTS idx_courses_matiere ON courses(matiere)")
         db.execute("CREATE INDEX IF NOT EXISTS idx_courses_prof ON courses(prof_name)")
@@ -285,11 +367,142 @@ def init_database():
         db.execute("CREATE INDEX IF NOT EXISTS idx_exercises_course ON exercises(course_id)")
         db.execute("CREATE INDEX IF NOT EXISTS idx_forum_matiere ON forum_posts(matiere)")
         db.execute("CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_datasets_last_access ON datasets(last_access)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_project_tasks_project ON project_tasks(project_id, position)")
+        
+        # Toute écriture sur un portfolio, ses projets ou ses compétences change sa version
+        db.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_portfolios_version
+            AFTER UPDATE OF full_name, titre, bio, email, github, linkedin ON portfolios
+            BEGIN
+                UPDATE portfolios SET version = version + 1 WHERE id = NEW.id;
+            END
+        """)
+        for table in ('portfolio_projects', 'portfolio_skills'):
+            for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+                db.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_version
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE portfolios SET version = version + 1 WHERE id = {row}.portfolio_id;
+                    END
+                """)
+        
+        db.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_projects_portfolio ON portfolio_projects(portfolio_id)")
+        
+        # Une compétence par portfolio (migration unique : on garde la saisie la plus récente)
+        if not _index_exists(db, "idx_portfolio_skills_unique"):
+            db.execute("""
+                DELETE FROM portfolio_skills WHERE id NOT IN (
+                    SELECT MAX(id) FROM portfolio_skills GROUP BY portfolio_id, competence
+                )
+            """)
+        db.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_portfolio_skills_unique
+            ON portfolio_skills(portfolio_id, competence)
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_due ON flashcards(user_id, due_at)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_review_log_user_date ON review_log(user_id, reviewed_at)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_business_cases_niveau ON business_cases(niveau, domaine)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_business_cases_domaine ON business_cases(domaine)")
+        
+        # Une même question ne peut exister qu'une fois par matière et par utilisateur
+        # (COALESCE : les cartes partagées ont user_id NULL, distinct de tout autre NULL)
+        if not _index_exists(db, "idx_flashcards_unique"):
+            _merge_duplicate_flashcards(db)
+        db.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_flashcards_unique
+            ON flashcards(COALESCE(user_id, 0), matiere, question)
+        """)
         
         db.commit()
         
-        print("✅ Base de données initialisée avec succès !")
-        print(f"📁 Fichier : {DB_PATH}")
+        if verbose:
+            print("✅ Base de données initialisée avec succès !")
+            print(f"📁 Fichier : {DB_PATH}")
+
+
+# Colonnes de planification des flashcards (répétition espacée SM-2)
+FLASHCARD_SCHEDULE_COLUMNS = {
+    'ease': 'REAL DEFAULT 2.5',
+    'interval_days': 'REAL DEFAULT 0',
+    'repetitions': 'INTEGER DEFAULT 0',
+    'due_at': 'TIMESTAMP'
+}
+
+
+def _add_missing_columns(db: Database, table: str, columns: Dict[str, str]):
+    """Ajoute à une table existante les colonnes absentes (migration légère)"""
+    db.execute(f"PRAGMA table_info({table})")
+    existing = {row['name'] for row in db.fetchall()}
+    for name, definition in columns.items():
+        if name not in existing:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+def _index_exists(db: Database, name: str) -> bool:
+    """Indique si l'index existe déjà (les migrations qui le précèdent ont donc été faites)"""
+    db.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,))
+    return db.fetchone() is not None
+
+
+def _merge_duplicate_flashcards(db: Database):
+    """
+    Supprime les doublons de flashcards (migration unique, avant idx_flashcards_unique)
+
+    Parmi les cartes d'une même question, on garde la plus révisée (historique,
+    puis répétitions, puis révision la plus récente) ; l'historique des autres
+    lui est rattaché.
+    """
+    db.execute("""
+        CREATE TEMP TABLE flashcard_duplicates AS
+        SELECT id, keep_id FROM (
+            SELECT f.id, FIRST_VALUE(f.id) OVER (
+                PARTITION BY COALESCE(f.user_id, 0), f.matiere, f.question
+                ORDER BY (SELECT COUNT(*) FROM review_log r WHERE r.flashcard_id = f.id) DESC,
+                         f.repetitions DESC, f.dernier_revu DESC, f.id
+            ) AS keep_id
+            FROM flashcards f
+        ) WHERE id != keep_id
+    """)
+    db.execute("""
+        UPDATE review_log SET flashcard_id = (
+            SELECT keep_id FROM temp.flashcard_duplicates d WHERE d.id = review_log.flashcard_id
+        )
+        WHERE flashcard_id IN (SELECT id FROM temp.flashcard_duplicates)
+    """)
+    db.execute("DELETE FROM flashcards WHERE id IN (SELECT id FROM temp.flashcard_duplicates)")
+    db.execute("DROP TABLE temp.flashcard_duplicates")
+
+
+def _task_rows(project_id: int, tasks: List) -> List[Tuple]:
+    """Lignes de project_tasks pour une liste de tâches (noms ou dictionnaires nom/done)"""
+    rows = []
+    for position, task in enumerate(tasks):
+        if isinstance(task, dict):
+            rows.append((project_id, position, task['nom'], int(bool(task.get('done')))))
+        else:
+            rows.append((project_id, position, str(task), 0))
+    return rows
+
+
+def timestamp(moment: datetime = None) -> str:
+    """Horodatage texte comparable dans SQLite (YYYY-MM-DD HH:MM:SS)"""
+    return (moment or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+
+
+_schema_ready = False
+
+
+def ensure_schema():
+    """
+    Crée les tables manquantes (une seule fois par processus)
+    Les bases existantes n'ont pas forcément les tables ajoutées après coup
+    """
+    global _schema_ready
+    if not _schema_ready:
+        init_database(verbose=False)
+        _schema_ready = True
 
 
 def hash_password(password: str) -> str:
@@ -469,12 +682,18 @@ def create_exercise(exercise_data: Dict) -> int:
 
 
 def get_exercises(matiere: str = None, niveau: str = None, exercise_type: str = None,
-                 course_id: int = None) -> List[Dict]:
-    """Récupère les exercices avec filtres"""
+                 course_id: int = None, include_templates: bool = False) -> List[Dict]:
+    """
+    Récupère les exercices avec filtres
+    Les variantes générées par modèle (exercise_id 'tpl:...') sont exclues par défaut
+    """
     with Database() as db:
         query = "SELECT * FROM exercises WHERE 1=1"
         params = []
         
+        if not include_templates:
+            query += " AND exercise_id NOT LIKE 'tpl:%'"
+        
         if matiere:
             query += " AND matiere = ?"
             params.append(matiere)
@@ -520,17 +739,108 @@ def get_exercise_by_id(exercise_id: int) -> Optional[Dict]:
         return None
 
 
+def create_exercises_bulk(exercises: List[Dict]) -> int:
+    """
+    Crée plusieurs exercices en une transaction
+    Les exercice_id déjà présents sont ignorés
+
+    Returns:
+        Nombre d'exercices insérés
+    """
+    ensure_schema()
+    with Database() as db:
+        before = db.conn.total_changes
+        db.cursor.executemany("""
+            INSERT OR IGNORE INTO exercises (exercise_id, course_id, matiere, type, question,
+                                           options, correct_index, solution, explication,
+                                           niveau, difficulte, concepts, temps_estime, source)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            ex['exercise_id'],
+            ex.get('course_id'),
+            ex['matiere'],
+            ex['type'],
+            ex['question'],
+            json.dumps(ex.get('options', [])),
+            ex.get('correct_index'),
+            ex.get('solution'),
+            ex.get('explication'),
+            ex['niveau'],
+            ex.get('difficulte'),
+            json.dumps(ex.get('concepts', [])),
+            ex.get('temps_estime'),
+            ex.get('source', 'IA Gemini')
+        ) for ex in exercises])
+        db.commit()
+        return db.conn.total_changes - before
+
+
+def get_exercises_by_id_prefix(prefix: str) -> List[Dict]:
+    """
+    Récupère les exercices dont l'exercise_id commence par prefix
+    (parcours de l'index unique sur exercise_id)
+    """
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            SELECT * FROM exercises
+            WHERE exercise_id >= ? AND exercise_id < ?
+            ORDER BY exercise_id
+        """, _prefix_range(prefix))
+        rows = db.fetchall()
+        
+        exercises = []
+        for row in rows:
+            exercise = db.row_to_dict(row)
+            if exercise['options']:
+                exercise['options'] = json.loads(exercise['options'])
+            if exercise['concepts']:
+                exercise['concepts'] = json.loads(exercise['concepts'])
+            exercises.append(exercise)
+        
+        return exercises
+
+
+def prune_exercises_by_id_prefix(prefix: str, keep: int) -> int:
+    """
+    Supprime les exercices dont l'exercise_id commence par prefix,
+    sauf les keep plus récemment créés
+
+    Returns:
+        Nombre d'exercices supprimés
+    """
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            DELETE FROM exercises
+            WHERE exercise_id >= :low AND exercise_id < :high
+              AND id NOT IN (
+                  SELECT id FROM exercises
+                  WHERE exercise_id >= :low AND exercise_id < :high
+                  ORDER BY id DESC LIMIT :keep
+              )
+        """, dict(zip(('low', 'high'), _prefix_range(prefix)), keep=keep))
+        db.commit()
+        return db.cursor.rowcount
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """Bornes [prefix, suivant) des identifiants commençant par prefix (parcours d'index)"""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
 # Continuer avec les autres tables...
 
 # ========== PROJECTS ==========
 
 def create_project(project_data: Dict, user_id: int = None) -> int:
-    """Crée un nouveau projet"""
+    """Crée un nouveau projet et ses tâches (clé 'taches' ou 'tasks')"""
+    ensure_schema()
     with Database() as db:
         db.execute("""
             INSERT INTO projects (user_id, nom, type, description, date_debut, date_fin,
-                                status, technologies, taches)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                status, technologies)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             user_id,
             project_data['nom'],
@@ -539,29 +849,33 @@ def create_project(project_data: Dict, user_id: int = None) -> int:
             project_data.get('date_debut'),
             project_data.get('date_fin'),
             project_data['status'],
-            json.dumps(project_data.get('technologies', [])),
-            json.dumps(project_data.get('taches', []))
+            json.dumps(project_data.get('technologies', []))
         ))
+        project_id = db.cursor.lastrowid
+        tasks = project_data.get('taches') or project_data.get('tasks') or []
+        db.cursor.executemany(
+            "INSERT INTO project_tasks (project_id, position, nom, done) VALUES (?, ?, ?, ?)",
+            _task_rows(project_id, tasks)
+        )
         db.commit()
-        return db.cursor.lastrowid
+        return project_id
 
 
 def get_projects(user_id: int = None, status: str = None) -> List[Dict]:
-    """Récupère les projets avec filtres"""
+    """Récupère les projets avec filtres (et la liste complète de leurs tâches)"""
+    ensure_schema()
     with Database() as db:
-        query = "SELECT * FROM projects WHERE 1=1"
+        where = "WHERE 1=1"
         params = []
         
         if user_id:
-            query += " AND user_id = ?"
+            where += " AND user_id = ?"
             params.append(user_id)
         if status:
-            query += " AND status = ?"
+            where += " AND status = ?"
             params.append(status)
         
-        query += " ORDER BY created_at DESC"
-        
-        db.execute(query, tuple(params))
+        db.execute(f"SELECT * FROM projects {where} ORDER BY created_at DESC", tuple(params))
         rows = db.fetchall()
         
         projects = []
@@ -569,10 +883,19 @@ def get_projects(user_id: int = None, status: str = None) -> List[Dict]:
             project = db.row_to_dict(row)
             if project['technologies']:
                 project['technologies'] = json.loads(project['technologies'])
-            if project['taches']:
-                project['taches'] = json.loads(project['taches'])
+            project['taches'] = []
             projects.append(project)
         
+        # Tâches de tous les projets en une requête
+        by_id = {project['id']: project for project in projects}
+        db.execute(f"""
+            SELECT project_id, nom, done FROM project_tasks
+            WHERE project_id IN (SELECT id FROM projects {where})
+            ORDER BY project_id, position
+        """, tuple(params))
+        for task in db.fetchall():
+            by_id[task['project_id']]['taches'].append({'nom': task['nom'], 'done': bool(task['done'])})
+        
         return projects
 
 
@@ -587,21 +910,79 @@ def update_project(project_id: int, updates: Dict):
 
 
 def delete_project(project_id: int):
-    """Supprime un projet"""
+    """Supprime un projet et ses tâches"""
     with Database() as db:
+        db.execute("DELETE FROM project_tasks WHERE project_id = ?", (project_id,))
         db.execute("DELETE FROM projects WHERE id = ?", (project_id,))
         db.commit()
 
 
+def get_projects_with_progress(user_id: int = None, status: str = None) -> List[Dict]:
+    """
+    Récupère les projets avec l'avancement de leurs tâches, calculé par SQLite
+
+    Returns:
+        Projets avec total_taches, taches_faites et progression (en %)
+    """
+    ensure_schema()
+    with Database() as db:
+        query = """
+            SELECT p.id, p.user_id, p.nom, p.type, p.description, p.date_debut, p.date_fin,
+                   p.status, p.technologies, p.created_at, p.updated_at,
+                   COUNT(t.id) AS total_taches,
+                   COALESCE(SUM(t.done), 0) AS taches_faites,
+                   CASE WHEN COUNT(t.id) = 0 THEN 0
+                        ELSE ROUND(100.0 * SUM(t.done) / COUNT(t.id)) END AS progression
+            FROM projects p
+            LEFT JOIN project_tasks t ON t.project_id = p.id
+            WHERE 1=1
+        """
+        params = []
+        
+        if user_id:
+            query += " AND p.user_id = ?"
+            params.append(user_id)
+        if status:
+            query += " AND p.status = ?"
+            params.append(status)
+        
+        query += " GROUP BY p.id ORDER BY p.created_at DESC"
+        
+        db.execute(query, tuple(params))
+        projects = db.rows_to_dicts(db.fetchall())
+        for project in projects:
+            project['technologies'] = json.loads(project['technologies'] or '[]')
+        return projects
+
+
+def get_project_tasks(project_id: int) -> List[Dict]:
+    """Récupère les tâches d'un projet, dans l'ordre"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            SELECT * FROM project_tasks WHERE project_id = ? ORDER BY position
+        """, (project_id,))
+        tasks = db.rows_to_dicts(db.fetchall())
+        for task in tasks:
+            task['done'] = bool(task['done'])
+        return tasks
+
+
 # ========== FLASHCARDS ==========
 
-def create_flashcard(flashcard_data: Dict, user_id: int = None) -> int:
-    """Crée une nouvelle flashcard"""
+def create_flashcard(flashcard_data: Dict, user_id: int = None) -> Optional[int]:
+    """
+    Crée une nouvelle flashcard (due immédiatement)
+
+    Returns:
+        ID de la flashcard, ou None si la question existe déjà pour cette matière
+    """
+    ensure_schema()
     with Database() as db:
         db.execute("""
-            INSERT INTO flashcards (user_id, matiere, question, reponse, explication,
-                                  dernier_revu, difficulte)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT OR IGNORE INTO flashcards (user_id, matiere, question, reponse, explication,
+                                            dernier_revu, difficulte, due_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             user_id,
             flashcard_data['matiere'],
@@ -609,10 +990,42 @@ def create_flashcard(flashcard_data: Dict, user_id: int = None) -> int:
             flashcard_data['reponse'],
             flashcard_data.get('explication'),
             flashcard_data.get('dernier_revu'),
-            flashcard_data.get('difficulte')
+            flashcard_data.get('difficulte'),
+            timestamp()
         ))
         db.commit()
-        return db.cursor.lastrowid
+        return db.cursor.lastrowid if db.cursor.rowcount else None
+
+
+def create_flashcards_bulk(flashcards: List[Dict], user_id: int = None) -> int:
+    """
+    Crée plusieurs flashcards en une transaction
+    Les questions déjà présentes (même utilisateur et matière) sont ignorées :
+    importer deux fois le même paquet ne crée pas de doublons.
+
+    Returns:
+        Nombre de flashcards insérées
+    """
+    ensure_schema()
+    now = timestamp()
+    with Database() as db:
+        before = db.conn.total_changes
+        db.cursor.executemany("""
+            INSERT OR IGNORE INTO flashcards (user_id, matiere, question, reponse, explication,
+                                            dernier_revu, difficulte, due_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            user_id,
+            fc['matiere'],
+            fc['question'],
+            fc['reponse'],
+            fc.get('explication'),
+            fc.get('dernier_revu'),
+            fc.get('difficulte'),
+            now
+        ) for fc in flashcards])
+        db.commit()
+        return db.conn.total_changes - before
 
 
 def get_flashcards(user_id: int = None, matiere: str = None) -> List[Dict]:
@@ -634,15 +1047,155 @@ def get_flashcards(user_id: int = None, matiere: str = None) -> List[Dict]:
         return db.rows_to_dicts(db.fetchall())
 
 
-def update_flashcard_review(flashcard_id: int, difficulte: str):
-    """Met à jour la difficulté et date de révision d'une flashcard"""
+def get_due_flashcards(user_id: int = None, limit: int = 20, matiere: str = None,
+                       now: datetime = None) -> List[Dict]:
+    """
+    Prochaines flashcards à réviser (due_at dépassé), les plus en retard d'abord
+
+    Parcourt l'index (user_id, due_at) : seules les limit premières cartes
+    dues sont lues, quelle que soit la taille du paquet.
+    """
+    ensure_schema()
     with Database() as db:
-        db.execute("""
+        query = """
+            SELECT * FROM flashcards INDEXED BY idx_flashcards_due
+            WHERE user_id IS ? AND due_at <= ?
+        """
+        params = [user_id, timestamp(now)]
+        
+        if matiere:
+            query += " AND matiere = ?"
+            params.append(matiere)
+        
+        query += " ORDER BY due_at LIMIT ?"
+        params.append(limit)
+        
+        db.execute(query, tuple(params))
+        return db.rows_to_dicts(db.fetchall())
+
+
+def get_flashcard_matieres(user_id: int = None) -> List[str]:
+    """Matières ayant au moins une flashcard"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("SELECT DISTINCT matiere FROM flashcards WHERE user_id IS ? ORDER BY matiere", (user_id,))
+        return [row['matiere'] for row in db.fetchall()]
+
+
+def update_flashcard_review(flashcard_id: int, difficulte: str, schedule: Dict = None):
+    """
+    Met à jour la difficulté et date de révision d'une flashcard
+
+    Args:
+        schedule: Nouvel état de planification (ease, interval_days, repetitions, due_at)
+    """
+    record_flashcard_reviews([{'id': flashcard_id, 'difficulte': difficulte, **(schedule or {})}])
+
+
+def record_flashcard_reviews(reviews: List[Dict]) -> int:
+    """
+    Enregistre un lot de révisions en une seule transaction
+
+    Chaque révision met à jour la flashcard (difficulté et, si fournis, ease,
+    interval_days, repetitions, due_at) et ajoute une ligne à review_log.
+
+    Args:
+        reviews: Liste de dictionnaires avec id, difficulte, et optionnellement
+                 user_id, matiere, reviewed_at et les champs de planification
+
+    Returns:
+        Nombre de révisions enregistrées
+    """
+    if not reviews:
+        return 0
+    ensure_schema()
+    now = timestamp()
+    rows = [{
+        'id': review['id'],
+        'user_id': review.get('user_id'),
+        'matiere': review.get('matiere'),
+        'difficulte': review['difficulte'],
+        'ease': review.get('ease'),
+        'interval_days': review.get('interval_days'),
+        'repetitions': review.get('repetitions'),
+        'due_at': review.get('due_at'),
+        'reviewed_at': review.get('reviewed_at') or now
+    } for review in reviews]
+    
+    with Database() as db:
+        db.conn.executemany("""
             UPDATE flashcards 
-            SET dernier_revu = ?, difficulte = ?
-            WHERE id = ?
-        """, (datetime.now(), difficulte, flashcard_id))
+            SET dernier_revu = :reviewed_at, difficulte = :difficulte,
+                ease = COALESCE(:ease, ease),
+                interval_days = COALESCE(:interval_days, interval_days),
+                repetitions = COALESCE(:repetitions, repetitions),
+                due_at = COALESCE(:due_at, due_at)
+            WHERE id = :id
+        """, rows)
+        db.conn.executemany("""
+            INSERT INTO review_log (flashcard_id, user_id, matiere, difficulte, ease,
+                                    interval_days, reviewed_at)
+            VALUES (:id, :user_id, :matiere, :difficulte, :ease, :interval_days, :reviewed_at)
+        """, rows)
         db.commit()
+    return len(rows)
+
+
+def get_flashcard_stats(user_id: int = None, days: int = 30) -> Dict:
+    """
+    Statistiques de révision agrégées par SQLite (GROUP BY)
+
+    Seuls les agrégats sont transférés : le coût côté Python ne dépend pas
+    du nombre de flashcards.
+
+    Args:
+        user_id: Propriétaire des flashcards (None = cartes partagées)
+        days: Profondeur de l'historique des révisions par jour
+
+    Returns:
+        total, revues, faciles, difficiles, dues, par_matiere, par_difficulte, par_jour
+    """
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            SELECT matiere,
+                   COUNT(*) AS total,
+                   COUNT(dernier_revu) AS revues,
+                   SUM(difficulte = 'facile') AS faciles,
+                   SUM(difficulte = 'difficile') AS difficiles,
+                   SUM(due_at <= ?) AS dues
+            FROM flashcards
+            WHERE user_id IS ?
+            GROUP BY matiere
+            ORDER BY total DESC
+        """, (timestamp(), user_id))
+        par_matiere = db.rows_to_dicts(db.fetchall())
+        
+        db.execute("""
+            SELECT COALESCE(difficulte, 'jamais revue') AS difficulte, COUNT(*) AS total
+            FROM flashcards
+            WHERE user_id IS ?
+            GROUP BY difficulte
+        """, (user_id,))
+        par_difficulte = {row['difficulte']: row['total'] for row in db.fetchall()}
+        
+        db.execute("""
+            SELECT date(reviewed_at) AS jour, COUNT(*) AS revues
+            FROM review_log
+            WHERE user_id IS ? AND reviewed_at >= date('now', 'localtime', ?)
+            GROUP BY jour
+            ORDER BY jour
+        """, (user_id, f'-{days} days'))
+        par_jour = db.rows_to_dicts(db.fetchall())
+    
+    stats = {key: sum(row[key] or 0 for row in par_matiere)
+             for key in ('total', 'revues', 'faciles', 'difficiles', 'dues')}
+    return {
+        **stats,
+        'par_matiere': par_matiere,
+        'par_difficulte': par_difficulte,
+        'par_jour': par_jour
+    }
 
 
 # ========== PORTFOLIOS ==========
@@ -750,6 +1303,36 @@ def add_portfolio_skill(portfolio_id: int, competence: str, niveau: str) -> int:
         return db.cursor.lastrowid
 
 
+def save_portfolio_skills(portfolio_id: int, skills: Dict[str, str]) -> int:
+    """
+    Enregistre les niveaux de compétences d'un portfolio en une transaction
+
+    Seules les compétences nouvelles ou dont le niveau a changé sont écrites
+    (upsert sur l'index unique (portfolio_id, competence)).
+
+    Args:
+        skills: {compétence: niveau}
+
+    Returns:
+        Nombre de compétences ajoutées ou modifiées
+    """
+    ensure_schema()
+    with Database() as db:
+        db.execute("SELECT competence, niveau FROM portfolio_skills WHERE portfolio_id = ?", (portfolio_id,))
+        current = {row['competence']: row['niveau'] for row in db.fetchall()}
+        changes = [(portfolio_id, competence, niveau) for competence, niveau in skills.items()
+                   if current.get(competence) != niveau]
+        
+        if changes:
+            db.cursor.executemany("""
+                INSERT INTO portfolio_skills (portfolio_id, competence, niveau)
+                VALUES (?, ?, ?)
+                ON CONFLICT (portfolio_id, competence) DO UPDATE SET niveau = excluded.niveau
+            """, changes)
+            db.commit()
+        return len(changes)
+
+
 def get_portfolio_skills(portfolio_id: int) -> List[Dict]:
     """Récupère les compétences d'un portfolio"""
     with Database() as db:
@@ -757,6 +1340,103 @@ def get_portfolio_skills(portfolio_id: int) -> List[Dict]:
         return db.rows_to_dicts(db.fetchall())
 
 
+class PortfolioBundle(NamedTuple):
+    """Portfolio complet en lecture seule : infos, projets et compétences"""
+    portfolio: MappingProxyType
+    projects: Tuple[MappingProxyType, ...]
+    skills: Tuple[MappingProxyType, ...]
+
+
+def _load_bundle(column: str, value: int) -> Optional[PortfolioBundle]:
+    """
+    Une seule requête : projets et compétences agrégés en JSON par SQLite
+
+    Les sous-requêtes triées par id gardent l'ordre de saisie ; des
+    technologies qui ne sont pas du JSON valide donnent une liste vide.
+    """
+    ensure_schema()
+    with Database() as db:
+        db.execute(f"""
+            SELECT p.*,
+                   (SELECT json_group_array(json_object(
+                        'id', pp.id, 'titre', pp.titre, 'description', pp.description,
+                        'categorie', pp.categorie, 'duree', pp.duree,
+                        'technologies', CASE WHEN json_valid(pp.technologies)
+                                             THEN json(pp.technologies) ELSE '[]' END,
+                        'github', pp.github, 'demo', pp.demo, 'resultats', pp.resultats))
+                    FROM (SELECT * FROM portfolio_projects
+                          WHERE portfolio_id = p.id ORDER BY id) pp) AS projects_json,
+                   (SELECT json_group_array(json_object(
+                        'id', ps.id, 'competence', ps.competence, 'niveau', ps.niveau))
+                    FROM (SELECT * FROM portfolio_skills
+                          WHERE portfolio_id = p.id ORDER BY id) ps) AS skills_json
+            FROM portfolios p
+            WHERE p.{column} = ?
+        """, (value,))
+        row = db.row_to_dict(db.fetchone())
+    
+    if not row:
+        return None
+    projects = json.loads(row.pop('projects_json'))
+    skills = json.loads(row.pop('skills_json'))
+    for project in projects:
+        technologies = project['technologies']
+        project['technologies'] = tuple(technologies) if isinstance(technologies, list) else ()
+    return PortfolioBundle(
+        portfolio=MappingProxyType(row),
+        projects=tuple(MappingProxyType(project) for project in projects),
+        skills=tuple(MappingProxyType(skill) for skill in skills)
+    )
+
+
+def load_portfolio_bundle(user_id: int) -> Optional[PortfolioBundle]:
+    """
+    Portfolio d'un étudiant avec ses projets et compétences, en un aller-retour
+
+    Returns:
+        PortfolioBundle immuable, ou None si l'étudiant n'a pas de portfolio
+    """
+    return _load_bundle('user_id', user_id)
+
+
+def load_portfolio_bundle_by_id(portfolio_id: int) -> Optional[PortfolioBundle]:
+    """Comme load_portfolio_bundle, à partir de l'ID du portfolio"""
+    return _load_bundle('id', portfolio_id)
+
+
+def get_portfolio_version(portfolio_id: int) -> Optional[int]:
+    """Version courante d'un portfolio (None s'il n'existe pas)"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("SELECT version FROM portfolios WHERE id = ?", (portfolio_id,))
+        row = db.fetchone()
+        return row['version'] if row else None
+
+
+def get_promos() -> List[str]:
+    """Promotions ayant au moins un étudiant avec un portfolio"""
+    with Database() as db:
+        db.execute("""
+            SELECT DISTINCT u.promo FROM users u
+            JOIN portfolios p ON p.user_id = u.id
+            WHERE u.promo IS NOT NULL
+            ORDER BY u.promo
+        """)
+        return [row['promo'] for row in db.fetchall()]
+
+
+def get_portfolio_ids_by_promo(promo: str) -> List[int]:
+    """Identifiants des portfolios des étudiants d'une promotion"""
+    with Database() as db:
+        db.execute("""
+            SELECT p.id FROM portfolios p
+            JOIN users u ON u.id = p.user_id
+            WHERE u.promo = ?
+            ORDER BY u.full_name, p.id
+        """, (promo,))
+        return [row['id'] for row in db.fetchall()]
+
+
 # ========== FORUM ==========
 
 def create_forum_post(post_data: Dict, user_id: int = None) -> int:
@@ -848,6 +1528,96 @@ def mark_post_as_resolved(post_id: int):
     return mark_post_resolved(post_id)
 
 
+# ========== DATASETS ==========
+
+def register_dataset(dataset_data: Dict):
+    """Enregistre (ou remplace) les métadonnées d'un dataset stocké"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            INSERT OR REPLACE INTO datasets (dataset_key, dataset_type, params, n_rows,
+                                            n_cols, file_path, size_bytes,
+                                            last_access, access_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+        """, (
+            dataset_data['dataset_key'],
+            dataset_data['dataset_type'],
+            json.dumps(dataset_data.get('params', {}), sort_keys=True),
+            dataset_data['n_rows'],
+            dataset_data['n_cols'],
+            dataset_data['file_path'],
+            dataset_data['size_bytes'],
+            datetime.now()
+        ))
+        db.commit()
+
+
+def get_dataset_meta(dataset_key: str) -> Optional[Dict]:
+    """Récupère les métadonnées d'un dataset stocké"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("SELECT * FROM datasets WHERE dataset_key = ?", (dataset_key,))
+        row = db.fetchone()
+        if row:
+            dataset = db.row_to_dict(row)
+            dataset['params'] = json.loads(dataset['params'])
+            return dataset
+        return None
+
+
+def touch_dataset(dataset_key: str):
+    """Met à jour la date de dernier accès d'un dataset (politique LRU)"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            UPDATE datasets
+            SET last_access = ?, access_count = access_count + 1
+            WHERE dataset_key = ?
+        """, (datetime.now(), dataset_key))
+        db.commit()
+
+
+def get_datasets() -> List[Dict]:
+    """Récupère tous les datasets stockés, du plus récemment utilisé au plus ancien"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("SELECT * FROM datasets ORDER BY last_access DESC")
+        datasets = []
+        for row in db.fetchall():
+            dataset = db.row_to_dict(row)
+            dataset['params'] = json.loads(dataset['params'])
+            datasets.append(dataset)
+        return datasets
+
+
+def get_datasets_total_size() -> int:
+    """Taille totale (octets) des datasets stockés"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM datasets")
+        return db.fetchone()[0]
+
+
+def get_lru_datasets(limit: int = 50) -> List[Dict]:
+    """Récupère les datasets les moins récemment utilisés (candidats à l'éviction)"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            SELECT dataset_key, file_path, size_bytes FROM datasets
+            ORDER BY last_access ASC
+            LIMIT ?
+        """, (limit,))
+        return db.rows_to_dicts(db.fetchall())
+
+
+def delete_dataset_meta(dataset_key: str):
+    """Supprime les métadonnées d'un dataset"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("DELETE FROM datasets WHERE dataset_key = ?", (dataset_key,))
+        db.commit()
+
+
 # ========== STATISTICS & ANALYTICS ==========
 
 def get_database_stats() -> Dict:
@@ -934,6 +1704,85 @@ def get_posts_by_matiere(matiere: str) -> List[Dict]:
         return posts
 
 
+def save_business_cases(cases: List[Dict]) -> int:
+    """
+    Enregistre le catalogue des cas business en une transaction
+
+    Les cas sont identifiés par leur id (upsert) ; leurs compétences sont
+    réécrites dans business_case_competences.
+
+    Returns:
+        Nombre de cas enregistrés
+    """
+    ensure_schema()
+    rows = [(case['id'], case['titre'], case['niveau'], case['domaine'], case['description'],
+             json.dumps(list(case.get('objectifs', [])), ensure_ascii=False),
+             json.dumps(list(case.get('competences', [])), ensure_ascii=False),
+             case.get('duree')) for case in cases]
+    competences = [(case['id'], competence) for case in cases
+                   for competence in dict.fromkeys(case.get('competences', []))]
+    
+    with Database() as db:
+        db.cursor.executemany("""
+            INSERT INTO business_cases (id, titre, niveau, domaine, description, objectifs, competences, duree)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                titre = excluded.titre, niveau = excluded.niveau, domaine = excluded.domaine,
+                description = excluded.description, objectifs = excluded.objectifs,
+                competences = excluded.competences, duree = excluded.duree
+        """, rows)
+        db.cursor.executemany("DELETE FROM business_case_competences WHERE case_id = ?",
+                              [(row[0],) for row in rows])
+        db.cursor.executemany("""
+            INSERT INTO business_case_competences (case_id, competence) VALUES (?, ?)
+        """, competences)
+        db.commit()
+    return len(rows)
+
+
+def get_business_cases() -> List[Dict]:
+    """Catalogue complet des cas business (objectifs et compétences décodés)"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("SELECT * FROM business_cases ORDER BY id")
+        cases = db.rows_to_dicts(db.fetchall())
+    for case in cases:
+        case['objectifs'] = json.loads(case['objectifs']) if case['objectifs'] else []
+        case['competences'] = json.loads(case['competences']) if case['competences'] else []
+    return cases
+
+
+def search_cases(niveau: str = None, domaines: List[str] = None,
+                 competences: List[str] = None) -> List[int]:
+    """
+    Identifiants des cas business correspondant aux filtres (par id croissant)
+
+    Args:
+        niveau: Niveau exact (B1, B2, B3), tous si None
+        domaines: Au moins un de ces domaines, tous si vide
+        competences: Au moins une de ces compétences, toutes si vide
+    """
+    ensure_schema()
+    conditions, params = [], []
+    if niveau:
+        conditions.append("niveau = ?")
+        params.append(niveau)
+    if domaines:
+        conditions.append(f"domaine IN ({', '.join('?' * len(domaines))})")
+        params.extend(domaines)
+    if competences:
+        conditions.append(f"""id IN (
+            SELECT case_id FROM business_case_competences
+            WHERE competence IN ({', '.join('?' * len(competences))})
+        )""")
+        params.extend(competences)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    with Database() as db:
+        db.execute(f"SELECT id FROM business_cases {where} ORDER BY id", params)
+        return [row['id'] for row in db.fetchall()]
+
+
 def create_business_case_submission(submission_data: Dict) -> int:
     """Crée une soumission de cas business"""
     # Note: Cette table n'existe pas dans le schéma actuel
@@ -997,22 +1846,39 @@ def update_project_status(project_id: int, status: str):
         db.commit()
 
 
-def add_project_task(project_id: int, task_name: str):
-    """Ajoute une tâche à un projet (stockée en JSON dans le champ tasks)"""
-    # Note: Cette fonction nécessite de récupérer les tâches existantes et les modifier
-    pass
+def add_project_task(project_id: int, task_name: str) -> int:
+    """Ajoute une tâche à la fin d'un projet"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            INSERT INTO project_tasks (project_id, position, nom)
+            VALUES (?, (SELECT COALESCE(MAX(position) + 1, 0) FROM project_tasks WHERE project_id = ?), ?)
+        """, (project_id, project_id, task_name))
+        db.commit()
+        return db.cursor.lastrowid
 
 
 def update_task_status(project_id: int, task_index: int, done: bool):
-    """Met à jour le statut d'une tâche"""
-    # Note: Cette fonction nécessite de récupérer les tâches existantes et les modifier
-    pass
+    """Met à jour le statut d'une tâche (task_index : position dans le projet)"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("""
+            UPDATE project_tasks SET done = ? WHERE project_id = ? AND position = ?
+        """, (int(done), project_id, task_index))
+        db.commit()
 
 
 def delete_task(project_id: int, task_index: int):
-    """Supprime une tâche d'un projet"""
-    # Note: Cette fonction nécessite de récupérer les tâches existantes et les modifier
-    pass
+    """Supprime une tâche d'un projet et renumérote les suivantes"""
+    ensure_schema()
+    with Database() as db:
+        db.execute("DELETE FROM project_tasks WHERE project_id = ? AND position = ?",
+                   (project_id, task_index))
+        db.execute("""
+            UPDATE project_tasks SET position = position - 1
+            WHERE project_id = ? AND position > ?
+        """, (project_id, task_index))
+        db.commit()
 
 
 def update_portfolio_info(portfolio_id: int, info_data: Dict):
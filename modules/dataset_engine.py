@@ -0,0 +1,421 @@
+"""
+Moteur de génération des datasets synthétiques
+Fonctions pures (sans Streamlit) utilisées par le Générateur de Datasets
+
+Chaque générateur est vectorisé (aucune boucle Python par ligne) et produit
+les données par blocs de CHUNK_ROWS lignes : un bloc ne dépend que de la
+graine, de son indice et d'un contexte calculé une fois pour tout le dataset.
+On peut donc générer des millions de lignes à mémoire constante avec
+iter_dataset_chunks(), ou tout concaténer avec generate_dataset().
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Callable, Dict, Iterator, List
+
+# Version du moteur : à incrémenter dès que la sortie d'un générateur change,
+# pour invalider les datasets déjà stockés
+ENGINE_VERSION = 3
+
+# Taille des blocs de génération (lignes)
+CHUNK_ROWS = 100_000
+
+DATASET_TYPES = [
+    "Ventes E-commerce", "Données Clients (CRM)", "Données Médicales",
+    "Données Financières", "Logs Utilisateurs", "Données Marketing"
+]
+
+
+def reference_date() -> pd.Timestamp:
+    """Date de référence des datasets (minuit du jour courant)"""
+    return pd.Timestamp.today().normalize()
+
+
+def _categorical(codes: np.ndarray, categories: List[str]) -> pd.Categorical:
+    """Colonne catégorielle à partir d'indices (économe en mémoire et en Parquet)"""
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _choice_codes(rng: np.random.Generator, size: int, p: List[float]) -> np.ndarray:
+    """Tirage vectorisé d'indices selon une distribution discrète"""
+    return np.searchsorted(np.cumsum(p), rng.random(size), side='right').clip(max=len(p) - 1)
+
+
+# ========== VENTES E-COMMERCE ==========
+
+ECOMMERCE_PRODUITS = ['Laptop', 'Smartphone', 'Tablette', 'Écouteurs', 'Clavier',
+                      'Souris', 'Moniteur', 'Webcam', 'Chargeur', 'Câble USB']
+ECOMMERCE_CATEGORIES = ['Informatique', 'Mobile', 'Audio', 'Accessoires']
+ECOMMERCE_PRODUIT_CATEGORIE = np.array([0, 1, 1, 2, 3, 3, 0, 3, 3, 3])
+ECOMMERCE_PRIX_MIN = np.array([500, 300, 200, 20, 15, 10, 150, 30, 10, 5], dtype=float)
+ECOMMERCE_PRIX_MAX = np.array([2000, 1200, 800, 300, 150, 100, 800, 200, 50, 30], dtype=float)
+PAYS = ['France', 'Belgique', 'Suisse', 'Canada', 'Luxembourg']
+
+
+def _chunk_ecommerce(rng: np.random.Generator, start: int, size: int, ctx: Dict) -> pd.DataFrame:
+    idx = np.arange(start, start + size)
+    produit = rng.integers(0, len(ECOMMERCE_PRODUITS), size)
+    quantite = rng.integers(1, 5, size)
+    prix_unitaire = np.round(rng.uniform(ECOMMERCE_PRIX_MIN[produit], ECOMMERCE_PRIX_MAX[produit]), 2)
+
+    return pd.DataFrame({
+        'date': ctx['end_date'] - pd.to_timedelta(ctx['n_rows'] - 1 - idx, unit='h'),
+        'produit': _categorical(produit, ECOMMERCE_PRODUITS),
+        'categorie': _categorical(ECOMMERCE_PRODUIT_CATEGORIE[produit], ECOMMERCE_CATEGORIES),
+        'quantite': quantite,
+        'prix_unitaire': prix_unitaire,
+        'montant_total': np.round(quantite * prix_unitaire, 2),
+        'client_id': rng.integers(1, 500, size),
+        'pays': _categorical(_choice_codes(rng, size, [0.6, 0.15, 0.1, 0.1, 0.05]), PAYS)
+    })
+
+
+# ========== CLIENTS CRM ==========
+
+VILLES = ['Paris', 'Lyon', 'Marseille', 'Toulouse', 'Nice', 'Nantes',
+          'Strasbourg', 'Bordeaux', 'Lille', 'Rennes']
+SEGMENTS = ['Bronze', 'Standard', 'Premium']
+
+
+def _chunk_crm(rng: np.random.Generator, start: int, size: int, ctx: Dict) -> pd.DataFrame:
+    age = np.clip(rng.normal(40, 15, size).astype(int), 18, 80)
+    nb_achats = rng.exponential(5, size).astype(int)
+    ca_total = np.round(nb_achats * rng.uniform(50, 300, size), 2)
+    segment = np.select([ca_total > 2000, ca_total > 500], [2, 1], default=0)
+
+    churn_prob = np.where(nb_achats < 2, 0.3, np.where(segment == 2, 0.1, 0.2))
+
+    return pd.DataFrame({
+        'client_id': 1000 + np.arange(start, start + size),
+        'age': age,
+        'sexe': _categorical(rng.integers(0, 2, size), ['M', 'F']),
+        'ville': _categorical(rng.integers(0, len(VILLES), size), VILLES),
+        'date_inscription': ctx['end_date'] - pd.to_timedelta(rng.integers(1, 1000, size), unit='D'),
+        'nb_achats': nb_achats,
+        'ca_total': ca_total,
+        'segment': _categorical(segment, SEGMENTS),
+        'churn': (rng.random(size) < churn_prob).astype(int)
+    })
+
+
+# ========== DONNÉES MÉDICALES ==========
+
+def _chunk_medical(rng: np.random.Generator, start: int, size: int, ctx: Dict) -> pd.DataFrame:
+    """
+    Constantes patients corrélées : l'IMC et l'âge tirent la tension, le
+    cholestérol et la glycémie ; le risque cardiaque suit un modèle logistique
+    """
+    age = np.clip(rng.normal(52, 17, size), 18, 95).astype(int)
+    sexe = rng.integers(0, 2, size)
+    fumeur = rng.random(size) < 0.25
+    imc = np.clip(rng.normal(24.5 + 0.04 * (age - 50), 4.5), 15, 50)
+
+    systolique = 105 + 0.45 * age + 1.1 * (imc - 25) + 5 * fumeur + rng.normal(0, 10, size)
+    diastolique = 20 + 0.4 * systolique + 0.3 * (imc - 25) + rng.normal(0, 6, size)
+    frequence = 72 + 4 * fumeur - 2 * sexe + 0.3 * (imc - 25) + rng.normal(0, 9, size)
+    cholesterol = 165 + 0.7 * age + 2.2 * (imc - 25) + rng.normal(0, 28, size)
+    glycemie = 0.76 + 0.003 * age + 0.015 * (imc - 25) + rng.gamma(1.5, 0.09, size)
+
+    diabete = glycemie >= 1.26
+    logit = (-7.6 + 0.065 * age + 0.025 * (systolique - 120) + 0.8 * fumeur
+             + 0.008 * (cholesterol - 200) + 0.9 * diabete + 0.4 * (1 - sexe))
+    maladie = rng.random(size) < 1 / (1 + np.exp(-logit))
+
+    return pd.DataFrame({
+        'patient_id': 100000 + np.arange(start, start + size),
+        'age': age,
+        'sexe': _categorical(sexe, ['M', 'F']),
+        'imc': np.round(imc, 1),
+        'fumeur': fumeur.astype(int),
+        'tension_systolique': np.round(systolique).astype(int),
+        'tension_diastolique': np.round(diastolique).astype(int),
+        'frequence_cardiaque': np.round(np.clip(frequence, 40, 180)).astype(int),
+        'cholesterol': np.round(np.clip(cholesterol, 100, 400)).astype(int),
+        'glycemie': np.round(glycemie, 2),
+        'diabete': diabete.astype(int),
+        'maladie_cardiaque': maladie.astype(int)
+    })
+
+
+# ========== DONNÉES FINANCIÈRES ==========
+
+TYPES_TRANSACTION = ['Achat', 'Retrait', 'Virement', 'Prélèvement', 'Dépôt']
+CATEGORIES_FINANCE = ['Alimentation', 'Transport', 'Logement', 'Loisirs',
+                      'Santé', 'Shopping', 'Épargne', 'Autre']
+COMPTES = [f"COMPTE_{i}" for i in range(1, 100)]
+FRAUDE_PAR_TYPE = np.array([0.01, 0.05, 0.04, 0.005, 0.0])
+
+
+def _chunk_finance(rng: np.random.Generator, start: int, size: int, ctx: Dict) -> pd.DataFrame:
+    idx = np.arange(start, start + size)
+    type_trans = _choice_codes(rng, size, [0.5, 0.2, 0.15, 0.1, 0.05])
+
+    # Chaque tirage est fait pour toutes les lignes puis sélectionné selon le type
+    montant = np.select(
+        [type_trans == 0, type_trans == 1, type_trans == 2, type_trans == 3],
+        [rng.exponential(50, size),
+         np.array([20, 50, 100, 200], dtype=float)[rng.integers(0, 4, size)],
+         rng.uniform(100, 2000, size),
+         rng.uniform(20, 500, size)],
+        default=rng.uniform(500, 3000, size)
+    ).round(2)
+    categorie = np.select(
+        [type_trans == 0, type_trans == 3, type_trans == 4],
+        [_choice_codes(rng, size, [0.3, 0.15, 0.2, 0.15, 0.05, 0.1, 0.03, 0.02]),
+         np.where(rng.random(size) < 0.6, 2, 7),
+         np.full(size, 6)],
+        default=7
+    )
+
+    # Fraudes (~2 %) : surtout des retraits et virements, aux montants anormalement élevés
+    fraude = rng.random(size) < FRAUDE_PAR_TYPE[type_trans]
+    montant = np.where(fraude, np.round(montant * rng.uniform(2, 8, size), 2), montant)
+
+    return pd.DataFrame({
+        'date': ctx['end_date'] - pd.to_timedelta(3 * (ctx['n_rows'] - 1 - idx), unit='h'),
+        'montant': montant,
+        'type': _categorical(type_trans, TYPES_TRANSACTION),
+        'categorie': _categorical(categorie, CATEGORIES_FINANCE),
+        'compte': _categorical(rng.integers(0, len(COMPTES), size), COMPTES),
+        'fraude': fraude.astype(int)
+    })
+
+
+# ========== LOGS UTILISATEURS ==========
+
+PAGES = ['accueil', 'catalogue', 'produit', 'recherche', 'panier', 'paiement',
+         'confirmation', 'compte', 'aide']
+DEVICES = ['desktop', 'mobile', 'tablette']
+SOURCES = ['organique', 'publicité', 'email', 'direct', 'réseaux sociaux']
+
+# Matrice de transition de Markov entre pages ; dernière colonne = sortie du site
+PAGE_TRANSITIONS = np.array([
+    # acc   cat   prod  rech  pan   paie  conf  cpt   aide  sortie
+    [0.00, 0.35, 0.15, 0.15, 0.00, 0.00, 0.00, 0.08, 0.02, 0.25],  # accueil
+    [0.05, 0.10, 0.50, 0.10, 0.00, 0.00, 0.00, 0.02, 0.01, 0.22],  # catalogue
+    [0.03, 0.20, 0.20, 0.08, 0.20, 0.00, 0.00, 0.01, 0.01, 0.27],  # produit
+    [0.02, 0.15, 0.55, 0.08, 0.00, 0.00, 0.00, 0.00, 0.02, 0.18],  # recherche
+    [0.02, 0.10, 0.10, 0.02, 0.00, 0.45, 0.00, 0.03, 0.03, 0.25],  # panier
+    [0.00, 0.00, 0.00, 0.00, 0.15, 0.00, 0.70, 0.00, 0.05, 0.10],  # paiement
+    [0.25, 0.10, 0.00, 0.00, 0.00, 0.00, 0.00, 0.15, 0.00, 0.50],  # confirmation
+    [0.30, 0.10, 0.00, 0.00, 0.00, 0.00, 0.00, 0.10, 0.10, 0.40],  # compte
+    [0.30, 0.05, 0.00, 0.05, 0.00, 0.00, 0.00, 0.10, 0.10, 0.40],  # aide
+])
+PAGE_EXIT = len(PAGES)
+PAGE_ENTRY = [0.45, 0.15, 0.25, 0.15, 0, 0, 0, 0, 0]
+
+# Durée médiane passée sur chaque page (secondes, loi log-normale)
+PAGE_DUREE_MEDIANE = np.array([15, 30, 45, 20, 35, 60, 10, 40, 50], dtype=float)
+MAX_SESSION_PAGES = 40
+LOGS_PERIODE_JOURS = 30
+
+
+def _mean_session_length() -> float:
+    """Nombre moyen de pages vues par session (matrice fondamentale de la chaîne)"""
+    q = PAGE_TRANSITIONS[:, :PAGE_EXIT]
+    fundamental = np.linalg.inv(np.eye(len(PAGES)) - q)
+    return float(np.asarray(PAGE_ENTRY) @ fundamental.sum(axis=1))
+
+
+def _init_logs(rng: np.random.Generator, n_rows: int, end_date: pd.Timestamp) -> Dict:
+    """Taux d'arrivée des sessions calibré pour couvrir LOGS_PERIODE_JOURS jours"""
+    mean_len = _mean_session_length()
+    return {
+        'mean_session_length': mean_len,
+        'rate_per_s': max(n_rows / mean_len, 1.0) / (LOGS_PERIODE_JOURS * 86400),
+        'start_time': end_date - pd.Timedelta(days=LOGS_PERIODE_JOURS),
+        'cum_transitions': np.cumsum(PAGE_TRANSITIONS, axis=1)
+    }
+
+
+def _simulate_sessions(rng: np.random.Generator, n_sessions: int, cum: np.ndarray) -> np.ndarray:
+    """
+    Parcours de n_sessions sessions par la chaîne de Markov, toutes en parallèle
+
+    Returns:
+        Matrice (session, étape) des pages visitées, -1 une fois la session terminée
+    """
+    pages = np.full((n_sessions, MAX_SESSION_PAGES), -1, dtype=np.int16)
+    current = _choice_codes(rng, n_sessions, PAGE_ENTRY)
+    active = np.ones(n_sessions, dtype=bool)
+    for step in range(MAX_SESSION_PAGES):
+        pages[active, step] = current[active]
+        u = rng.random(n_sessions)
+        current = (u[:, None] > cum[np.minimum(current, PAGE_EXIT - 1)]).sum(axis=1)
+        active &= current != PAGE_EXIT
+        if not active.any():
+            break
+    return pages
+
+
+def _chunk_logs(rng: np.random.Generator, start: int, size: int, ctx: Dict) -> pd.DataFrame:
+    """
+    Clickstream : sessions arrivant selon un processus de Poisson, parcours
+    simulé par une chaîne de Markov
+    """
+    mean_len = ctx['mean_session_length']
+    batches = []
+    total = 0
+    while total < size:
+        batch = _simulate_sessions(rng, int((size - total) / mean_len * 1.1) + 16, ctx['cum_transitions'])
+        batches.append(batch)
+        total += int((batch >= 0).sum())
+    pages = np.concatenate(batches)
+
+    # On garde juste assez de sessions pour remplir le bloc
+    session_len = (pages >= 0).sum(axis=1)
+    n_keep = int(np.searchsorted(np.cumsum(session_len), size)) + 1
+    pages, session_len = pages[:n_keep], session_len[:n_keep]
+
+    # Arrivées de Poisson : inter-arrivées exponentielles, décalées par bloc
+    chunk_offset_s = start / mean_len / ctx['rate_per_s']
+    debut_session = chunk_offset_s + np.cumsum(rng.exponential(1 / ctx['rate_per_s'], n_keep))
+
+    page = pages[pages >= 0].astype(np.int64)
+    session_local = np.repeat(np.arange(n_keep), session_len)
+    premiere_ligne = np.repeat(np.cumsum(session_len) - session_len, session_len)
+    etape = np.arange(page.size) - premiere_ligne
+
+    duree = np.round(PAGE_DUREE_MEDIANE[page] * rng.lognormal(0, 0.6, page.size)).astype(int) + 1
+    # Horodatage = début de session + durées des pages précédentes de la session
+    duree_cumulee = np.cumsum(duree) - duree
+    timestamp_s = debut_session[session_local] + duree_cumulee - duree_cumulee[premiere_ligne]
+
+    device = _choice_codes(rng, n_keep, [0.45, 0.45, 0.10])
+    source = _choice_codes(rng, n_keep, [0.35, 0.25, 0.15, 0.15, 0.10])
+    user_id = rng.integers(1, max(int(ctx['n_rows'] / 15), 10), n_keep)
+
+    df = pd.DataFrame({
+        'event_id': start + np.arange(page.size),
+        'session_id': start + session_local,
+        'user_id': user_id[session_local],
+        'timestamp': ctx['start_time'] + pd.to_timedelta(np.round(timestamp_s), unit='s'),
+        'page': _categorical(page, PAGES),
+        'etape': etape,
+        'duree_page_s': duree,
+        'device': _categorical(device[session_local], DEVICES),
+        'source': _categorical(source[session_local], SOURCES)
+    })
+    return df.iloc[:size]
+
+
+# ========== DONNÉES MARKETING ==========
+
+CANAUX = ['Google Ads', 'Facebook', 'Instagram', 'LinkedIn', 'Email', 'Affiliation']
+# Par canal : impressions médianes/jour, CTR, taux de lead, taux de conversion, CPC (€)
+CANAL_IMPRESSIONS = np.array([12000, 20000, 15000, 4000, 6000, 3000], dtype=float)
+CANAL_CTR = np.array([0.035, 0.012, 0.010, 0.008, 0.045, 0.020])
+CANAL_TAUX_LEAD = np.array([0.12, 0.08, 0.07, 0.15, 0.20, 0.10])
+CANAL_TAUX_CONVERSION = np.array([0.20, 0.12, 0.10, 0.25, 0.30, 0.18])
+CANAL_CPC = np.array([1.20, 0.60, 0.70, 3.50, 0.40, 0.80])
+OBJECTIFS_CAMPAGNE = ['Notoriété', 'Acquisition', 'Fidélisation', 'Promotion']
+N_CAMPAGNES = 60
+
+
+def _init_marketing(rng: np.random.Generator, n_rows: int, end_date: pd.Timestamp) -> Dict:
+    """Caractéristiques fixes des campagnes, partagées par tous les blocs"""
+    return {
+        'canal': rng.integers(0, len(CANAUX), N_CAMPAGNES),
+        'objectif': rng.integers(0, len(OBJECTIFS_CAMPAGNE), N_CAMPAGNES),
+        # Qualité propre à chaque campagne (multiplie CTR et conversions)
+        'qualite': rng.lognormal(0, 0.25, N_CAMPAGNES),
+        'panier_moyen': rng.uniform(30, 250, N_CAMPAGNES)
+    }
+
+
+def _chunk_marketing(rng: np.random.Generator, start: int, size: int, ctx: Dict) -> pd.DataFrame:
+    """Une ligne = une campagne sur une journée, funnel impressions → ventes"""
+    campagne = rng.integers(0, N_CAMPAGNES, size)
+    canal = ctx['canal'][campagne]
+    qualite = ctx['qualite'][campagne]
+
+    impressions = rng.poisson(CANAL_IMPRESSIONS[canal] * rng.lognormal(0, 0.5, size))
+    clics = rng.binomial(impressions, np.clip(CANAL_CTR[canal] * qualite, 0, 1))
+    leads = rng.binomial(clics, np.clip(CANAL_TAUX_LEAD[canal] * qualite, 0, 1))
+    conversions = rng.binomial(leads, np.clip(CANAL_TAUX_CONVERSION[canal] * qualite, 0, 1))
+    cout = np.round(clics * CANAL_CPC[canal] * rng.uniform(0.8, 1.2, size), 2)
+    chiffre_affaires = np.round(conversions * ctx['panier_moyen'][campagne] * rng.uniform(0.7, 1.3, size), 2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ctr = np.where(impressions > 0, clics / impressions, 0.0)
+        taux_conversion = np.where(clics > 0, conversions / clics, 0.0)
+        roas = np.where(cout > 0, chiffre_affaires / cout, 0.0)
+
+    return pd.DataFrame({
+        'date': ctx['end_date'] - pd.to_timedelta(rng.integers(0, 365, size), unit='D'),
+        'campagne_id': campagne + 1,
+        'canal': _categorical(canal, CANAUX),
+        'objectif': _categorical(ctx['objectif'][campagne], OBJECTIFS_CAMPAGNE),
+        'impressions': impressions,
+        'clics': clics,
+        'leads': leads,
+        'conversions': conversions,
+        'cout': cout,
+        'chiffre_affaires': chiffre_affaires,
+        'ctr': np.round(ctr, 4),
+        'taux_conversion': np.round(taux_conversion, 4),
+        'roas': np.round(roas, 2)
+    })
+
+
+# ========== REGISTRE DES GÉNÉRATEURS ==========
+
+# chunk : fonction (rng, start, size, ctx) -> DataFrame
+# init : fonction optionnelle (rng, n_rows, end_date) -> dict ajouté au contexte
+GENERATORS: Dict[str, Dict[str, Callable]] = {
+    "Ventes E-commerce": {"chunk": _chunk_ecommerce},
+    "Données Clients (CRM)": {"chunk": _chunk_crm},
+    "Données Médicales": {"chunk": _chunk_medical},
+    "Données Financières": {"chunk": _chunk_finance},
+    "Logs Utilisateurs": {"chunk": _chunk_logs, "init": _init_logs},
+    "Données Marketing": {"chunk": _chunk_marketing, "init": _init_marketing},
+}
+
+
+def available_dataset_types() -> List[str]:
+    """Liste des types de datasets ayant un générateur"""
+    return [t for t in DATASET_TYPES if t in GENERATORS]
+
+
+def iter_dataset_chunks(dataset_type: str, n_rows: int, seed: int = 42,
+                        end_date: pd.Timestamp = None,
+                        chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Génère un dataset bloc par bloc (mémoire bornée par chunk_rows)
+
+    Le contenu dépend de (seed, chunk_rows) : garder la valeur par défaut
+    pour obtenir les mêmes données que generate_dataset().
+    """
+    if dataset_type not in GENERATORS:
+        raise ValueError(f"Type de dataset non supporté : {dataset_type}")
+    generator = GENERATORS[dataset_type]
+    end_date = end_date if end_date is not None else reference_date()
+
+    ctx = {'n_rows': n_rows, 'end_date': end_date}
+    if 'init' in generator:
+        ctx.update(generator['init'](np.random.default_rng([seed, 0]), n_rows, end_date))
+
+    for chunk_index, start in enumerate(range(0, n_rows, chunk_rows)):
+        size = min(chunk_rows, n_rows - start)
+        rng = np.random.default_rng([seed, chunk_index + 1])
+        yield generator['chunk'](rng, start, size, ctx)
+
+
+def generate_dataset(dataset_type: str, n_rows: int, seed: int = 42,
+                     end_date: pd.Timestamp = None) -> pd.DataFrame:
+    """
+    Génère un dataset synthétique
+
+    Args:
+        dataset_type: Type de dataset (voir DATASET_TYPES)
+        n_rows: Nombre de lignes
+        seed: Graine aléatoire
+        end_date: Date de référence (par défaut : aujourd'hui)
+
+    Returns:
+        DataFrame généré
+    """
+    chunks = list(iter_dataset_chunks(dataset_type, n_rows, seed=seed, end_date=end_date))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
@@ -1,7 +1,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+from modules.dataset_store import (
+    get_or_create_dataset, list_datasets, load_dataset,
+    delete_dataset, clear_store, MAX_STORE_BYTES
+)
+from modules.export_formats import format_selector, download_dataframe, benchmark_formats
 
 st.title("🎲 Générateur de Datasets")
 st.markdown("**Créez des données synthétiques pour vous entraîner**")
@@ -17,185 +22,104 @@ with tab1:
          "Données Financières", "Logs Utilisateurs", "Données Marketing"]
     )
     
-    n_rows = st.slider("Nombre de lignes", 100, 10000, 1000, 100)
-    
-    if dataset_type == "Ventes E-commerce":
-        st.markdown("**Dataset de ventes e-commerce**")
-        st.markdown("Colonnes : date, produit, catégorie, quantité, prix_unitaire, montant_total, client_id, pays")
+    n_rows = st.select_slider("Nombre de lignes", options=[100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000], value=1000)
+    
+    export_format, export_compression = format_selector("predefined")
+    
+    dataset_infos = {
+        "Ventes E-commerce": {
+            "titre": "Dataset de ventes e-commerce",
+            "colonnes": "date, produit, catégorie, quantité, prix_unitaire, montant_total, client_id, pays",
+            "fichier": "ventes_ecommerce"
+        },
+        "Données Clients (CRM)": {
+            "titre": "Dataset de clients CRM",
+            "colonnes": "client_id, age, sexe, ville, date_inscription, nb_achats, ca_total, segment, churn",
+            "fichier": "clients_crm"
+        },
+        "Données Médicales": {
+            "titre": "Dataset de constantes patients",
+            "colonnes": "patient_id, age, sexe, imc, fumeur, tension_systolique, tension_diastolique, frequence_cardiaque, cholesterol, glycemie, diabete, maladie_cardiaque",
+            "fichier": "donnees_medicales"
+        },
+        "Données Financières": {
+            "titre": "Dataset de transactions financières",
+            "colonnes": "date, montant, type, categorie, compte, fraude",
+            "fichier": "transactions"
+        },
+        "Logs Utilisateurs": {
+            "titre": "Dataset de clickstream (sessions de navigation)",
+            "colonnes": "event_id, session_id, user_id, timestamp, page, etape, duree_page_s, device, source",
+            "fichier": "logs_utilisateurs"
+        },
+        "Données Marketing": {
+            "titre": "Dataset de campagnes marketing (funnel quotidien)",
+            "colonnes": "date, campagne_id, canal, objectif, impressions, clics, leads, conversions, cout, chiffre_affaires, ctr, taux_conversion, roas",
+            "fichier": "campagnes_marketing"
+        }
+    }
+    
+    if dataset_type in dataset_infos:
+        info = dataset_infos[dataset_type]
+        st.markdown(f"**{info['titre']}**")
+        st.markdown(f"Colonnes : {info['colonnes']}")
         
-        if st.button("🎲 Générer le dataset"):
-            np.random.seed(42)
-            
-            dates = pd.date_range(end=datetime.now(), periods=n_rows, freq='H')
-            
-            produits = ['Laptop', 'Smartphone', 'Tablette', 'Écouteurs', 'Clavier', 
-                       'Souris', 'Moniteur', 'Webcam', 'Chargeur', 'Câble USB']
-            categories = {'Laptop': 'Informatique', 'Smartphone': 'Mobile', 
-                         'Tablette': 'Mobile', 'Écouteurs': 'Audio', 
-                         'Clavier': 'Accessoires', 'Souris': 'Accessoires',
-                         'Moniteur': 'Informatique', 'Webcam': 'Accessoires',
-                         'Chargeur': 'Accessoires', 'Câble USB': 'Accessoires'}
-            prix = {'Laptop': (500, 2000), 'Smartphone': (300, 1200), 
-                   'Tablette': (200, 800), 'Écouteurs': (20, 300),
-                   'Clavier': (15, 150), 'Souris': (10, 100),
-                   'Moniteur': (150, 800), 'Webcam': (30, 200),
-                   'Chargeur': (10, 50), 'Câble USB': (5, 30)}
-            
-            data = []
-            for i in range(n_rows):
-                produit = np.random.choice(produits)
-                quantite = np.random.randint(1, 5)
-                prix_unitaire = round(np.random.uniform(*prix[produit]), 2)
-                
-                data.append({
-                    'date': dates[i],
-                    'produit': produit,
-                    'categorie': categories[produit],
-                    'quantite': quantite,
-                    'prix_unitaire': prix_unitaire,
-                    'montant_total': round(quantite * prix_unitaire, 2),
-                    'client_id': np.random.randint(1, 500),
-                    'pays': np.random.choice(['France', 'Belgique', 'Suisse', 'Canada', 'Luxembourg'], 
-                                            p=[0.6, 0.15, 0.1, 0.1, 0.05])
-                })
-            
-            df = pd.DataFrame(data)
-            
-            st.success(f"✅ Dataset généré avec {len(df)} lignes")
-            st.dataframe(df.head(20))
-            
-            st.markdown("### 📊 Aperçu Statistique")
-            col1, col2, col3 = st.columns(3)
-            col1.metric("CA Total", f"{df['montant_total'].sum():,.0f} €")
-            col2.metric("Panier Moyen", f"{df['montant_total'].mean():.2f} €")
-            col3.metric("Nb Clients", df['client_id'].nunique())
-            
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="📥 Télécharger en CSV",
-                data=csv,
-                file_name=f"ventes_ecommerce_{n_rows}.csv",
-                mime="text/csv"
-            )
-    
-    elif dataset_type == "Données Clients (CRM)":
-        st.markdown("**Dataset de clients CRM**")
-        st.markdown("Colonnes : client_id, age, sexe, ville, date_inscription, nb_achats, ca_total, segment, churn")
+        generation_params = (dataset_type, n_rows)
+        generated = None
         
         if st.button("🎲 Générer le dataset"):
-            np.random.seed(42)
-            
-            villes = ['Paris', 'Lyon', 'Marseille', 'Toulouse', 'Nice', 'Nantes', 
-                     'Strasbourg', 'Bordeaux', 'Lille', 'Rennes']
-            
-            data = []
-            for i in range(n_rows):
-                age = int(np.random.normal(40, 15))
-                age = max(18, min(80, age))
-                
-                nb_achats = int(np.random.exponential(5))
-                ca_total = round(nb_achats * np.random.uniform(50, 300), 2)
-                
-                if ca_total > 2000:
-                    segment = 'Premium'
-                elif ca_total > 500:
-                    segment = 'Standard'
-                else:
-                    segment = 'Bronze'
-                
-                churn_prob = 0.3 if nb_achats < 2 else 0.1 if segment == 'Premium' else 0.2
-                
-                data.append({
-                    'client_id': 1000 + i,
-                    'age': age,
-                    'sexe': np.random.choice(['M', 'F']),
-                    'ville': np.random.choice(villes),
-                    'date_inscription': (datetime.now() - timedelta(days=np.random.randint(1, 1000))).strftime('%Y-%m-%d'),
-                    'nb_achats': nb_achats,
-                    'ca_total': ca_total,
-                    'segment': segment,
-                    'churn': np.random.choice([0, 1], p=[1-churn_prob, churn_prob])
-                })
-            
-            df = pd.DataFrame(data)
-            
-            st.success(f"✅ Dataset généré avec {len(df)} clients")
-            st.dataframe(df.head(20))
-            
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Nb Clients", len(df))
-            col2.metric("Taux de Churn", f"{df['churn'].mean()*100:.1f}%")
-            col3.metric("CA Moyen", f"{df['ca_total'].mean():.2f} €")
-            
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="📥 Télécharger en CSV",
-                data=csv,
-                file_name=f"clients_crm_{n_rows}.csv",
-                mime="text/csv"
-            )
-    
-    elif dataset_type == "Données Financières":
-        st.markdown("**Dataset de transactions financières**")
-        st.markdown("Colonnes : date, montant, type, categorie, compte, fraude")
+            generated = get_or_create_dataset(dataset_type, n_rows, seed=42)
+            st.session_state['generated_dataset'] = generation_params
+        elif st.session_state.get('generated_dataset') == generation_params:
+            # Rerun (changement de format, etc.) : relecture depuis le store
+            generated = get_or_create_dataset(dataset_type, n_rows, seed=42)
         
-        if st.button("🎲 Générer le dataset"):
-            np.random.seed(42)
+        if generated:
+            df, meta, from_store = generated
             
-            dates = pd.date_range(end=datetime.now(), periods=n_rows, freq='3H')
-            
-            types_transaction = ['Achat', 'Retrait', 'Virement', 'Prélèvement', 'Dépôt']
-            categories = ['Alimentation', 'Transport', 'Logement', 'Loisirs', 
-                         'Santé', 'Shopping', 'Épargne', 'Autre']
-            
-            data = []
-            for i in range(n_rows):
-                type_trans = np.random.choice(types_transaction, p=[0.5, 0.2, 0.15, 0.1, 0.05])
-                
-                if type_trans == 'Achat':
-                    montant = round(np.random.exponential(50), 2)
-                    categorie = np.random.choice(categories, p=[0.3, 0.15, 0.2, 0.15, 0.05, 0.1, 0.03, 0.02])
-                elif type_trans == 'Retrait':
-                    montant = round(np.random.choice([20, 50, 100, 200]), 2)
-                    categorie = 'Autre'
-                elif type_trans == 'Virement':
-                    montant = round(np.random.uniform(100, 2000), 2)
-                    categorie = 'Autre'
-                elif type_trans == 'Prélèvement':
-                    montant = round(np.random.uniform(20, 500), 2)
-                    categorie = np.random.choice(['Logement', 'Autre'], p=[0.6, 0.4])
-                else:
-                    montant = round(np.random.uniform(500, 3000), 2)
-                    categorie = 'Épargne'
-                
-                fraude = 1 if (montant > 5000 or (type_trans == 'Retrait' and montant > 500)) and np.random.random() < 0.02 else 0
-                
-                data.append({
-                    'date': dates[i],
-                    'montant': montant,
-                    'type': type_trans,
-                    'categorie': categorie,
-                    'compte': f"COMPTE_{np.random.randint(1, 100)}",
-                    'fraude': fraude
-                })
-            
-            df = pd.DataFrame(data)
-            
-            st.success(f"✅ Dataset généré avec {len(df)} transactions")
+            if from_store:
+                st.success(f"♻️ Dataset servi depuis vos datasets sauvegardés ({len(df)} lignes)")
+            else:
+                st.success(f"✅ Dataset généré avec {len(df)} lignes")
             st.dataframe(df.head(20))
             
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Nb Transactions", len(df))
-            col2.metric("Montant Total", f"{df['montant'].sum():,.0f} €")
-            col3.metric("Taux de Fraude", f"{df['fraude'].mean()*100:.2f}%")
+            if dataset_type == "Ventes E-commerce":
+                st.markdown("### 📊 Aperçu Statistique")
             
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="📥 Télécharger en CSV",
-                data=csv,
-                file_name=f"transactions_{n_rows}.csv",
-                mime="text/csv"
-            )
+            col1, col2, col3 = st.columns(3)
+            if dataset_type == "Ventes E-commerce":
+                col1.metric("CA Total", f"{df['montant_total'].sum():,.0f} €")
+                col2.metric("Panier Moyen", f"{df['montant_total'].mean():.2f} €")
+                col3.metric("Nb Clients", df['client_id'].nunique())
+            elif dataset_type == "Données Clients (CRM)":
+                col1.metric("Nb Clients", len(df))
+                col2.metric("Taux de Churn", f"{df['churn'].mean()*100:.1f}%")
+                col3.metric("CA Moyen", f"{df['ca_total'].mean():.2f} €")
+            elif dataset_type == "Données Financières":
+                col1.metric("Nb Transactions", len(df))
+                col2.metric("Montant Total", f"{df['montant'].sum():,.0f} €")
+                col3.metric("Taux de Fraude", f"{df['fraude'].mean()*100:.2f}%")
+            elif dataset_type == "Données Médicales":
+                col1.metric("Nb Patients", len(df))
+                col2.metric("Âge Moyen", f"{df['age'].mean():.1f} ans")
+                col3.metric("Maladie Cardiaque", f"{df['maladie_cardiaque'].mean()*100:.1f}%")
+            elif dataset_type == "Logs Utilisateurs":
+                col1.metric("Nb Sessions", df['session_id'].nunique())
+                col2.metric("Pages / Session", f"{len(df) / df['session_id'].nunique():.2f}")
+                col3.metric("Sessions avec Achat", f"{df.loc[df['page'] == 'confirmation', 'session_id'].nunique() / df['session_id'].nunique()*100:.1f}%")
+            elif dataset_type == "Données Marketing":
+                col1.metric("Coût Total", f"{df['cout'].sum():,.0f} €")
+                col2.metric("Taux de Conversion", f"{df['conversions'].sum() / max(df['clics'].sum(), 1)*100:.2f}%")
+                col3.metric("ROAS Global", f"{df['chiffre_affaires'].sum() / max(df['cout'].sum(), 1):.2f}")
+            
+            download_dataframe(df, f"{info['fichier']}_{n_rows}", export_format, export_compression,
+                               key="download_predefined", parquet_path=meta['file_path'])
+            
+            if st.checkbox("⚡ Comparer les formats d'export (taille et vitesse)"):
+                st.dataframe(benchmark_formats(df))
+                st.caption("Taille du fichier, temps d'écriture et de relecture avec pandas pour ce dataset")
+    else:
+        st.info("🚧 Ce type de dataset n'est pas encore disponible")
 
 with tab2:
     st.header("🛠️ Générateur Personnalisé")
@@ -204,6 +128,8 @@ with tab2:
     
     n_rows_custom = st.number_input("Nombre de lignes", min_value=10, max_value=10000, value=100)
     
+    custom_format, custom_compression = format_selector("custom")
+    
     st.markdown("### Définir les colonnes")
     
     if 'custom_columns' not in st.session_state:
@@ -258,19 +184,60 @@ with tab2:
             st.success(f"✅ Dataset généré avec {len(df)} lignes et {len(df.columns)} colonnes")
             st.dataframe(df.head(20))
             
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="📥 Télécharger en CSV",
-                data=csv,
-                file_name="dataset_personnalise.csv",
-                mime="text/csv"
-            )
+            download_dataframe(df, "dataset_personnalise", custom_format, custom_compression,
+                               key="download_custom")
 
 with tab3:
     st.header("📥 Datasets Sauvegardés")
     
-    st.info("💡 Cette section pourrait stocker vos datasets générés pour un accès rapide. (Fonctionnalité à implémenter)")
+    st.markdown("Les datasets générés sont conservés automatiquement : régénérer un dataset avec les mêmes paramètres le sert directement depuis le disque.")
+    
+    saved_datasets = list_datasets()
+    
+    if not saved_datasets:
+        st.info("💡 Aucun dataset sauvegardé pour le moment. Générez-en un dans l'onglet 'Datasets Prédéfinis' !")
+    else:
+        total_size = sum(d['size_bytes'] for d in saved_datasets)
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Datasets sauvegardés", len(saved_datasets))
+        col2.metric("Espace utilisé", f"{total_size / 1024**2:.1f} Mo")
+        col3.metric("Capacité", f"{MAX_STORE_BYTES / 1024**2:.0f} Mo")
+        
+        saved_format, saved_compression = format_selector("saved")
+        
+        for dataset in saved_datasets:
+            params = dataset['params']
+            # Les datasets des cas business (case_datasets) n'ont pas de date de fin
+            end_date = f" - {params['end_date']}" if 'end_date' in params else ""
+            with st.expander(f"🗂️ {dataset['dataset_type']} - {dataset['n_rows']} lignes{end_date}"):
+                st.markdown(f"**Colonnes :** {dataset['n_cols']} | **Taille :** {dataset['size_bytes'] / 1024:.0f} Ko | **Graine :** {params['seed']}")
+                st.caption(f"Dernière utilisation : {str(dataset['last_access'])[:16]} | Utilisations : {dataset['access_count']}")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    if st.button("📂 Ouvrir", key=f"open_{dataset['dataset_key']}"):
+                        st.session_state['selected_dataset'] = dataset['dataset_key']
+                
+                with col2:
+                    if st.button("🗑️ Supprimer", key=f"delete_{dataset['dataset_key']}"):
+                        delete_dataset(dataset['dataset_key'])
+                        st.rerun()
+                
+                if st.session_state.get('selected_dataset') == dataset['dataset_key']:
+                    df_preview = load_dataset(dataset['dataset_key'])
+                    if df_preview is not None:
+                        st.dataframe(df_preview.head(20))
+                        download_dataframe(df_preview, f"dataset_{dataset['n_rows']}", saved_format, saved_compression,
+                                           key=f"download_{dataset['dataset_key']}",
+                                           parquet_path=dataset['file_path'])
+        
+        if st.button("🧹 Vider les datasets sauvegardés"):
+            clear_store()
+            st.rerun()
     
+    st.markdown("---")
     st.markdown("### Exemples de datasets utiles pour s'entraîner :")
     
     examples = [
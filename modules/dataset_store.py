@@ -0,0 +1,186 @@
+"""
+Stockage des datasets générés (cache adressé par contenu)
+Chaque jeu de paramètres est haché en une clé ; les fichiers Parquet sont
+conservés dans data/datasets et leurs métadonnées dans SQLite (table datasets)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from modules.dataset_engine import ENGINE_VERSION, generate_dataset, reference_date
+from modules.database import (
+    register_dataset, get_dataset_meta, touch_dataset, get_datasets,
+    get_datasets_total_size, get_lru_datasets, delete_dataset_meta
+)
+
+STORE_DIR = Path("data/datasets")
+
+# Taille maximale du store avant éviction LRU (octets)
+MAX_STORE_BYTES = 200 * 1024 * 1024
+
+# Verrous par clé : deux sessions demandant le même dataset ne le génèrent qu'une fois.
+# Nombre fixe de verrous partagés par hachage (deux clés peuvent tomber sur le même
+# verrou et s'attendre) : la mémoire ne grandit pas avec le nombre de clés demandées.
+KEY_LOCK_STRIPES = 64
+_key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+
+
+def dataset_params(dataset_type: str, n_rows: int, seed: int = 42,
+                   end_date: pd.Timestamp = None) -> Dict:
+    """Construit le tuple de paramètres canonique d'un dataset"""
+    end_date = end_date if end_date is not None else reference_date()
+    return {
+        'dataset_type': dataset_type,
+        'n_rows': int(n_rows),
+        'seed': int(seed),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'engine_version': ENGINE_VERSION
+    }
+
+
+def dataset_key(params: Dict) -> str:
+    """Hache les paramètres d'un dataset en une clé stable"""
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+def _dataset_path(key: str) -> Path:
+    return STORE_DIR / f"{key}.parquet"
+
+
+def _key_lock(key: str) -> threading.Lock:
+    # La clé est un hachage hexadécimal : ses premiers chiffres suffisent à répartir
+    return _key_locks[int(key[:8], 16) % KEY_LOCK_STRIPES]
+
+
+def _read_parquet(path: str) -> pd.DataFrame:
+    """Lecture Parquet par projection mémoire (mmap) plutôt que par copie du fichier"""
+    return pd.read_parquet(path, memory_map=True)
+
+
+def _stored_meta(key: str) -> Optional[Dict]:
+    """Métadonnées d'un dataset dont le fichier est bien présent sur disque"""
+    meta = get_dataset_meta(key)
+    if meta and Path(meta['file_path']).exists():
+        return meta
+    if meta:
+        # Fichier supprimé à la main : on oublie l'entrée
+        delete_dataset_meta(key)
+    return None
+
+
+def store_dataset(df: pd.DataFrame, params: Dict) -> Dict:
+    """Écrit un DataFrame en Parquet et enregistre ses métadonnées"""
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    key = dataset_key(params)
+    path = _dataset_path(key)
+
+    # Écriture atomique : un lecteur concurrent ne voit jamais de fichier partiel
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    meta = {
+        'dataset_key': key,
+        'dataset_type': params['dataset_type'],
+        'params': params,
+        'n_rows': len(df),
+        'n_cols': len(df.columns),
+        'file_path': str(path),
+        'size_bytes': path.stat().st_size
+    }
+    register_dataset(meta)
+    evict_datasets(keep=key)
+    return meta
+
+
+def get_or_store_dataset(params: Dict,
+                         build: Callable[[], pd.DataFrame]) -> Tuple[pd.DataFrame, Dict, bool]:
+    """
+    Retourne le dataset stocké pour ces paramètres, ou le construit avec build()
+
+    Returns:
+        (DataFrame, métadonnées, True si servi depuis le store)
+    """
+    key = dataset_key(params)
+    with _key_lock(key):
+        meta = _stored_meta(key)
+        if meta:
+            touch_dataset(key)
+            return _read_parquet(meta['file_path']), meta, True
+
+        df = build()
+        return df, store_dataset(df, params), False
+
+
+def get_or_create_dataset(dataset_type: str, n_rows: int,
+                          seed: int = 42) -> Tuple[pd.DataFrame, Dict, bool]:
+    """
+    Retourne le dataset correspondant aux paramètres, en le générant si besoin
+
+    Returns:
+        (DataFrame, métadonnées, True si servi depuis le store)
+    """
+    params = dataset_params(dataset_type, n_rows, seed)
+    return get_or_store_dataset(params, lambda: generate_dataset(
+        dataset_type, n_rows, seed=seed, end_date=pd.Timestamp(params['end_date'])))
+
+
+def load_dataset(key: str) -> Optional[pd.DataFrame]:
+    """Charge un dataset stocké"""
+    meta = _stored_meta(key)
+    if not meta:
+        return None
+    touch_dataset(key)
+    return _read_parquet(meta['file_path'])
+
+
+def list_datasets() -> List[Dict]:
+    """Liste les datasets stockés (du plus récemment utilisé au plus ancien)"""
+    return get_datasets()
+
+
+def delete_dataset(key: str):
+    """Supprime un dataset (fichier et métadonnées)"""
+    meta = get_dataset_meta(key)
+    if meta:
+        Path(meta['file_path']).unlink(missing_ok=True)
+    delete_dataset_meta(key)
+
+
+def evict_datasets(max_bytes: int = MAX_STORE_BYTES, keep: str = None) -> int:
+    """
+    Supprime les datasets les moins récemment utilisés jusqu'à repasser
+    sous max_bytes
+
+    Args:
+        max_bytes: Taille maximale du store
+        keep: Clé à ne jamais supprimer (dataset qui vient d'être écrit)
+
+    Returns:
+        Nombre de datasets supprimés
+    """
+    total = get_datasets_total_size()
+    evicted = 0
+    while total > max_bytes:
+        candidates = [c for c in get_lru_datasets() if c['dataset_key'] != keep]
+        if not candidates:
+            break
+        for candidate in candidates:
+            if total <= max_bytes:
+                break
+            delete_dataset(candidate['dataset_key'])
+            total -= candidate['size_bytes']
+            evicted += 1
+    return evicted
+
+
+def clear_store() -> int:
+    """Vide entièrement le store"""
+    return evict_datasets(max_bytes=-1)
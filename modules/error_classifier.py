@@ -0,0 +1,155 @@
+"""
+Classification des erreurs Python collées dans l'Analyseur d'Erreurs (sans Streamlit)
+Le catalogue (content/error_catalog.json) est compilé une fois au chargement :
+une table nom d'exception -> entrées, et une seule expression régulière
+(alternative de groupes nommés) pour tous les motifs de message. Analyser
+un traceback reste donc linéaire en sa longueur, quel que soit le nombre
+d'entrées du catalogue.
+
+Une entrée peut préciser des motifs de message ("patterns") et/ou des
+modules apparaissant dans la pile ("modules", ex. pandas) : elle est alors
+préférée à l'entrée générique de la même exception.
+"""
+
+import builtins
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "content" / "error_catalog.json"
+
+# Ligne de pile : File "script.py", line 12, in ma_fonction
+FRAME_RE = re.compile(r'^\s*File "(?P<file>[^"]+)", line (?P<line>\d+)(?:, in (?P<function>.+?))?\s*$', re.MULTILINE)
+
+# Ligne d'exception : NomError: message (éventuellement qualifiée, ex. pandas.errors.ParserError)
+EXCEPTION_RE = re.compile(
+    r'^(?P<type>(?:[A-Za-z_]\w*\.)*[A-Za-z_]\w*(?:Error|Exception|Warning|Exit|Interrupt|Iteration))'
+    r'(?::[ \t]*(?P<message>.*))?$',
+    re.MULTILINE
+)
+
+# Frames de bibliothèques (hors code de l'étudiant)
+LIBRARY_FRAME_RE = re.compile(r'site-packages|dist-packages|[\\/]lib[\\/]python\d|^<frozen ')
+
+# Séparateurs des exceptions chaînées
+CHAIN_RE = re.compile(
+    r'^(?:During handling of the above exception, another exception occurred:'
+    r'|The above exception was the direct cause of the following exception:)\s*$',
+    re.MULTILINE
+)
+
+
+class ErrorClassifier:
+    """Catalogue d'erreurs compilé"""
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self.by_exception = {}
+        self.specific = {}
+        patterns = []
+
+        for index, entry in enumerate(entries):
+            for name in entry['exceptions']:
+                if entry.get('patterns') or entry.get('modules'):
+                    self.specific.setdefault(name, []).append(index)
+                else:
+                    self.by_exception.setdefault(name, index)
+            for pattern in entry.get('patterns', []):
+                patterns.append(f"(?P<p{index}_{len(patterns)}>{pattern})")
+
+        self.message_re = re.compile('|'.join(patterns), re.IGNORECASE) if patterns else None
+        names = sorted({name for entry in entries for name in entry['exceptions']}, key=len, reverse=True)
+        self.name_re = re.compile(r'\b(?P<name>' + '|'.join(map(re.escape, names)) + r')\b', re.IGNORECASE)
+        self.canonical = {name.lower(): name for name in names}
+
+    @classmethod
+    def from_file(cls, path: Path = CATALOG_PATH) -> "ErrorClassifier":
+        """Charge un catalogue JSON ({"version": ..., "entries": [...]})"""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f)['entries'])
+
+    def _message_matches(self, message: str) -> set:
+        """Indices des entrées dont un motif correspond au message (un seul passage)"""
+        if not self.message_re or not message:
+            return set()
+        return {int(match.lastgroup[1:].split('_')[0]) for match in self.message_re.finditer(message)}
+
+    def _lookup(self, name: str, message: str, frames: List[Dict]) -> Optional[Dict]:
+        """Entrée la plus précise pour une exception, en remontant la hiérarchie des exceptions natives"""
+        short = name.rsplit('.', 1)[-1]
+        candidates = [short]
+        builtin = getattr(builtins, short, None)
+        if isinstance(builtin, type) and issubclass(builtin, BaseException):
+            candidates += [base.__name__ for base in builtin.__mro__[1:]]
+
+        matched = self._message_matches(message)
+        files = ' '.join(frame['file'] for frame in frames).lower()
+        for candidate in candidates:
+            for index in self.specific.get(candidate, []):
+                entry = self.entries[index]
+                if index in matched or any(module in files for module in entry.get('modules', [])):
+                    return entry
+            if candidate in self.by_exception:
+                return self.entries[self.by_exception[candidate]]
+        return None
+
+    def classify(self, text: str) -> Optional[Dict]:
+        """
+        Analyse un message d'erreur ou un traceback complet
+
+        Pour un traceback, l'exception retenue est la dernière levée (après
+        les éventuelles exceptions chaînées) et la ligne indiquée est celle
+        de la frame la plus profonde.
+
+        Returns:
+            exception, message, line, file, function (frame la plus profonde),
+            user_frame (dernière frame hors bibliothèques), frames, chain et
+            l'entrée du catalogue (entry, None si inconnue) ; None si aucune
+            erreur n'est reconnue
+        """
+        if not text or not text.strip():
+            return None
+
+        # Dernier bloc d'un traceback chaîné
+        sections = CHAIN_RE.split(text)
+        last = sections[-1]
+        chain = [match.group('type') for section in sections[:-1]
+                 for match in list(EXCEPTION_RE.finditer(section))[-1:]]
+
+        frames = [{'file': m.group('file'), 'line': int(m.group('line')),
+                   'function': (m.group('function') or '').strip()} for m in FRAME_RE.finditer(last)]
+        exceptions = list(EXCEPTION_RE.finditer(last))
+
+        if exceptions:
+            exception = exceptions[-1].group('type')
+            message = (exceptions[-1].group('message') or '').strip()
+        else:
+            # Texte libre : dernier nom d'exception connu cité
+            names = list(self.name_re.finditer(text))
+            if not names:
+                return None
+            exception = self.canonical[names[-1].group('name').lower()]
+            message = text.strip()
+
+        innermost = frames[-1] if frames else {}
+        user_frames = [frame for frame in frames if not LIBRARY_FRAME_RE.search(frame['file'])]
+        return {
+            'exception': exception,
+            'message': message,
+            'line': innermost.get('line'),
+            'file': innermost.get('file'),
+            'function': innermost.get('function'),
+            'user_frame': user_frames[-1] if user_frames else None,
+            'frames': frames,
+            'chain': chain,
+            'entry': self._lookup(exception, message, frames)
+        }
+
+
+CLASSIFIER = ErrorClassifier.from_file()
+
+
+def classify(text: str) -> Optional[Dict]:
+    """Analyse un message d'erreur avec le catalogue par défaut"""
+    return CLASSIFIER.classify(text)
@@ -0,0 +1,312 @@
+"""
+Modèles d'exercices de statistiques générés sans IA
+Chaque modèle tire ses paramètres au hasard, calcule la bonne réponse avec
+scipy / power_analysis et construit des distracteurs plausibles (erreurs
+classiques des étudiants). Les variantes sont produites par lots vectorisés
+et mises en cache dans la table exercises, par (modèle, graine).
+"""
+
+from typing import Dict, List
+
+import numpy as np
+from scipy import stats
+
+from modules.database import (
+    create_exercises_bulk, get_exercises_by_id_prefix, prune_exercises_by_id_prefix
+)
+from modules.power_analysis import sample_size
+
+MATIERE = "Statistiques"
+SOURCE = "Modèle"
+
+# Les variantes sont tirées par lots de taille fixe : la variante i d'une
+# graine est toujours la même, quel que soit le nombre demandé
+BATCH_SIZE = 50
+
+# Variantes gardées en base par modèle : chaque nouvelle graine en ajoute,
+# les plus anciennes sont supprimées au-delà (et régénérées si redemandées)
+MAX_CACHED_VARIANTS = 2000
+
+
+def _fmt(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Formate un tableau de nombres en chaînes"""
+    return np.char.mod(f"%.{decimals}f", np.round(values, decimals))
+
+
+def _numeric_options(answer: np.ndarray, distractors: List[np.ndarray], decimals: int) -> np.ndarray:
+    """
+    Options numériques (bonne réponse en colonne 0)
+
+    Deux options identiques une fois arrondies sont départagées en décalant
+    le distracteur, pour garder quatre choix distincts.
+    """
+    options = np.column_stack([_fmt(answer, decimals)] + [_fmt(d, decimals) for d in distractors]).astype(object)
+    step = 10.0 ** -decimals
+    for i, row in enumerate(options):
+        seen = set()
+        for j, value in enumerate(row):
+            shift = 1
+            while value in seen:
+                value = f"{float(row[j]) + shift * step:.{decimals}f}"
+                shift += 1
+            row[j] = value
+            seen.add(value)
+    return options
+
+
+# ========== MODÈLES ==========
+
+def _normale_queue(rng: np.random.Generator, size: int) -> Dict:
+    mu = rng.integers(5, 41, size) * 5
+    sigma = rng.integers(1, 7, size) * 5
+    k = rng.choice([-2.0, -1.5, -1.0, -0.5, 0.5, 1.0, 1.5, 2.0], size)
+    answer = stats.norm.sf(k)
+    return {
+        'params': {'mu': mu, 'sigma': sigma, 'seuil': mu + k * sigma, 'z': k},
+        'options': _numeric_options(answer, [
+            stats.norm.cdf(k),              # confusion P(X > a) / P(X < a)
+            2 * stats.norm.sf(np.abs(k)),   # probabilité bilatérale
+            stats.norm.sf(k / 2)            # écart divisé par 2σ au lieu de σ
+        ], 3)
+    }
+
+
+def _binomiale_exacte(rng: np.random.Generator, size: int) -> Dict:
+    n = rng.integers(8, 31, size)
+    p = rng.integers(2, 9, size) / 10
+    k = np.clip(np.round(n * p + rng.integers(-2, 3, size)), 0, n).astype(int)
+    answer = stats.binom.pmf(k, n, p)
+    return {
+        'params': {'n': n, 'p': p, 'k': k},
+        'options': _numeric_options(answer, [
+            stats.binom.cdf(k, n, p),       # P(X ≤ k) au lieu de P(X = k)
+            stats.binom.pmf(k + 1, n, p),   # décalage d'une unité
+            k / n                           # fréquence observée
+        ], 3)
+    }
+
+
+def _decision_p_value(rng: np.random.Generator, size: int) -> Dict:
+    alpha = rng.choice([0.01, 0.05, 0.1], size)
+    p_value = np.round(alpha * rng.choice([0.2, 0.5, 0.8, 1.3, 2.0, 4.0], size), 3)
+    reject = p_value < alpha
+    decisions = np.where(reject, "Rejeter H₀", "Ne pas rejeter H₀")
+    others = np.where(reject, "Ne pas rejeter H₀", "Rejeter H₀")
+    return {
+        'params': {'alpha': alpha, 'p_value': p_value,
+                   'comparaison': np.where(reject, "<", "≥"),
+                   'conclusion': np.where(reject, "on rejette", "on ne rejette pas")},
+        'options': np.column_stack([decisions, others,
+                                    np.full(size, "Accepter H₁ avec certitude"),
+                                    np.full(size, "Refaire le test avec un autre α")])
+    }
+
+
+def _choix_loi_ic(rng: np.random.Generator, size: int) -> Dict:
+    n = rng.choice([8, 12, 15, 20, 25, 40, 60, 100], size)
+    sigma_known = rng.random(size) < 0.4
+    student = ~sigma_known & (n < 30)
+    answer = np.where(student, "Loi de Student", "Loi normale")
+    reasons = np.array([
+        f"n = {size_i} < 30 et σ inconnu : loi de Student à n-1 = {size_i - 1} degrés de liberté" if is_student
+        else "σ connu : loi normale, quel que soit n" if known
+        else f"n = {size_i} ≥ 30 : l'approximation par la loi normale suffit même si σ est inconnu"
+        for size_i, is_student, known in zip(n, student, sigma_known)
+    ])
+    return {
+        'params': {'n': n, 's': rng.integers(2, 21, size),
+                   'connu': np.where(sigma_known, "connu", "inconnu"),
+                   'raison': reasons},
+        'options': np.column_stack([answer, np.where(student, "Loi normale", "Loi de Student"),
+                                    np.full(size, "Loi du Chi²"), np.full(size, "Loi de Poisson")])
+    }
+
+
+def _intervalle_confiance(rng: np.random.Generator, size: int) -> Dict:
+    x_bar = rng.integers(50, 201, size).astype(float)
+    s = rng.integers(5, 31, size).astype(float)
+    n = rng.choice([36, 49, 64, 81, 100, 144], size)
+    confidence = rng.choice([0.90, 0.95, 0.99], size)
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+    margin = z * s / np.sqrt(n)
+    wrong_z = np.where(confidence == 0.95, 1.645, 1.96)
+    options = np.column_stack([
+        np.char.add(np.char.add("[", _fmt(x_bar - margin, 2)), np.char.add(", ", np.char.add(_fmt(x_bar + margin, 2), "]"))),
+        np.char.add(np.char.add("[", _fmt(x_bar - z * s / n, 2)), np.char.add(", ", np.char.add(_fmt(x_bar + z * s / n, 2), "]"))),
+        np.char.add(np.char.add("[", _fmt(x_bar - wrong_z * s / np.sqrt(n), 2)), np.char.add(", ", np.char.add(_fmt(x_bar + wrong_z * s / np.sqrt(n), 2), "]"))),
+        np.char.add(np.char.add("[", _fmt(x_bar - z * s, 2)), np.char.add(", ", np.char.add(_fmt(x_bar + z * s, 2), "]")))
+    ])
+    return {
+        'params': {'x_bar': x_bar, 's': s, 'n': n, 'niveau': np.round(confidence * 100).astype(int),
+                   'z': np.round(z, 3), 'marge': np.round(margin, 2)},
+        'options': options
+    }
+
+
+TEST_SCENARIOS = [
+    ("comparer les moyennes de {k} groupes indépendants", "ANOVA"),
+    ("comparer les moyennes de 2 groupes indépendants (σ inconnus, n = {n})", "Test t de Student"),
+    ("tester l'indépendance entre deux variables qualitatives ({k} modalités chacune)", "Test du Chi²"),
+    ("comparer une moyenne à une valeur de référence avec σ connu (n = {n})", "Test Z")
+]
+TEST_NAMES = ["ANOVA", "Test t de Student", "Test du Chi²", "Test Z"]
+
+
+def _choix_test(rng: np.random.Generator, size: int) -> Dict:
+    scenario = rng.integers(0, len(TEST_SCENARIOS), size)
+    k = rng.integers(3, 7, size)
+    n = rng.integers(20, 200, size)
+    situations = np.array([TEST_SCENARIOS[s][0].format(k=k[i], n=n[i]) for i, s in enumerate(scenario)])
+    answers = np.array([TEST_SCENARIOS[s][1] for s in scenario])
+    others = np.array([[t for t in TEST_NAMES if t != a] for a in answers])
+    return {
+        'params': {'situation': situations, 'test': answers},
+        'options': np.column_stack([answers, others])
+    }
+
+
+def _taille_echantillon(rng: np.random.Generator, size: int) -> Dict:
+    d = rng.choice([0.2, 0.3, 0.4, 0.5, 0.6, 0.8], size)
+    target = rng.choice([0.8, 0.9], size)
+    answer = np.empty(size)
+    for level in np.unique(target):
+        mask = target == level
+        answer[mask] = sample_size("Test t (2 échantillons)", d[mask], 0.05, float(level))
+    z_only = np.ceil(2 * ((stats.norm.ppf(0.975) + stats.norm.ppf(target)) / d) ** 2)
+    return {
+        'params': {'d': d, 'puissance': np.round(target * 100).astype(int),
+                   'n': answer.astype(int), 'total': 2 * answer.astype(int)},
+        'options': _numeric_options(answer, [
+            np.ceil(answer / 2),                         # effectif total confondu avec l'effectif par groupe
+            answer * 2,                                  # effectif total
+            np.where(z_only == answer, answer + 3, z_only)   # approximation normale au lieu de Student
+        ], 0)
+    }
+
+
+TEMPLATES = {
+    "normale_queue": {
+        "niveau": "B1",
+        "titre": "Loi normale : probabilité d'une queue",
+        "concepts": ["loi normale", "centrage-réduction"],
+        "generate": _normale_queue,
+        "question": "Une variable aléatoire X suit une loi normale N({mu}, {sigma}²). Quelle est la probabilité que X soit supérieure à {seuil:g} ?",
+        "explication": "On centre-réduit : Z = (X - {mu}) / {sigma} = {z:g}. P(X > {seuil:g}) = P(Z > {z:g}) = 1 - Φ({z:g})."
+    },
+    "binomiale_exacte": {
+        "niveau": "B1",
+        "titre": "Loi binomiale : probabilité exacte",
+        "concepts": ["loi binomiale", "dénombrement"],
+        "generate": _binomiale_exacte,
+        "question": "On répète {n} fois une expérience dont la probabilité de succès est {p:g}. Quelle est la probabilité d'obtenir exactement {k} succès ?",
+        "explication": "X ~ B({n}, {p:g}). P(X={k}) = C({n},{k}) × {p:g}^{k} × (1-{p:g})^({n}-{k})."
+    },
+    "decision_p_value": {
+        "niveau": "B2",
+        "titre": "Décision à partir d'une p-value",
+        "concepts": ["tests d'hypothèses", "p-value"],
+        "generate": _decision_p_value,
+        "question": "Un test statistique donne une p-value de {p_value:g}. Au seuil α = {alpha:g}, quelle est la décision ?",
+        "explication": "p-value ({p_value:g}) {comparaison} α ({alpha:g}), donc {conclusion} l'hypothèse nulle H₀."
+    },
+    "choix_loi_ic": {
+        "niveau": "B2",
+        "titre": "Choix de la loi pour un intervalle de confiance",
+        "concepts": ["intervalle de confiance", "loi de Student"],
+        "generate": _choix_loi_ic,
+        "question": "Pour un échantillon de taille n = {n} avec s = {s} (σ de la population {connu}), quelle distribution utiliser pour l'IC de la moyenne ?",
+        "explication": "{raison}."
+    },
+    "intervalle_confiance": {
+        "niveau": "B2",
+        "titre": "Calcul d'un intervalle de confiance",
+        "concepts": ["intervalle de confiance", "marge d'erreur"],
+        "generate": _intervalle_confiance,
+        "question": "Sur un échantillon de n = {n} observations, x̄ = {x_bar:g} et s = {s:g}. Quel est l'intervalle de confiance à {niveau} % de la moyenne ?",
+        "explication": "n ≥ 30 : IC = x̄ ± z × s/√n = {x_bar:g} ± {z:g} × {s:g}/√{n} = {x_bar:g} ± {marge:g}."
+    },
+    "choix_test": {
+        "niveau": "B3",
+        "titre": "Choix du test statistique",
+        "concepts": ["tests d'hypothèses", "ANOVA", "Chi²"],
+        "generate": _choix_test,
+        "question": "Quel test utiliser pour {situation} ?",
+        "explication": "Pour {situation}, on utilise : {test}."
+    },
+    "taille_echantillon": {
+        "niveau": "B3",
+        "titre": "Taille d'échantillon d'un test t",
+        "concepts": ["puissance", "taille d'effet"],
+        "generate": _taille_echantillon,
+        "question": "On compare deux groupes indépendants par un test t bilatéral (α = 0.05). Quel effectif par groupe faut-il pour détecter un effet d = {d:g} avec une puissance de {puissance} % ?",
+        "explication": "Analyse de puissance (loi de Student non centrée) : n = {n} par groupe, soit {total} observations au total."
+    }
+}
+
+
+def _row(params: Dict, i: int) -> Dict:
+    return {name: values[i].item() if hasattr(values[i], 'item') else values[i] for name, values in params.items()}
+
+
+def generate_variants(template: str, seed: int, count: int = BATCH_SIZE) -> List[Dict]:
+    """
+    Génère les count premières variantes d'un modèle (sans passer par la base)
+
+    Returns:
+        Exercices au format de la table exercises
+    """
+    if template not in TEMPLATES:
+        raise ValueError(f"Modèle d'exercice inconnu : {template}")
+    spec = TEMPLATES[template]
+    template_index = list(TEMPLATES).index(template)
+
+    exercises = []
+    for batch_index in range(-(-count // BATCH_SIZE)):
+        rng = np.random.default_rng([seed, template_index, batch_index])
+        batch = spec["generate"](rng, BATCH_SIZE)
+
+        # Mélange des options : la bonne réponse (colonne 0) change de place
+        order = np.argsort(rng.random(batch['options'].shape), axis=1)
+        options = np.take_along_axis(batch['options'], order, axis=1)
+        correct = np.argmax(order == 0, axis=1)
+
+        for i in range(BATCH_SIZE):
+            row = _row(batch['params'], i)
+            exercises.append({
+                'exercise_id': f"tpl:{template}:{seed}:{batch_index * BATCH_SIZE + i:05d}",
+                'matiere': MATIERE,
+                'type': template,
+                'question': spec["question"].format(**row),
+                'options': options[i].tolist(),
+                'correct_index': int(correct[i]),
+                'explication': spec["explication"].format(**row),
+                'niveau': spec["niveau"],
+                'concepts': spec["concepts"],
+                'source': SOURCE
+            })
+    return exercises[:count]
+
+
+def get_variants(template: str, seed: int, count: int = 10) -> List[Dict]:
+    """
+    Variantes d'un modèle pour une graine, depuis le cache (table exercises)
+    ou générées puis enregistrées
+    """
+    prefix = f"tpl:{template}:{seed}:"
+    cached = get_exercises_by_id_prefix(prefix)
+    if len(cached) >= count:
+        return cached[:count]
+
+    create_exercises_bulk(generate_variants(template, seed, count))
+    prune_exercises_by_id_prefix(f"tpl:{template}:", max(MAX_CACHED_VARIANTS, count))
+    return get_exercises_by_id_prefix(prefix)[:count]
+
+
+def problem_set(seed: int, niveau: str = None, per_template: int = 2) -> List[Dict]:
+    """Série d'exercices d'un étudiant : per_template variantes de chaque modèle"""
+    exercises = []
+    for template, spec in TEMPLATES.items():
+        if niveau and spec["niveau"] != niveau:
+            continue
+        exercises.extend(get_variants(template, seed, per_template))
+    return exercises
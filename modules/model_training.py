@@ -0,0 +1,179 @@
+"""
+Entraînement des modèles des cas business (sans Streamlit)
+Les modèles candidats sont entraînés en parallèle (joblib, un processus par
+modèle) sur le dataset du cas servi par modules/case_datasets. Chaque
+modèle entraîné est gardé en mémoire avec ses métriques, sous la clé
+(empreinte du dataset, cible, modèle, paramètres) : relancer une
+configuration déjà entraînée est immédiat et ne relit même pas le dataset.
+"""
+
+import json
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import classification_report, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from modules.caching import LRUCache
+from modules.case_datasets import CASE_DATASETS, DEFAULT_SEED, case_dataset_params, get_case_dataset
+from modules.dataset_store import dataset_key
+
+# Nombre de modèles entraînés conservés en mémoire (LRU)
+MODEL_CACHE_SIZE = 32
+
+TEST_SIZE = 0.25
+RANDOM_STATE = 42
+
+# case_id -> colonne à prédire et colonnes ignorées (identifiants)
+TRAINING_CASES = {
+    2: {'target': 'churn', 'drop': ['client_id']},
+    7: {'target': 'fraude', 'drop': ['compte']},
+}
+
+# Modèles candidats : classe scikit-learn, normalisation préalable et paramètres par défaut
+MODELS = {
+    "Régression logistique": {
+        'estimator': LogisticRegression,
+        'scale': True,
+        'params': {'C': 1.0, 'max_iter': 1000, 'class_weight': 'balanced'}
+    },
+    "Random Forest": {
+        'estimator': RandomForestClassifier,
+        'scale': False,
+        'params': {'n_estimators': 200, 'max_depth': None, 'min_samples_leaf': 1,
+                   'class_weight': 'balanced', 'random_state': RANDOM_STATE}
+    },
+    "Gradient Boosting": {
+        'estimator': HistGradientBoostingClassifier,
+        'scale': False,
+        'params': {'max_iter': 200, 'learning_rate': 0.1, 'max_depth': None,
+                   'class_weight': 'balanced', 'random_state': RANDOM_STATE}
+    }
+}
+
+_cache = LRUCache(MODEL_CACHE_SIZE)
+
+
+def prepare_features(df: pd.DataFrame, target: str, drop: List[str] = ()) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Matrice de features numériques et cible
+
+    Les dates deviennent un nombre de jours et une heure, les colonnes
+    catégorielles sont encodées en one-hot.
+    """
+    X = df.drop(columns=[target, *drop])
+    for column in X.select_dtypes(include='datetime').columns:
+        X[f"{column}_jours"] = (X[column] - X[column].min()).dt.days
+        X[f"{column}_heure"] = X[column].dt.hour
+        X = X.drop(columns=column)
+    X = pd.get_dummies(X, dtype=float)
+    return X.astype(float), df[target]
+
+
+def _model_params(name: str, params: Dict = None) -> Dict:
+    if name not in MODELS:
+        raise ValueError(f"Modèle inconnu : {name}")
+    return {**MODELS[name]['params'], **(params or {})}
+
+
+def _cache_key(data_hash: str, target: str, name: str, params: Dict) -> Tuple:
+    return (data_hash, target, name, json.dumps(params, sort_keys=True), TEST_SIZE, RANDOM_STATE)
+
+
+def _fit(name: str, params: Dict, X_train: pd.DataFrame, y_train: pd.Series,
+         X_test: pd.DataFrame, y_test: pd.Series) -> Dict:
+    """Entraîne et évalue un modèle (exécuté dans un processus joblib)"""
+    start = time.perf_counter()
+    spec = MODELS[name]
+    model = spec['estimator'](**params)
+    if spec['scale']:
+        model = make_pipeline(StandardScaler(), model)
+    model.fit(X_train, y_train)
+
+    y_score = model.predict_proba(X_test)[:, 1]
+    y_pred = model.predict(X_test)
+    return {
+        'model': model,
+        'params': params,
+        'auc': roc_auc_score(y_test, y_score),
+        'report': classification_report(y_test, y_pred, output_dict=True, zero_division=0),
+        'report_text': classification_report(y_test, y_pred, zero_division=0),
+        'duration': time.perf_counter() - start
+    }
+
+
+def _train(data_hash: str, df: pd.DataFrame, target: str, drop: List[str],
+           tasks: List[Tuple[str, Dict]], n_jobs: int) -> Dict[str, Dict]:
+    """Entraîne en parallèle les modèles absents du cache et les met en cache"""
+    X, y = prepare_features(df, target, drop)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
+    )
+    n_jobs = max(1, min(len(tasks), n_jobs if n_jobs > 0 else (os.cpu_count() or 1)))
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(_fit)(name, params, X_train, y_train, X_test, y_test) for name, params in tasks
+    )
+    return {
+        name: _cache.put(_cache_key(data_hash, target, name, params), {**result, 'cached': False})
+        for (name, params), result in zip(tasks, fitted)
+    }
+
+
+def train_models(load: Callable[[], pd.DataFrame], target: str, models: Dict[str, Dict], data_hash: str,
+                 drop: List[str] = (), n_jobs: int = -1) -> Dict[str, Dict]:
+    """
+    Entraîne et compare des modèles de classification binaire
+
+    Le cache n'est consulté qu'une fois par modèle ; le dataset n'est chargé
+    (load()) que si au moins un modèle doit être entraîné.
+
+    Args:
+        load: Fonction renvoyant le dataset complet
+        target: Colonne à prédire (0/1)
+        models: Nom du modèle (clé de MODELS) -> paramètres remplaçant ceux par défaut
+        data_hash: Empreinte du dataset (clé du cache avec les paramètres)
+        drop: Colonnes à ignorer
+        n_jobs: Nombre de processus (-1 : un par cœur, au plus un par modèle)
+
+    Returns:
+        Nom -> model, params, auc, report (dict), report_text, duration (s), cached
+    """
+    results, tasks = {}, []
+    for name, params in models.items():
+        params = _model_params(name, params)
+        cached = _cache.get(_cache_key(data_hash, target, name, params))
+        if cached is not None:
+            results[name] = {**cached, 'cached': True}
+        else:
+            tasks.append((name, params))
+
+    if tasks:
+        results.update(_train(data_hash, load(), target, list(drop), tasks, n_jobs))
+    return {name: results[name] for name in models}
+
+
+def train_case_models(case_id: int, models: Dict[str, Dict], n_rows: int = None,
+                      seed: int = DEFAULT_SEED, n_jobs: int = -1) -> Dict[str, Dict]:
+    """
+    Entraîne les modèles d'un cas business sur son dataset d'exemple
+
+    Le dataset n'est chargé que si au moins un modèle n'est pas en cache.
+    """
+    if case_id not in TRAINING_CASES:
+        raise ValueError(f"Pas d'entraînement prévu pour le cas {case_id}")
+    case = TRAINING_CASES[case_id]
+    data_hash = dataset_key(case_dataset_params(case_id, n_rows or CASE_DATASETS[case_id]['n_rows'], seed))
+    return train_models(lambda: get_case_dataset(case_id, n_rows, seed)[0], case['target'],
+                        models, data_hash, case['drop'], n_jobs)
+
+
+def clear_cache():
+    """Vide le cache des modèles entraînés"""
+    _cache.clear()
@@ -0,0 +1,263 @@
+"""
+Moteur de simulation Monte-Carlo (NumPy, sans Streamlit)
+Utilisé par l'onglet Simulations de Stats & Probas : loi des grands nombres,
+distributions d'échantillonnage (théorème central limite) et bootstrap.
+
+Les tirages sont faits par blocs d'au plus chunk_draws valeurs : un bloc ne
+dépend que de la graine et de son indice (np.random.default_rng([seed, i])).
+La mémoire reste donc constante quel que soit le nombre total de tirages,
+et le résultat est identique en mode séquentiel ou avec un pool de processus.
+"""
+
+import math
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from modules.parallel import map_chunks
+
+# Nombre maximal de valeurs tirées par bloc (8 Mo en float64)
+CHUNK_DRAWS = 1_000_000
+
+# Lois sources des simulations : tirage vectorisé et moments théoriques
+SOURCE_DISTRIBUTIONS = {
+    "Normale N(0, 1)": {
+        "draw": lambda rng, size: rng.standard_normal(size),
+        "mean": 0.0, "var": 1.0
+    },
+    "Uniforme U(0, 1)": {
+        "draw": lambda rng, size: rng.random(size),
+        "mean": 0.5, "var": 1/12
+    },
+    "Exponentielle Exp(1)": {
+        "draw": lambda rng, size: rng.standard_exponential(size),
+        "mean": 1.0, "var": 1.0
+    },
+    "Bernoulli B(0.3)": {
+        "draw": lambda rng, size: (rng.random(size) < 0.3).astype(float),
+        "mean": 0.3, "var": 0.21
+    },
+    "Poisson P(3)": {
+        "draw": lambda rng, size: rng.poisson(3.0, size).astype(float),
+        "mean": 3.0, "var": 3.0
+    },
+    "Log-normale LN(0, 1)": {
+        "draw": lambda rng, size: rng.lognormal(0.0, 1.0, size),
+        "mean": math.exp(0.5), "var": (math.e - 1) * math.e
+    }
+}
+
+# Statistiques calculées sur la dernière dimension d'un tableau d'échantillons
+STATISTICS = {
+    "moyenne": lambda a: a.mean(axis=-1),
+    "médiane": lambda a: np.median(a, axis=-1),
+    "variance": lambda a: a.var(axis=-1, ddof=1),
+    "écart-type": lambda a: a.std(axis=-1, ddof=1),
+    "maximum": lambda a: a.max(axis=-1)
+}
+
+
+def _rng(seed: int, chunk_index: int) -> np.random.Generator:
+    return np.random.default_rng([seed, chunk_index])
+
+
+def chunk_plan(total: int, per_chunk: int) -> List[Tuple[int, int]]:
+    """Découpe total en blocs : liste de (indice du bloc, taille)"""
+    return [(i, min(per_chunk, total - start)) for i, start in enumerate(range(0, total, per_chunk))]
+
+
+# ========== LOI DES GRANDS NOMBRES ==========
+
+def coin_flips(n_flips: int, p: float = 0.5, n_paths: int = 1, seed: int = 42,
+               checkpoints: int = 300) -> Dict:
+    """
+    Proportion de « pile » au fil des lancers (loi des grands nombres)
+
+    Seuls les points de contrôle (espacés logarithmiquement) sont tracés :
+    le nombre de piles entre deux points suit exactement une loi binomiale,
+    on tire donc ces incréments au lieu de chaque lancer. Coût et mémoire
+    en O(checkpoints), même pour 10^9 lancers.
+
+    Returns:
+        n (points de contrôle), proportion (n_paths x points), bande à 95 %
+    """
+    n = np.unique(np.geomspace(1, n_flips, checkpoints).astype(np.int64))
+    increments = np.diff(n, prepend=0)
+    rng = _rng(seed, 0)
+    heads = rng.binomial(increments, p, size=(n_paths, len(n))).cumsum(axis=1)
+    band = 1.96 * np.sqrt(p * (1 - p) / n)
+
+    return {
+        'n': n,
+        'proportion': heads / n,
+        'lower': p - band,
+        'upper': p + band,
+        'final': heads[:, -1] / n_flips
+    }
+
+
+# ========== DISTRIBUTIONS D'ÉCHANTILLONNAGE ==========
+
+def _sampling_chunk(source: str, statistic: str, sample_size: int, rows: int,
+                    seed: int, chunk_index: int, edges: np.ndarray = None):
+    """Statistiques de rows échantillons ; histogramme et moments si edges est fourni"""
+    rng = _rng(seed, chunk_index)
+    samples = SOURCE_DISTRIBUTIONS[source]["draw"](rng, (rows, sample_size))
+    values = STATISTICS[statistic](samples)
+    if edges is None:
+        return values
+    return _summarize(values, edges)
+
+
+def _summarize(values: np.ndarray, edges: np.ndarray) -> Dict:
+    counts, _ = np.histogram(values, bins=edges)
+    return {
+        'counts': counts,
+        'sum': float(values.sum()),
+        'sumsq': float(np.square(values).sum()),
+        'n': len(values),
+        'outside': int(len(values) - counts.sum())
+    }
+
+
+def sampling_distribution(source: str, statistic: str, sample_size: int, n_samples: int,
+                          seed: int = 42, bins: int = 80, chunk_draws: int = CHUNK_DRAWS,
+                          workers: int = 1, progress: Callable = None) -> Dict:
+    """
+    Distribution d'échantillonnage d'une statistique par simulation
+
+    Les statistiques ne sont jamais toutes conservées : chaque bloc est
+    résumé en histogramme (bornes fixées sur le premier bloc) et en sommes,
+    d'où une mémoire constante pour 10^8 tirages ou plus.
+
+    Args:
+        source: Loi des observations (clé de SOURCE_DISTRIBUTIONS)
+        statistic: Statistique (clé de STATISTICS)
+        sample_size: Taille n de chaque échantillon
+        n_samples: Nombre d'échantillons simulés
+        workers: Nombre de processus (1 = séquentiel)
+        progress: Fonction appelée après chaque bloc : progress(fait, total, résultat partiel)
+
+    Returns:
+        edges, counts, mean, std, n_samples, n_draws, outside
+    """
+    if source not in SOURCE_DISTRIBUTIONS:
+        raise ValueError(f"Loi inconnue : {source}")
+    if statistic not in STATISTICS:
+        raise ValueError(f"Statistique inconnue : {statistic}")
+
+    rows_per_chunk = max(1, chunk_draws // sample_size)
+    plan = chunk_plan(n_samples, rows_per_chunk)
+
+    # Premier bloc : fixe les bornes de l'histogramme
+    first_index, first_rows = plan[0]
+    pilot = _sampling_chunk(source, statistic, sample_size, first_rows, seed, first_index)
+    low, high = np.quantile(pilot, [0.0005, 0.9995])
+    margin = (high - low) * 0.1 or 1.0
+    edges = np.linspace(low - margin, high + margin, bins + 1)
+
+    total = _summarize(pilot, edges)
+    result = _sampling_result(total, edges, sample_size)
+    if progress:
+        progress(total['n'], n_samples, result)
+
+    tasks = [(source, statistic, sample_size, rows, seed, index, edges) for index, rows in plan[1:]]
+    for summary in map_chunks(_sampling_chunk, tasks, workers):
+        total['counts'] += summary['counts']
+        for key in ('sum', 'sumsq', 'n', 'outside'):
+            total[key] += summary[key]
+        result = _sampling_result(total, edges, sample_size)
+        if progress:
+            progress(total['n'], n_samples, result)
+
+    return result
+
+
+def _sampling_result(total: Dict, edges: np.ndarray, sample_size: int) -> Dict:
+    mean = total['sum'] / total['n']
+    var = max(total['sumsq'] / total['n'] - mean ** 2, 0.0)
+    return {
+        'edges': edges,
+        'counts': total['counts'].copy(),
+        'mean': mean,
+        'std': math.sqrt(var),
+        'n_samples': total['n'],
+        'n_draws': total['n'] * sample_size,
+        'outside': total['outside']
+    }
+
+
+def clt_reference(source: str, sample_size: int) -> Tuple[float, float]:
+    """Moyenne et écart-type de x̄ prédits par le théorème central limite"""
+    spec = SOURCE_DISTRIBUTIONS[source]
+    return spec["mean"], math.sqrt(spec["var"] / sample_size)
+
+
+# ========== BOOTSTRAP ==========
+
+def _bootstrap_chunk(data: np.ndarray, statistic: str, rows: int, seed: int, chunk_index: int) -> np.ndarray:
+    """Statistique de rows rééchantillonnages (matrice d'indices rows x n)"""
+    rng = _rng(seed, chunk_index)
+    indices = rng.integers(0, len(data), size=(rows, len(data)))
+    return STATISTICS[statistic](data[indices])
+
+
+def bootstrap_distribution(data, statistic: str = "moyenne", n_boot: int = 10_000,
+                           seed: int = 42, chunk_draws: int = CHUNK_DRAWS,
+                           workers: int = 1, progress: Callable = None) -> np.ndarray:
+    """
+    Distribution bootstrap d'une statistique
+
+    Les rééchantillonnages sont tirés par blocs de matrices d'indices
+    (au plus chunk_draws indices par bloc).
+
+    Returns:
+        Tableau des n_boot statistiques rééchantillonnées
+    """
+    data = np.asarray(data, dtype=float)
+    if data.ndim != 1 or len(data) < 2:
+        raise ValueError("Il faut au moins 2 observations")
+    if statistic not in STATISTICS:
+        raise ValueError(f"Statistique inconnue : {statistic}")
+
+    rows_per_chunk = max(1, chunk_draws // len(data))
+    plan = chunk_plan(n_boot, rows_per_chunk)
+    tasks = [(data, statistic, rows, seed, index) for index, rows in plan]
+
+    values = np.empty(n_boot)
+    done = 0
+    for chunk in map_chunks(_bootstrap_chunk, tasks, workers):
+        values[done:done + len(chunk)] = chunk
+        done += len(chunk)
+        if progress:
+            progress(done, n_boot, values[:done])
+    return values
+
+
+def bootstrap_ci(data, statistic: str = "moyenne", n_boot: int = 10_000,
+                 confidence: float = 0.95, seed: int = 42, workers: int = 1,
+                 progress: Callable = None) -> Dict:
+    """
+    Intervalle de confiance bootstrap (méthode des percentiles)
+
+    Returns:
+        estimate, lower, upper, se, distribution
+    """
+    data = np.asarray(data, dtype=float)
+    distribution = bootstrap_distribution(data, statistic, n_boot, seed=seed,
+                                          workers=workers, progress=progress)
+    alpha = 1 - confidence
+    lower, upper = np.quantile(distribution, [alpha / 2, 1 - alpha / 2])
+
+    return {
+        'estimate': float(STATISTICS[statistic](data)),
+        'lower': float(lower),
+        'upper': float(upper),
+        'se': float(distribution.std(ddof=1)),
+        'distribution': distribution
+    }
+
+
+def draw_sample(source: str, size: int, seed: int = 42) -> np.ndarray:
+    """Échantillon d'observations d'une loi source (démonstrations du bootstrap)"""
+    return SOURCE_DISTRIBUTIONS[source]["draw"](_rng(seed, 0), size)
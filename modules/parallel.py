@@ -0,0 +1,20 @@
+"""
+Exécution parallèle par blocs (sans Streamlit)
+Utilitaire commun aux moteurs de calcul (simulations, rééchantillonnage)
+et à l'export des portfolios : les tâches sont réparties dans un pool de
+processus démarrés en mode spawn, les résultats revenant dans l'ordre.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, Iterator, List, Tuple
+
+
+def map_chunks(func: Callable, tasks: List[Tuple], workers: int = 1) -> Iterator:
+    """Applique func à chaque bloc, en séquentiel ou dans un pool de processus (ordre conservé)"""
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield func(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        yield from pool.map(func, *zip(*tasks))
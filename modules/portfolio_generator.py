@@ -1,10 +1,11 @@
+import os
 import streamlit as st
 from pathlib import Path
 from modules.database import (
-    create_or_update_portfolio, get_portfolio_by_student, update_portfolio_info,
-    add_portfolio_project, get_portfolio_projects, delete_portfolio_project,
-    add_portfolio_skill, get_portfolio_skills, update_portfolio_skill
+    create_or_update_portfolio, load_portfolio_bundle, update_portfolio_info,
+    add_portfolio_project, delete_portfolio_project, save_portfolio_skills, get_promos
 )
+from modules.portfolio_renderer import bundle_html, export_promo_zip
 
 DB_AVAILABLE = True
 
@@ -15,11 +16,14 @@ tab1, tab2, tab3, tab4 = st.tabs(["👤 Informations", "📁 Projets", "💪 Com
 
 student_id = 1
 
-portfolio = get_portfolio_by_student(student_id)
+# Portfolio, projets et compétences chargés en une requête pour toute la page
+bundle = load_portfolio_bundle(student_id)
 
-if not portfolio:
-    portfolio_id = create_or_update_portfolio({'full_name': '', 'titre': '', 'bio': '', 'email': '', 'github': '', 'linkedin': ''}, user_id=student_id)
-    portfolio = get_portfolio_by_student(student_id)
+if not bundle:
+    create_or_update_portfolio({'full_name': '', 'titre': '', 'bio': '', 'email': '', 'github': '', 'linkedin': ''}, user_id=student_id)
+    bundle = load_portfolio_bundle(student_id)
+
+portfolio = bundle.portfolio
 
 with tab1:
     st.header("👤 Informations Personnelles")
@@ -103,15 +107,14 @@ with tab2:
     
     if st.button("➕ Ajouter le projet"):
         if titre_projet and description_projet:
-            add_portfolio_project({
-                'portfolio_id': portfolio['id'],
+            add_portfolio_project(portfolio['id'], {
                 'titre': titre_projet,
                 'description': description_projet,
                 'categorie': categorie,
                 'duree': duree,
                 'technologies': technologies_projet,
-                'github_link': github_link,
-                'demo_link': demo_link,
+                'github': github_link,
+                'demo': demo_link,
                 'resultats': resultats_projet
             })
             st.success("✅ Projet ajouté !")
@@ -122,7 +125,7 @@ with tab2:
     st.markdown("---")
     st.markdown("### 📂 Projets Enregistrés")
     
-    projets = get_portfolio_projects(portfolio['id'])
+    projets = bundle.projects
     
     if projets:
         for i, projet in enumerate(projets):
@@ -134,10 +137,10 @@ with tab2:
                     st.markdown(f"**Technologies :** {', '.join(technologies)}")
                 if projet.get('resultats'):
                     st.markdown(f"**Résultats :** {projet['resultats']}")
-                if projet.get('github_link'):
-                    st.markdown(f"🔗 [Code GitHub]({projet['github_link']})")
-                if projet.get('demo_link'):
-                    st.markdown(f"🔗 [Démo en ligne]({projet['demo_link']})")
+                if projet.get('github'):
+                    st.markdown(f"🔗 [Code GitHub]({projet['github']})")
+                if projet.get('demo'):
+                    st.markdown(f"🔗 [Démo en ligne]({projet['demo']})")
                 
                 if st.button("🗑️ Supprimer", key=f"del_proj_{projet['id']}"):
                     delete_portfolio_project(projet['id'])
@@ -158,8 +161,7 @@ with tab3:
         "Soft Skills": ["Communication", "Travail d'équipe", "Résolution de problèmes", "Gestion de projet"]
     }
     
-    existing_skills = get_portfolio_skills(portfolio['id'])
-    skills_dict = {skill['nom']: skill['niveau'] for skill in existing_skills}
+    skills_dict = {skill['competence']: skill['niveau'] for skill in bundle.skills}
     
     for categorie, competences in categories_comp.items():
         st.markdown(f"#### {categorie}")
@@ -174,17 +176,7 @@ with tab3:
             skills_dict[comp] = niveau
     
     if st.button("💾 Sauvegarder les compétences"):
-        for comp, niveau in skills_dict.items():
-            existing = next((s for s in existing_skills if s['nom'] == comp), None)
-            if existing:
-                update_portfolio_skill(existing['id'], niveau)
-            else:
-                add_portfolio_skill({
-                    'portfolio_id': portfolio['id'],
-                    'nom': comp,
-                    'niveau': niveau,
-                    'categorie': next((cat for cat, comps in categories_comp.items() if comp in comps), 'Autre')
-                })
+        save_portfolio_skills(portfolio['id'], skills_dict)
         st.success("✅ Compétences sauvegardées !")
         st.rerun()
 
@@ -213,8 +205,6 @@ with tab4:
         if portfolio.get('linkedin'):
             col3.markdown(f"💼 [LinkedIn](https://linkedin.com/in/{portfolio['linkedin']})")
         
-        projets = get_portfolio_projects(portfolio['id'])
-        
         if projets:
             st.markdown("---")
             st.markdown("## 📁 Projets")
@@ -232,16 +222,16 @@ with tab4:
                     st.info(f"**📊 Résultats :** {projet['resultats']}")
                 
                 links = []
-                if projet.get('github_link'):
-                    links.append(f"[Code]({projet['github_link']})")
-                if projet.get('demo_link'):
-                    links.append(f"[Démo]({projet['demo_link']})")
+                if projet.get('github'):
+                    links.append(f"[Code]({projet['github']})")
+                if projet.get('demo'):
+                    links.append(f"[Démo]({projet['demo']})")
                 if links:
                     st.markdown(" | ".join(links))
                 
                 st.markdown("---")
         
-        skills = get_portfolio_skills(portfolio['id'])
+        skills = bundle.skills
         
         if skills:
             st.markdown("## 💪 Compétences")
@@ -249,7 +239,7 @@ with tab4:
             comp_by_level = {"Expert": [], "Avancé": [], "Intermédiaire": [], "Débutant": []}
             
             for skill in skills:
-                comp_by_level[skill['niveau']].append(skill['nom'])
+                comp_by_level[skill['niveau']].append(skill['competence'])
             
             for niveau in ["Expert", "Avancé", "Intermédiaire", "Débutant"]:
                 if comp_by_level[niveau]:
@@ -260,100 +250,7 @@ with tab4:
         
         st.subheader("📥 Export")
         
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="fr">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{portfolio.get('full_name', 'Portfolio')} - Data Science Portfolio</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background: #f4f4f4; }}
-        .container {{ max-width: 1000px; margin: 0 auto; background: white; padding: 40px; }}
-        header {{ text-align: center; padding: 40px 0; border-bottom: 3px solid #667eea; }}
-        h1 {{ color: #667eea; font-size: 2.5em; margin-bottom: 10px; }}
-        h2 {{ color: #667eea; margin-top: 30px; margin-bottom: 15px; border-bottom: 2px solid #eee; padding-bottom: 10px; }}
-        .subtitle {{ color: #666; font-size: 1.3em; margin-bottom: 15px; }}
-        .bio {{ max-width: 800px; margin: 20px auto; text-align: center; color: #555; }}
-        .contact {{ text-align: center; margin: 20px 0; }}
-        .contact a {{ color: #667eea; text-decoration: none; margin: 0 15px; }}
-        .projet {{ background: #f9f9f9; padding: 20px; margin: 20px 0; border-left: 4px solid #667eea; border-radius: 5px; }}
-        .projet h3 {{ color: #333; margin-bottom: 10px; }}
-        .tech {{ display: inline-block; background: #667eea; color: white; padding: 5px 10px; margin: 5px 5px 5px 0; border-radius: 3px; font-size: 0.9em; }}
-        .competences {{ display: flex; flex-wrap: wrap; gap: 10px; margin: 15px 0; }}
-        .comp-item {{ background: #eef; padding: 8px 15px; border-radius: 5px; }}
-        .results {{ background: #e8f5e9; padding: 15px; border-radius: 5px; margin: 10px 0; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>{portfolio.get('full_name', '')}</h1>
-            <div class="subtitle">{portfolio.get('titre', '')}</div>
-            <div class="bio">{portfolio.get('bio', '')}</div>
-            <div class="contact">
-        """
-        
-        if portfolio.get('email'):
-            html_content += f"<a href='mailto:{portfolio['email']}'>📧 {portfolio['email']}</a>"
-        if portfolio.get('github'):
-            html_content += f"<a href='https://github.com/{portfolio['github']}' target='_blank'>💻 GitHub</a>"
-        if portfolio.get('linkedin'):
-            html_content += f"<a href='https://linkedin.com/in/{portfolio['linkedin']}' target='_blank'>💼 LinkedIn</a>"
-        
-        html_content += """
-            </div>
-        </header>
-        """
-        
-        if projets:
-            html_content += "<h2>📁 Projets</h2>"
-            for projet in projets:
-                html_content += f"""
-                <div class="projet">
-                    <h3>{projet['titre']}</h3>
-                    <p><strong>{projet['categorie']}</strong> | {projet.get('duree', '')}</p>
-                    <p>{projet['description']}</p>
-                """
-                
-                technologies = projet.get('technologies', [])
-                if technologies:
-                    for tech in technologies:
-                        html_content += f"<span class='tech'>{tech}</span>"
-                
-                if projet.get('resultats'):
-                    html_content += f"<div class='results'><strong>📊 Résultats :</strong> {projet['resultats']}</div>"
-                
-                if projet.get('github_link') or projet.get('demo_link'):
-                    html_content += "<p>"
-                    if projet.get('github_link'):
-                        html_content += f"<a href='{projet['github_link']}' target='_blank'>Code GitHub</a>"
-                    if projet.get('demo_link'):
-                        html_content += f" | <a href='{projet['demo_link']}' target='_blank'>Démo</a>"
-                    html_content += "</p>"
-                
-                html_content += "</div>"
-        
-        if skills:
-            html_content += "<h2>💪 Compétences</h2>"
-            comp_by_level = {"Expert": [], "Avancé": [], "Intermédiaire": [], "Débutant": []}
-            
-            for skill in skills:
-                comp_by_level[skill['niveau']].append(skill['nom'])
-            
-            for niveau in ["Expert", "Avancé", "Intermédiaire", "Débutant"]:
-                if comp_by_level[niveau]:
-                    html_content += f"<p><strong>{niveau} :</strong> "
-                    for comp in comp_by_level[niveau]:
-                        html_content += f"<span class='comp-item'>{comp}</span> "
-                    html_content += "</p>"
-        
-        html_content += """
-    </div>
-</body>
-</html>
-        """
+        html_content = bundle_html(bundle)
         
         st.download_button(
             label="📥 Télécharger en HTML",
@@ -363,3 +260,18 @@ with tab4:
         )
         
         st.info("💡 **Astuce :** Vous pouvez héberger ce fichier HTML gratuitement sur GitHub Pages, Netlify ou Vercel !")
+        
+        promos = get_promos()
+        if promos:
+            with st.expander("🎓 Exporter les portfolios d'une promo"):
+                promo = st.selectbox("Promotion", promos)
+                if st.button("📦 Générer l'archive"):
+                    with st.spinner("Génération des portfolios..."):
+                        st.session_state.promo_zip = (promo, export_promo_zip(promo, workers=os.cpu_count() or 1))
+                if st.session_state.get('promo_zip', (None,))[0] == promo:
+                    st.download_button(
+                        label="📥 Télécharger l'archive (zip)",
+                        data=st.session_state.promo_zip[1],
+                        file_name=f"portfolios_{promo}.zip",
+                        mime="application/zip"
+                    )
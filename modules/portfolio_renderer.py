@@ -0,0 +1,235 @@
+"""
+Rendu HTML statique des portfolios (sans Streamlit)
+Les gabarits string.Template sont compilés une fois au chargement du module
+et toutes les valeurs saisies par l'étudiant sont échappées (html.escape).
+
+Le HTML rendu est mis en cache par (portfolio, version) : la colonne
+portfolios.version est incrémentée par des triggers SQLite à chaque
+écriture sur le portfolio, ses projets ou ses compétences. Une page
+inchangée n'est donc jamais rendue deux fois.
+"""
+
+import html
+import io
+import zipfile
+from string import Template
+from typing import Dict, List, Tuple
+from urllib.parse import quote, urlparse
+
+from modules.caching import LRUCache
+from modules.database import (
+    PortfolioBundle, get_portfolio_ids_by_promo, get_portfolio_version,
+    load_portfolio_bundle_by_id
+)
+from modules.parallel import map_chunks
+
+# Nombre de pages HTML conservées en mémoire (LRU)
+RENDER_CACHE_SIZE = 128
+
+# Pages minimales par processus : en dessous, le démarrage du pool coûte plus que le rendu
+PAGES_PER_WORKER = 500
+
+SKILL_LEVELS = ["Expert", "Avancé", "Intermédiaire", "Débutant"]
+
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$title - Data Science Portfolio</title>
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background: #f4f4f4; }
+        .container { max-width: 1000px; margin: 0 auto; background: white; padding: 40px; }
+        header { text-align: center; padding: 40px 0; border-bottom: 3px solid #667eea; }
+        h1 { color: #667eea; font-size: 2.5em; margin-bottom: 10px; }
+        h2 { color: #667eea; margin-top: 30px; margin-bottom: 15px; border-bottom: 2px solid #eee; padding-bottom: 10px; }
+        .subtitle { color: #666; font-size: 1.3em; margin-bottom: 15px; }
+        .bio { max-width: 800px; margin: 20px auto; text-align: center; color: #555; }
+        .contact { text-align: center; margin: 20px 0; }
+        .contact a { color: #667eea; text-decoration: none; margin: 0 15px; }
+        .projet { background: #f9f9f9; padding: 20px; margin: 20px 0; border-left: 4px solid #667eea; border-radius: 5px; }
+        .projet h3 { color: #333; margin-bottom: 10px; }
+        .tech { display: inline-block; background: #667eea; color: white; padding: 5px 10px; margin: 5px 5px 5px 0; border-radius: 3px; font-size: 0.9em; }
+        .comp-item { background: #eef; padding: 8px 15px; border-radius: 5px; }
+        .results { background: #e8f5e9; padding: 15px; border-radius: 5px; margin: 10px 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1>$full_name</h1>
+            <div class="subtitle">$titre</div>
+            <div class="bio">$bio</div>
+            <div class="contact">$contact</div>
+        </header>
+$projects$skills
+    </div>
+</body>
+</html>
+""")
+
+PROJECT_TEMPLATE = Template("""        <div class="projet">
+            <h3>$titre</h3>
+            <p><strong>$categorie</strong> | $duree</p>
+            <p>$description</p>
+            $technologies$resultats$links
+        </div>
+""")
+
+LINK_TEMPLATE = Template("<a href='$href' target='_blank'>$label</a>")
+RESULTS_TEMPLATE = Template("<div class='results'><strong>📊 Résultats :</strong> $resultats</div>")
+LEVEL_TEMPLATE = Template("        <p><strong>$niveau :</strong> $items</p>\n")
+
+_cache = LRUCache(RENDER_CACHE_SIZE)
+
+
+def _text(value) -> str:
+    return html.escape(str(value or ''))
+
+
+def _url(value: str) -> str:
+    """URL échappée, ou chaîne vide si le schéma n'est pas http(s)/mailto"""
+    if not value or urlparse(value).scheme not in ('http', 'https', 'mailto'):
+        return ''
+    return html.escape(value)
+
+
+def _link(href: str, label: str) -> str:
+    href = _url(href)
+    return LINK_TEMPLATE.substitute(href=href, label=_text(label)) if href else ''
+
+
+def _render_project(project: Dict) -> str:
+    links = [link for link in (_link(project.get('github'), "Code GitHub"),
+                               _link(project.get('demo'), "Démo")) if link]
+    return PROJECT_TEMPLATE.substitute(
+        titre=_text(project.get('titre')),
+        categorie=_text(project.get('categorie')),
+        duree=_text(project.get('duree')),
+        description=_text(project.get('description')),
+        technologies=''.join(f"<span class='tech'>{_text(tech)}</span>"
+                             for tech in project.get('technologies') or []),
+        resultats=RESULTS_TEMPLATE.substitute(resultats=_text(project['resultats']))
+        if project.get('resultats') else '',
+        links=f"<p>{' | '.join(links)}</p>" if links else ''
+    )
+
+
+def render_portfolio(portfolio: Dict, projects: List[Dict], skills: List[Dict]) -> str:
+    """
+    Page HTML autonome d'un portfolio
+
+    Args:
+        portfolio: Ligne de la table portfolios
+        projects: Projets du portfolio (technologies décodées)
+        skills: Compétences (competence, niveau)
+    """
+    contact = []
+    if portfolio.get('email'):
+        contact.append(_link(f"mailto:{portfolio['email']}", f"📧 {portfolio['email']}"))
+    if portfolio.get('github'):
+        contact.append(_link(f"https://github.com/{quote(portfolio['github'])}", "💻 GitHub"))
+    if portfolio.get('linkedin'):
+        contact.append(_link(f"https://linkedin.com/in/{quote(portfolio['linkedin'])}", "💼 LinkedIn"))
+
+    projects_html = ''
+    if projects:
+        projects_html = "        <h2>📁 Projets</h2>\n" + ''.join(map(_render_project, projects))
+
+    skills_html = ''
+    if skills:
+        by_level = {niveau: [] for niveau in SKILL_LEVELS}
+        for skill in skills:
+            by_level.setdefault(skill['niveau'], []).append(skill['competence'])
+        skills_html = "        <h2>💪 Compétences</h2>\n" + ''.join(
+            LEVEL_TEMPLATE.substitute(
+                niveau=_text(niveau),
+                items=' '.join(f"<span class='comp-item'>{_text(comp)}</span>" for comp in comps)
+            )
+            for niveau, comps in by_level.items() if comps
+        )
+
+    return PAGE_TEMPLATE.substitute(
+        title=_text(portfolio.get('full_name') or 'Portfolio'),
+        full_name=_text(portfolio.get('full_name')),
+        titre=_text(portfolio.get('titre')),
+        bio=_text(portfolio.get('bio')),
+        contact=''.join(contact),
+        projects=projects_html,
+        skills=skills_html
+    )
+
+
+def _render_task(portfolio_id: int, portfolio: Dict, projects: List[Dict],
+                 skills: List[Dict]) -> Tuple[int, str]:
+    """Rendu exécutable dans un processus du pool (données déjà chargées)"""
+    return portfolio_id, render_portfolio(portfolio, projects, skills)
+
+
+def _task(bundle: PortfolioBundle) -> Tuple[int, Dict, List[Dict], List[Dict]]:
+    """Arguments de _render_task (dictionnaires simples, transmissibles au pool)"""
+    return (bundle.portfolio['id'], dict(bundle.portfolio),
+            [dict(project) for project in bundle.projects], [dict(skill) for skill in bundle.skills])
+
+
+def bundle_html(bundle: PortfolioBundle) -> str:
+    """HTML d'un portfolio déjà chargé (load_portfolio_bundle), sans accès à la base"""
+    key = (bundle.portfolio['id'], bundle.portfolio['version'])
+    page = _cache.get(key)
+    if page is not None:
+        return page
+    return _cache.put(key, render_portfolio(bundle.portfolio, bundle.projects, bundle.skills))
+
+
+def portfolio_html(portfolio_id: int) -> str:
+    """HTML d'un portfolio, rendu seulement si sa version a changé"""
+    key = (portfolio_id, get_portfolio_version(portfolio_id))
+    if key[1] is None:
+        raise ValueError(f"Portfolio introuvable : {portfolio_id}")
+    page = _cache.get(key)
+    if page is not None:
+        return page
+    return bundle_html(load_portfolio_bundle_by_id(portfolio_id))
+
+
+def clear_cache():
+    """Vide le cache des pages rendues"""
+    _cache.clear()
+
+
+def export_portfolios_zip(portfolio_ids: List[int], workers: int = 1) -> bytes:
+    """
+    Archive zip contenant un fichier HTML par portfolio
+
+    Les pages déjà en cache sont reprises telles quelles ; les autres sont
+    rendues dans un pool de processus (workers > 1) puis mises en cache.
+    """
+    pages = {}
+    tasks = []
+    for portfolio_id in portfolio_ids:
+        key = (portfolio_id, get_portfolio_version(portfolio_id))
+        if key[1] is None:
+            continue
+        page = _cache.get(key)
+        if page is not None:
+            pages[portfolio_id] = page
+        else:
+            tasks.append(_task(load_portfolio_bundle_by_id(portfolio_id)))
+
+    versions = {task[0]: task[1]['version'] for task in tasks}
+    workers = max(1, min(workers, len(tasks) // PAGES_PER_WORKER))
+    for portfolio_id, page in map_chunks(_render_task, tasks, workers):
+        pages[portfolio_id] = _cache.put((portfolio_id, versions[portfolio_id]), page)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for portfolio_id in portfolio_ids:
+            if portfolio_id in pages:
+                archive.writestr(f"portfolio_{portfolio_id}.html", pages[portfolio_id])
+    return buffer.getvalue()
+
+
+def export_promo_zip(promo: str, workers: int = 1) -> bytes:
+    """Archive zip des portfolios de tous les étudiants d'une promotion"""
+    return export_portfolios_zip(get_portfolio_ids_by_promo(promo), workers)
@@ -0,0 +1,199 @@
+"""
+Analyse de puissance et taille d'échantillon (NumPy/SciPy, sans Streamlit)
+Plans couverts : test Z, tests t (1 ou 2 échantillons), proportions et ANOVA.
+
+Toutes les fonctions sont vectorisées sur les tailles d'effet : un appel
+traite des milliers de plans. Pour les couples (α, puissance) usuels, les
+tailles d'échantillon d'une grille d'effets sont précalculées une fois par
+processus et servies par simple lecture de table.
+"""
+
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+from scipy import stats
+
+# Plans d'expérience : statistique de test et facteur de non-centralité
+# (effet x √(n x facteur)) ; n est l'effectif par groupe (k groupes pour l'ANOVA)
+DESIGNS = {
+    "Test Z (moyenne)": {"test": "z", "factor": 1.0, "groups": 1, "effect": "d de Cohen"},
+    "Test t (1 échantillon)": {"test": "t", "factor": 1.0, "groups": 1, "effect": "d de Cohen"},
+    "Test t (2 échantillons)": {"test": "t", "factor": 0.5, "groups": 2, "effect": "d de Cohen"},
+    "Proportion (1 échantillon)": {"test": "z", "factor": 1.0, "groups": 1, "effect": "h de Cohen"},
+    "Deux proportions": {"test": "z", "factor": 0.5, "groups": 2, "effect": "h de Cohen"},
+    "ANOVA (k groupes)": {"test": "f", "effect": "f de Cohen"}
+}
+
+# Conventions de Cohen (petit, moyen, grand effet)
+COHEN_EFFECTS = {
+    "d de Cohen": {"petit": 0.2, "moyen": 0.5, "grand": 0.8},
+    "h de Cohen": {"petit": 0.2, "moyen": 0.5, "grand": 0.8},
+    "f de Cohen": {"petit": 0.1, "moyen": 0.25, "grand": 0.4}
+}
+
+ALTERNATIVES = ["bilatéral", "unilatéral"]
+
+# Grilles précalculées
+COMMON_ALPHAS = (0.01, 0.05, 0.1)
+COMMON_POWERS = (0.8, 0.85, 0.9, 0.95)
+EFFECT_GRID = np.round(np.arange(0.05, 2.0001, 0.01), 2)
+
+# Borne haute de la recherche de n
+MAX_N = 10_000_000
+
+
+def cohen_h(p1, p2) -> np.ndarray:
+    """Taille d'effet h de Cohen entre deux proportions"""
+    return np.abs(2 * np.arcsin(np.sqrt(p1)) - 2 * np.arcsin(np.sqrt(p2)))
+
+
+def _check_design(design: str, alternative: str):
+    if design not in DESIGNS:
+        raise ValueError(f"Plan inconnu : {design}")
+    if alternative not in ALTERNATIVES:
+        raise ValueError(f"Hypothèse alternative inconnue : {alternative}")
+
+
+def power(design: str, effect, n, alpha: float = 0.05, alternative: str = "bilatéral",
+          k: int = 3) -> np.ndarray:
+    """
+    Puissance d'un test
+
+    Args:
+        design: Plan (clé de DESIGNS)
+        effect: Taille(s) d'effet (d, h ou f selon le plan)
+        n: Effectif(s) par groupe
+        alpha: Niveau de significativité
+        alternative: "bilatéral" ou "unilatéral" (ignoré pour l'ANOVA)
+        k: Nombre de groupes (ANOVA)
+
+    Returns:
+        Puissance(s), de la forme diffusée de effect et n
+    """
+    _check_design(design, alternative)
+    spec = DESIGNS[design]
+    effect, n = np.broadcast_arrays(np.abs(np.asarray(effect, dtype=float)), np.asarray(n, dtype=float))
+    level = 1 - alpha / 2 if alternative == "bilatéral" else 1 - alpha
+
+    if spec["test"] == "z":
+        nc = effect * np.sqrt(n * spec["factor"])
+        critical = stats.norm.ppf(level)
+        result = stats.norm.sf(critical - nc)
+        if alternative == "bilatéral":
+            result = result + stats.norm.cdf(-critical - nc)
+        return result
+
+    if spec["test"] == "t":
+        df = spec["groups"] * (n - 1)
+        nc = effect * np.sqrt(n * spec["factor"])
+        critical = stats.t.ppf(level, df)
+        result = stats.nct.sf(critical, df, nc)
+        if alternative == "bilatéral":
+            result = result + stats.nct.cdf(-critical, df, nc)
+        return result
+
+    # ANOVA à un facteur : F non centrée de paramètre λ = f² k n
+    df1, df2 = k - 1, k * (n - 1)
+    critical = stats.f.ppf(1 - alpha, df1, df2)
+    return stats.ncf.sf(critical, df1, df2, effect ** 2 * k * n)
+
+
+def _normal_sample_size(spec: Dict, effect: np.ndarray, alpha: float, target: float,
+                        alternative: str) -> np.ndarray:
+    """Formule fermée n = ((z_α + z_β) / effet)² / facteur"""
+    z_alpha = stats.norm.ppf(1 - alpha / 2 if alternative == "bilatéral" else 1 - alpha)
+    z_beta = stats.norm.ppf(target)
+    return ((z_alpha + z_beta) / effect) ** 2 / spec.get("factor", 1.0)
+
+
+def _solve_sample_size(design: str, effect: np.ndarray, alpha: float, target: float,
+                       alternative: str, k: int) -> np.ndarray:
+    """
+    Plus petit n entier atteignant la puissance visée
+
+    La puissance croît avec n : recherche dichotomique vectorisée, partant
+    de l'approximation normale (le test t demande toujours un peu plus).
+    """
+    spec = DESIGNS[design]
+    if spec["test"] == "z":
+        return np.clip(np.ceil(_normal_sample_size(spec, effect, alpha, target, alternative)), 1, MAX_N)
+
+    if spec["test"] == "t":
+        low = np.maximum(np.floor(_normal_sample_size(spec, effect, alpha, target, alternative)), 2)
+    else:
+        low = np.full(effect.shape, 2.0)
+    low = np.minimum(low, MAX_N)
+
+    # Borne haute : on double jusqu'à atteindre la puissance
+    high = low.copy()
+    pending = power(design, effect, high, alpha, alternative, k) < target
+    while pending.any():
+        high[pending] = np.minimum(high[pending] * 2, MAX_N)
+        pending &= high < MAX_N
+        pending[pending] = power(design, effect[pending], high[pending], alpha, alternative, k) < target
+
+    # low ne suffit jamais sauf si high == low
+    low = np.where(high == low, low - 1, np.maximum(high // 2, low - 1))
+    while True:
+        active = high - low > 1
+        if not active.any():
+            return high
+        mid = np.floor((low[active] + high[active]) / 2)
+        enough = power(design, effect[active], mid, alpha, alternative, k) >= target
+        high[active] = np.where(enough, mid, high[active])
+        low[active] = np.where(enough, low[active], mid)
+
+
+@lru_cache(maxsize=128)
+def lookup_table(design: str, alpha: float, target: float, alternative: str = "bilatéral",
+                 k: int = 3) -> np.ndarray:
+    """Tailles d'échantillon pour chaque effet de EFFECT_GRID (calculées une fois, lecture seule)"""
+    table = _solve_sample_size(design, EFFECT_GRID.copy(), alpha, target, alternative, k)
+    table.setflags(write=False)
+    return table
+
+
+def sample_size(design: str, effect, alpha: float = 0.05, target_power: float = 0.8,
+                alternative: str = "bilatéral", k: int = 3) -> np.ndarray:
+    """
+    Effectif minimal par groupe pour atteindre la puissance visée
+
+    Args:
+        design: Plan (clé de DESIGNS)
+        effect: Taille(s) d'effet strictement positive(s)
+        alpha: Niveau de significativité
+        target_power: Puissance visée (1 - β)
+        alternative: "bilatéral" ou "unilatéral"
+        k: Nombre de groupes (ANOVA)
+
+    Returns:
+        Effectif(s) entier(s) par groupe (float, MAX_N si l'effet est trop petit)
+    """
+    _check_design(design, alternative)
+    effect = np.abs(np.atleast_1d(np.asarray(effect, dtype=float)))
+    if (effect <= 0).any():
+        raise ValueError("La taille d'effet doit être strictement positive")
+    if not 0 < target_power < 1:
+        raise ValueError("La puissance visée doit être comprise entre 0 et 1")
+
+    result = np.empty(effect.shape)
+    todo = np.ones(effect.shape, dtype=bool)
+
+    if alpha in COMMON_ALPHAS and target_power in COMMON_POWERS:
+        table = lookup_table(design, alpha, target_power, alternative, k)
+        index = np.clip(np.searchsorted(EFFECT_GRID, np.round(effect, 6)), 0, len(EFFECT_GRID) - 1)
+        hit = EFFECT_GRID[index] == np.round(effect, 6)
+        result[hit] = table[index[hit]]
+        todo = ~hit
+
+    if todo.any():
+        result[todo] = _solve_sample_size(design, effect[todo], alpha, target_power, alternative, k)
+    return result
+
+
+def power_curve(design: str, effect: float, n_max: int, alpha: float = 0.05,
+                alternative: str = "bilatéral", k: int = 3, points: int = 200) -> Dict:
+    """Puissance en fonction de n (points espacés jusqu'à n_max)"""
+    n = np.unique(np.linspace(2, max(n_max, 3), points).astype(int))
+    return {'n': n, 'power': power(design, effect, n, alpha, alternative, k)}
@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from modules.database import (
-    create_project, get_projects, get_project_by_id, 
+    create_project, get_projects_with_progress, get_project_tasks,
     update_project_status, delete_project,
     add_project_task, update_task_status, delete_task
 )
@@ -17,17 +17,13 @@ tab1, tab2, tab3 = st.tabs(["📊 Mes Projets", "➕ Nouveau Projet", "📚 Temp
 with tab1:
     st.header("Mes Projets")
     
-    projects = get_projects()
+    status_filter = st.selectbox("Filtrer par statut", ["Tous", "En cours", "Terminé", "En pause"])
+    projects = get_projects_with_progress(status=None if status_filter == "Tous" else status_filter)
     
     if not projects:
         st.info("Aucun projet pour le moment. Créez votre premier projet dans l'onglet 'Nouveau Projet' !")
     else:
-        status_filter = st.selectbox("Filtrer par statut", ["Tous", "En cours", "Terminé", "En pause"])
-        
         for project in projects:
-            if status_filter != "Tous" and project['status'] != status_filter:
-                continue
-            
             status_color = {
                 "En cours": "🟢",
                 "Terminé": "✅",
@@ -52,13 +48,28 @@ with tab1:
                             st.markdown(f"- {tech}")
                 
                 st.markdown("---")
-                st.markdown("**📋 Tâches :**")
+                st.markdown(f"**📋 Tâches :** {project['taches_faites']} / {project['total_taches']}")
+                st.progress(project['progression'] / 100)
                 
-                tasks = project.get('tasks', [])
-                if tasks:
-                    for task in tasks:
-                        done = "✅" if task.get('done', False) else "⬜"
-                        st.markdown(f"{done} {task['nom']}")
+                # Les tâches ne sont chargées que pour les projets ouverts en édition
+                if st.toggle("Gérer les tâches", key=f"show_tasks_{project['id']}"):
+                    for task in get_project_tasks(project['id']):
+                        col_task, col_remove = st.columns([4, 1])
+                        with col_task:
+                            done = st.checkbox(task['nom'], value=task['done'],
+                                               key=f"task_{task['id']}")
+                            if done != task['done']:
+                                update_task_status(project['id'], task['position'], done)
+                                st.rerun()
+                        with col_remove:
+                            if st.button("❌", key=f"delete_task_{task['id']}"):
+                                delete_task(project['id'], task['position'])
+                                st.rerun()
+                    
+                    new_task = st.text_input("Nouvelle tâche", key=f"add_task_{project['id']}")
+                    if st.button("➕ Ajouter", key=f"add_task_button_{project['id']}") and new_task:
+                        add_project_task(project['id'], new_task)
+                        st.rerun()
                 
                 st.markdown("---")
                 col1, col2, col3 = st.columns(3)
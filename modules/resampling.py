@@ -0,0 +1,165 @@
+"""
+Bootstrap et tests de permutation sur des données réelles (sans Streamlit)
+Les données viennent d'un CSV importé ou d'un dataset du Générateur de
+Datasets. Les rééchantillonnages reposent sur des matrices d'indices tirées
+par blocs (voir modules/monte_carlo.py), éventuellement sur plusieurs
+processus.
+
+Les résultats sont mémorisés par (empreinte des données, colonne(s),
+statistique, B, ...) : relancer la même analyse est instantané.
+"""
+
+import hashlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.caching import LRUCache
+from modules.monte_carlo import CHUNK_DRAWS, STATISTICS, bootstrap_distribution, chunk_plan
+from modules.parallel import map_chunks
+
+# Nombre de résultats conservés en mémoire (LRU)
+RESULT_CACHE_SIZE = 64
+
+# Statistiques comparées par les tests de permutation (groupe A - groupe B)
+PERMUTATION_STATISTICS = {
+    "différence de moyennes": "moyenne",
+    "différence de médianes": "médiane",
+    "différence d'écarts-types": "écart-type"
+}
+
+_results = LRUCache(RESULT_CACHE_SIZE)
+
+
+def data_fingerprint(content: bytes) -> str:
+    """Empreinte d'un fichier importé (clé de cache)"""
+    return hashlib.sha256(content).hexdigest()[:32]
+
+
+def clear_cache():
+    """Vide le cache des résultats"""
+    _results.clear()
+
+
+def numeric_columns(df: pd.DataFrame) -> List[str]:
+    """Colonnes utilisables pour le bootstrap"""
+    return df.select_dtypes(include='number').columns.tolist()
+
+
+def group_columns(df: pd.DataFrame, max_levels: int = 20) -> List[str]:
+    """Colonnes pouvant définir deux groupes (au plus max_levels modalités)"""
+    return [col for col in df.columns if 2 <= df[col].nunique() <= max_levels]
+
+
+def _clean(values) -> np.ndarray:
+    values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy(dtype=float)
+    if len(values) < 2:
+        raise ValueError("Il faut au moins 2 valeurs numériques")
+    return values
+
+
+def bootstrap_column(df: pd.DataFrame, fingerprint: str, column: str,
+                     statistic: str = "moyenne", n_boot: int = 10_000,
+                     confidence: float = 0.95, seed: int = 42, workers: int = 1) -> Dict:
+    """
+    Intervalle de confiance bootstrap (percentiles) d'une colonne
+
+    Args:
+        df: Données
+        fingerprint: Empreinte des données (data_fingerprint ou clé de dataset)
+        column: Colonne numérique
+        statistic: Clé de monte_carlo.STATISTICS
+
+    Returns:
+        estimate, lower, upper, se, n, distribution, cached
+    """
+    key = ("bootstrap", fingerprint, column, statistic, n_boot, confidence, seed)
+    result = _results.get(key)
+    if result:
+        return {**result, 'cached': True}
+
+    values = _clean(df[column])
+    distribution = bootstrap_distribution(values, statistic, n_boot, seed=seed, workers=workers)
+    distribution.setflags(write=False)
+    alpha = 1 - confidence
+    lower, upper = np.quantile(distribution, [alpha / 2, 1 - alpha / 2])
+
+    result = _results.put(key, {
+        'estimate': float(STATISTICS[statistic](values)),
+        'lower': float(lower),
+        'upper': float(upper),
+        'se': float(distribution.std(ddof=1)),
+        'n': len(values),
+        'distribution': distribution
+    })
+    return {**result, 'cached': False}
+
+
+def _permutation_chunk(pooled: np.ndarray, n_a: int, statistic: str, rows: int,
+                       seed: int, chunk_index: int) -> np.ndarray:
+    """Statistique de rows permutations : chaque ligne de la matrice d'indices est une permutation"""
+    rng = np.random.default_rng([seed, chunk_index])
+    indices = rng.permuted(np.broadcast_to(np.arange(len(pooled)), (rows, len(pooled))), axis=1)
+    shuffled = pooled[indices]
+    stat = STATISTICS[statistic]
+    return stat(shuffled[:, :n_a]) - stat(shuffled[:, n_a:])
+
+
+def permutation_test(group_a, group_b, statistic: str = "différence de moyennes",
+                     n_permutations: int = 10_000, seed: int = 42, workers: int = 1,
+                     chunk_draws: int = CHUNK_DRAWS) -> Dict:
+    """
+    Test de permutation bilatéral entre deux groupes
+
+    Returns:
+        observed, p_value, n_a, n_b, distribution
+    """
+    if statistic not in PERMUTATION_STATISTICS:
+        raise ValueError(f"Statistique inconnue : {statistic}")
+    group_a, group_b = _clean(group_a), _clean(group_b)
+    base = PERMUTATION_STATISTICS[statistic]
+    observed = float(STATISTICS[base](group_a) - STATISTICS[base](group_b))
+
+    pooled = np.concatenate([group_a, group_b])
+    rows_per_chunk = max(1, chunk_draws // len(pooled))
+    tasks = [(pooled, len(group_a), base, rows, seed, index)
+             for index, rows in chunk_plan(n_permutations, rows_per_chunk)]
+    distribution = np.concatenate(list(map_chunks(_permutation_chunk, tasks, workers)))
+
+    # Correction +1 : la permutation observée fait partie des permutations possibles
+    extreme = np.count_nonzero(np.abs(distribution) >= abs(observed) - 1e-12)
+    return {
+        'observed': observed,
+        'p_value': (extreme + 1) / (n_permutations + 1),
+        'n_a': len(group_a),
+        'n_b': len(group_b),
+        'distribution': distribution
+    }
+
+
+def permutation_test_columns(df: pd.DataFrame, fingerprint: str, column: str,
+                             group_column: str, groups: Tuple[str, str],
+                             statistic: str = "différence de moyennes",
+                             n_permutations: int = 10_000, seed: int = 42,
+                             workers: int = 1) -> Dict:
+    """
+    Test de permutation de column entre deux modalités de group_column
+
+    Returns:
+        Résultat de permutation_test, plus cached
+    """
+    key = ("permutation", fingerprint, column, group_column, tuple(map(str, groups)),
+           statistic, n_permutations, seed)
+    result = _results.get(key)
+    if result:
+        return {**result, 'cached': True}
+
+    labels = df[group_column].astype(str)
+    result = permutation_test(
+        df.loc[labels == str(groups[0]), column], df.loc[labels == str(groups[1]), column],
+        statistic, n_permutations, seed=seed, workers=workers
+    )
+    result['distribution'].setflags(write=False)
+    result = _results.put(key, result)
+    return {**result, 'cached': False}
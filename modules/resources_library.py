@@ -1,10 +1,47 @@
 import streamlit as st
 import json
 from pathlib import Path
+from modules.content_packs import load_pack
+from modules.search_index import KIND_LABELS, search
+
+
+def show_search_result(document):
+    """Affiche un résultat de recherche selon son type"""
+    item = document.item
+    with st.expander(f"{KIND_LABELS[document.kind]} · {document.title}"):
+        if document.kind == 'snippet':
+            st.markdown(f"**Catégorie :** {item['categorie']}")
+            st.code(item['code'], language=item['langage'])
+        elif document.kind == 'question':
+            st.markdown(f"**Catégorie :** {item['categorie']}")
+            st.success(f"**Réponse :** {item['reponse']}")
+            if item.get('conseils'):
+                st.info(f"**Conseil :** {item['conseils']}")
+        elif document.kind == 'dataset':
+            st.markdown(f"**Description :** {item['description']}")
+            st.markdown(f"**Use case :** {item['use_case']}")
+            st.code(item['code'], language='python')
+        else:
+            st.markdown(f"**Description :** {item['description']}")
+            st.markdown(f"🔗 [Ouvrir]({item['url']})")
+
 
 st.title("🔗 Bibliothèque de Ressources")
 st.markdown("**Tutoriels, datasets et documentation pour Data Science**")
 
+resources = load_pack("resources")
+
+query = st.text_input("🔎 Rechercher", placeholder="Ex: read_csv, jointure SQL, p-value, régression...")
+if query:
+    results = search(query, limit=10)
+    if results:
+        st.caption(f"{len(results)} résultat(s) parmi les snippets, tutoriels, datasets, documentations et questions d'entretien")
+        for document, _ in results:
+            show_search_result(document)
+    else:
+        st.info("Aucun résultat pour cette recherche")
+    st.markdown("---")
+
 tab1, tab2, tab3, tab4 = st.tabs(["📖 Tutoriels", "📊 Datasets", "📚 Documentation", "🎥 Vidéos"])
 
 with tab1:
@@ -16,50 +53,7 @@ with tab1:
         horizontal=True
     )
     
-    tutorials = [
-        {
-            "titre": "Python pour la Data Science - Guide Complet",
-            "categorie": "Python",
-            "niveau": "Débutant",
-            "url": "https://www.python.org/about/gettingstarted/",
-            "description": "Introduction complète à Python avec focus Data Science"
-        },
-        {
-            "titre": "Pandas - 10 minutes to pandas",
-            "categorie": "Data Analysis",
-            "niveau": "Débutant",
-            "url": "https://pandas.pydata.org/docs/user_guide/10min.html",
-            "description": "Guide rapide officiel de Pandas"
-        },
-        {
-            "titre": "Scikit-learn Tutorial",
-            "categorie": "Machine Learning",
-            "niveau": "Intermédiaire",
-            "url": "https://scikit-learn.org/stable/tutorial/index.html",
-            "description": "Tutoriel officiel de scikit-learn pour le ML"
-        },
-        {
-            "titre": "Plotly Express Guide",
-            "categorie": "Visualisation",
-            "niveau": "Débutant",
-            "url": "https://plotly.com/python/plotly-express/",
-            "description": "Créer des visualisations interactives rapidement"
-        },
-        {
-            "titre": "SQL Tutorial",
-            "categorie": "SQL",
-            "niveau": "Débutant",
-            "url": "https://www.w3schools.com/sql/",
-            "description": "Apprenez SQL de A à Z"
-        },
-        {
-            "titre": "Kaggle Learn",
-            "categorie": "Machine Learning",
-            "niveau": "Tous",
-            "url": "https://www.kaggle.com/learn",
-            "description": "Micro-cours gratuits sur divers sujets de Data Science"
-        }
-    ]
+    tutorials = resources['tutorials']
     
     filtered = tutorials if categories == "Tous" else [t for t in tutorials if t['categorie'] == categories]
     
@@ -78,77 +72,7 @@ with tab2:
         ["Tous", "E-commerce", "Finance", "Santé", "Marketing", "Général"]
     )
     
-    datasets = [
-        {
-            "nom": "Iris Dataset",
-            "domaine": "Général",
-            "description": "Dataset classique de classification (150 fleurs, 4 features)",
-            "use_case": "Classification, clustering",
-            "source": "Scikit-learn",
-            "code": """
-from sklearn.datasets import load_iris
-import pandas as pd
-
-iris = load_iris()
-df = pd.DataFrame(iris.data, columns=iris.feature_names)
-df['species'] = iris.target
-            """
-        },
-        {
-            "nom": "Titanic Dataset",
-            "domaine": "Général",
-            "description": "Prédire la survie des passagers du Titanic",
-            "use_case": "Classification binaire, feature engineering",
-            "source": "Kaggle",
-            "code": """
-import pandas as pd
-
-url = 'https://raw.githubusercontent.com/datasciencedojo/datasets/master/titanic.csv'
-df = pd.read_csv(url)
-            """
-        },
-        {
-            "nom": "Online Retail Dataset",
-            "domaine": "E-commerce",
-            "description": "Transactions e-commerce (500K+ lignes)",
-            "use_case": "RFM analysis, market basket analysis",
-            "source": "UCI ML Repository",
-            "code": """
-import pandas as pd
-
-url = 'https://archive.ics.uci.edu/ml/machine-learning-databases/00352/Online%20Retail.xlsx'
-df = pd.read_excel(url)
-            """
-        },
-        {
-            "nom": "California Housing",
-            "domaine": "Finance",
-            "description": "Prix des maisons en Californie",
-            "use_case": "Régression, feature engineering",
-            "source": "Scikit-learn",
-            "code": """
-from sklearn.datasets import fetch_california_housing
-import pandas as pd
-
-housing = fetch_california_housing()
-df = pd.DataFrame(housing.data, columns=housing.feature_names)
-df['price'] = housing.target
-            """
-        },
-        {
-            "nom": "Advertising Dataset",
-            "domaine": "Marketing",
-            "description": "Budget publicitaire vs ventes",
-            "use_case": "Régression linéaire, analyse marketing",
-            "source": "Public",
-            "code": """
-import pandas as pd
-
-url = 'https://www.statlearning.com/s/Advertising.csv'
-df = pd.read_csv(url)
-            """
-        }
-    ]
+    datasets = resources['datasets']
     
     filtered_datasets = datasets if domaine == "Tous" else [d for d in datasets if d['domaine'] == domaine]
     
@@ -163,68 +87,7 @@ df = pd.read_csv(url)
 with tab3:
     st.header("📚 Documentation Officielle")
     
-    docs = [
-        {
-            "nom": "Python",
-            "logo": "🐍",
-            "url": "https://docs.python.org/3/",
-            "description": "Documentation officielle Python"
-        },
-        {
-            "nom": "Pandas",
-            "logo": "🐼",
-            "url": "https://pandas.pydata.org/docs/",
-            "description": "Manipulation et analyse de données"
-        },
-        {
-            "nom": "NumPy",
-            "logo": "🔢",
-            "url": "https://numpy.org/doc/",
-            "description": "Calcul scientifique et tableaux multidimensionnels"
-        },
-        {
-            "nom": "Matplotlib",
-            "logo": "📊",
-            "url": "https://matplotlib.org/stable/contents.html",
-            "description": "Visualisation de données"
-        },
-        {
-            "nom": "Seaborn",
-            "logo": "🎨",
-            "url": "https://seaborn.pydata.org/",
-            "description": "Visualisation statistique"
-        },
-        {
-            "nom": "Plotly",
-            "logo": "📈",
-            "url": "https://plotly.com/python/",
-            "description": "Graphiques interactifs"
-        },
-        {
-            "nom": "Scikit-learn",
-            "logo": "🤖",
-            "url": "https://scikit-learn.org/stable/",
-            "description": "Machine Learning"
-        },
-        {
-            "nom": "TensorFlow",
-            "logo": "🧠",
-            "url": "https://www.tensorflow.org/api_docs",
-            "description": "Deep Learning"
-        },
-        {
-            "nom": "Streamlit",
-            "logo": "🚀",
-            "url": "https://docs.streamlit.io/",
-            "description": "Applications web pour Data Science"
-        },
-        {
-            "nom": "SQL",
-            "logo": "🗄️",
-            "url": "https://www.postgresql.org/docs/",
-            "description": "PostgreSQL Documentation"
-        }
-    ]
+    docs = resources['docs']
     
     col1, col2 = st.columns(2)
     
@@ -243,44 +106,7 @@ with tab3:
 with tab4:
     st.header("🎥 Chaînes YouTube Recommandées")
     
-    channels = [
-        {
-            "nom": "StatQuest with Josh Starmer",
-            "description": "Statistiques et ML expliqués simplement",
-            "url": "https://www.youtube.com/@statquest",
-            "focus": "Stats, ML, Concepts"
-        },
-        {
-            "nom": "3Blue1Brown",
-            "description": "Mathématiques visuelles et intuitives",
-            "url": "https://www.youtube.com/@3blue1brown",
-            "focus": "Maths, Algèbre linéaire, NN"
-        },
-        {
-            "nom": "Sentdex",
-            "description": "Python et Machine Learning pratique",
-            "url": "https://www.youtube.com/@sentdex",
-            "focus": "Python, ML, Trading"
-        },
-        {
-            "nom": "Krish Naik",
-            "description": "Data Science et ML de A à Z",
-            "url": "https://www.youtube.com/@krishnaik06",
-            "focus": "DS, ML, Projets"
-        },
-        {
-            "nom": "Ken Jee",
-            "description": "Carrière en Data Science",
-            "url": "https://www.youtube.com/@KenJee_ds",
-            "focus": "Projets, Portfolio, Conseils"
-        },
-        {
-            "nom": "Corey Schafer",
-            "description": "Tutoriels Python de qualité",
-            "url": "https://www.youtube.com/@coreyms",
-            "focus": "Python, Web, Best practices"
-        }
-    ]
+    channels = resources['channels']
     
     for channel in channels:
         with st.expander(f"🎬 {channel['nom']}"):
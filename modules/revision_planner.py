@@ -1,14 +1,43 @@
 import streamlit as st
 import pandas as pd
+import time
 from datetime import datetime
-import random
 from modules.database import (
-    create_flashcard, get_flashcards, update_flashcard_review,
-    get_flashcards_by_matiere
+    create_flashcard, create_flashcards_bulk, record_flashcard_reviews,
+    get_due_flashcards, get_flashcard_matieres, get_flashcard_stats, timestamp
 )
+from modules.spaced_repetition import schedule
+from modules.content_packs import load_pack
 
 DB_AVAILABLE = True
 
+# Nombre maximal de cartes par session de révision
+SESSION_SIZE = 20
+
+# Les révisions sont mises en tampon puis écrites en une transaction : toutes les
+# FLUSH_EVERY cartes, en fin de session (dernière carte, nouvelle session, changement
+# de matière) et dès qu'un rerun de la page survient FLUSH_INTERVAL secondes après
+# la dernière écriture. Ce délai n'est pas un minuteur : si l'onglet est fermé en
+# cours de session, les révisions encore en tampon (au plus FLUSH_EVERY - 1) sont perdues.
+FLUSH_EVERY = 10
+FLUSH_INTERVAL = 60
+
+
+def flush_reviews():
+    """Écrit les révisions en attente dans la base"""
+    pending = st.session_state.get('pending_reviews')
+    if pending:
+        record_flashcard_reviews(pending)
+        st.session_state.pending_reviews = []
+    st.session_state.last_flush = time.time()
+
+
+# Vérifié à chaque rerun (toute interaction), pas seulement à la réponse suivante
+if (st.session_state.get('pending_reviews')
+        and time.time() - st.session_state.get('last_flush', 0) >= FLUSH_INTERVAL):
+    flush_reviews()
+
+
 st.title("📚 Planificateur de Révisions")
 st.markdown("**Système de répétition espacée pour optimiser votre apprentissage**")
 
@@ -17,33 +46,55 @@ tab1, tab2, tab3, tab4 = st.tabs(["🎴 Réviser", "➕ Créer Flashcards", "
 with tab1:
     st.header("🎴 Session de Révision")
     
-    flashcards = get_flashcards()
+    matieres = get_flashcard_matieres()
     
-    if not flashcards:
+    if not matieres:
         st.info("Aucune flashcard disponible. Créez-en dans l'onglet 'Créer Flashcards' !")
     else:
-        matieres = list(set([fc['matiere'] for fc in flashcards]))
         matiere_filter = st.selectbox("Choisir la matière", ["Toutes"] + matieres)
         
-        if matiere_filter == "Toutes":
-            cards_to_review = flashcards
-        else:
-            cards_to_review = get_flashcards_by_matiere(matiere_filter)
+        # Nouvelle session : seules les prochaines cartes échues sont chargées
+        session_key = matiere_filter
+        if st.session_state.get('review_session_key') != session_key:
+            flush_reviews()
+            st.session_state.review_session_key = session_key
+            st.session_state.current_card_index = 0
+            st.session_state.cards_to_review = get_due_flashcards(
+                limit=SESSION_SIZE,
+                matiere=None if matiere_filter == "Toutes" else matiere_filter
+            )
+            st.session_state.show_answer = False
+        
+        cards_to_review = st.session_state.cards_to_review
+        
+        def review_card(card, difficulte):
+            """Met la réponse en tampon, replanifie la carte et passe à la suivante"""
+            st.session_state.setdefault('pending_reviews', []).append({
+                'id': card['id'],
+                'user_id': card['user_id'],
+                'matiere': card['matiere'],
+                'difficulte': difficulte,
+                'reviewed_at': timestamp(),
+                **schedule(card, difficulte)
+            })
+            st.session_state.current_card_index += 1
+            if (len(st.session_state.pending_reviews) >= FLUSH_EVERY
+                    or st.session_state.current_card_index == len(cards_to_review)
+                    or time.time() - st.session_state.get('last_flush', 0) >= FLUSH_INTERVAL):
+                flush_reviews()
+            st.session_state.show_answer = False
+            st.rerun()
         
-        if cards_to_review:
+        if not cards_to_review:
+            st.success("🎉 Aucune carte à réviser pour le moment, revenez plus tard !")
+        else:
             st.info(f"📚 {len(cards_to_review)} flashcards à réviser")
             
-            if 'current_card_index' not in st.session_state:
-                st.session_state.current_card_index = 0
-                random.shuffle(cards_to_review)
-                st.session_state.cards_to_review = cards_to_review
-                st.session_state.show_answer = False
-            
-            if st.session_state.current_card_index < len(st.session_state.cards_to_review):
-                current_card = st.session_state.cards_to_review[st.session_state.current_card_index]
+            if st.session_state.current_card_index < len(cards_to_review):
+                current_card = cards_to_review[st.session_state.current_card_index]
                 
-                st.progress((st.session_state.current_card_index + 1) / len(st.session_state.cards_to_review))
-                st.caption(f"Carte {st.session_state.current_card_index + 1} / {len(st.session_state.cards_to_review)}")
+                st.progress((st.session_state.current_card_index + 1) / len(cards_to_review))
+                st.caption(f"Carte {st.session_state.current_card_index + 1} / {len(cards_to_review)}")
                 
                 st.markdown(f"### 📌 {current_card['matiere']}")
                 
@@ -70,29 +121,22 @@ with tab1:
                     
                     with col1:
                         if st.button("❌ Difficile", use_container_width=True):
-                            update_flashcard_review(current_card['id'], 'difficile')
-                            st.session_state.current_card_index += 1
-                            st.session_state.show_answer = False
-                            st.rerun()
+                            review_card(current_card, 'difficile')
                     
                     with col2:
                         if st.button("🟡 Moyen", use_container_width=True):
-                            update_flashcard_review(current_card['id'], 'moyen')
-                            st.session_state.current_card_index += 1
-                            st.session_state.show_answer = False
-                            st.rerun()
+                            review_card(current_card, 'moyen')
                     
                     with col3:
                         if st.button("✅ Facile", use_container_width=True):
-                            update_flashcard_review(current_card['id'], 'facile')
-                            st.session_state.current_card_index += 1
-                            st.session_state.show_answer = False
-                            st.rerun()
+                            review_card(current_card, 'facile')
             else:
                 st.success("🎉 Session terminée ! Bravo !")
-                if st.button("🔄 Recommencer"):
-                    st.session_state.current_card_index = 0
-                    st.rerun()
+        
+        if st.button("🔄 Nouvelle session"):
+            flush_reviews()
+            st.session_state.review_session_key = None
+            st.rerun()
 
 with tab2:
     st.header("➕ Créer des Flashcards")
@@ -127,8 +171,10 @@ with tab2:
             }
             
             try:
-                create_flashcard(flashcard)
-                st.success("✅ Flashcard créée avec succès !")
+                if create_flashcard(flashcard):
+                    st.success("✅ Flashcard créée avec succès !")
+                else:
+                    st.warning("⚠️ Cette question existe déjà pour cette matière")
             except Exception as e:
                 st.error(f"❌ Erreur : {e}")
         else:
@@ -137,37 +183,43 @@ with tab2:
 with tab3:
     st.header("📊 Suivi de Progression")
     
-    flashcards = get_flashcards()
+    stats = get_flashcard_stats()
     
-    if not flashcards:
+    if not stats['total']:
         st.info("Aucune donnée de progression pour le moment")
     else:
+        import plotly.express as px
+        
         col1, col2, col3, col4 = st.columns(4)
         
-        total = len(flashcards)
-        revues = len([fc for fc in flashcards if fc.get('dernier_revu')])
-        faciles = len([fc for fc in flashcards if fc.get('difficulte') == 'facile'])
-        difficiles = len([fc for fc in flashcards if fc.get('difficulte') == 'difficile'])
+        col1.metric("Total Flashcards", stats['total'])
+        col2.metric("Déjà révisées", stats['revues'])
+        col3.metric("Maîtrisées", stats['faciles'])
+        col4.metric("À retravailler", stats['difficiles'])
         
-        col1.metric("Total Flashcards", total)
-        col2.metric("Déjà révisées", revues)
-        col3.metric("Maîtrisées", faciles)
-        col4.metric("À retravailler", difficiles)
+        st.caption(f"🕒 {stats['dues']} carte(s) à réviser maintenant")
         
         st.markdown("---")
         
-        matiere_counts = pd.DataFrame([
-            {'Matière': fc['matiere'], 'Count': 1} 
-            for fc in flashcards
-        ]).groupby('Matière').count().reset_index()
+        matiere_counts = pd.DataFrame(stats['par_matiere']).rename(
+            columns={'matiere': 'Matière', 'total': 'Count'}
+        )
+        fig = px.bar(matiere_counts, x='Matière', y='Count', 
+                    title='Répartition des flashcards par matière')
+        st.plotly_chart(fig, use_container_width=True)
         
-        if not matiere_counts.empty:
-            import plotly.express as px
-            fig = px.bar(matiere_counts, x='Matière', y='Count', 
-                        title='Répartition des flashcards par matière')
-            st.plotly_chart(fig, use_container_width=True)
+        difficulty_counts = pd.DataFrame(
+            list(stats['par_difficulte'].items()), columns=['Difficulté', 'Cartes']
+        )
+        fig = px.pie(difficulty_counts, names='Difficulté', values='Cartes',
+                    title='Dernière évaluation des flashcards')
+        st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("### 📅 Calendrier de révision")
+        if stats['par_jour']:
+            daily = pd.DataFrame(stats['par_jour']).rename(columns={'jour': 'Jour', 'revues': 'Révisions'})
+            fig = px.bar(daily, x='Jour', y='Révisions', title='Révisions par jour (30 derniers jours)')
+            st.plotly_chart(fig, use_container_width=True)
         st.info("💡 Astuce : Révisez régulièrement pour maximiser la rétention !")
 
 with tab4:
@@ -175,69 +227,7 @@ with tab4:
     
     st.markdown("**Importez des sets de flashcards prêts à l'emploi**")
     
-    predefined_sets = {
-        "Statistiques - Formules de base": [
-            {
-                "question": "Formule de la moyenne",
-                "reponse": "x̄ = (1/n) × Σxᵢ",
-                "explication": "Somme de toutes les valeurs divisée par le nombre de valeurs"
-            },
-            {
-                "question": "Formule de la variance",
-                "reponse": "s² = (1/(n-1)) × Σ(xᵢ - x̄)²",
-                "explication": "Mesure la dispersion des données autour de la moyenne"
-            },
-            {
-                "question": "Formule de l'écart-type",
-                "reponse": "s = √(variance)",
-                "explication": "Racine carrée de la variance, même unité que les données"
-            },
-            {
-                "question": "Coefficient de corrélation de Pearson",
-                "reponse": "r = Cov(X,Y) / (σₓ × σᵧ)",
-                "explication": "Mesure la force de la relation linéaire entre deux variables"
-            }
-        ],
-        "Python - Pandas": [
-            {
-                "question": "Comment lire un fichier CSV ?",
-                "reponse": "df = pd.read_csv('fichier.csv')",
-                "explication": "Charge les données dans un DataFrame"
-            },
-            {
-                "question": "Comment afficher les 5 premières lignes ?",
-                "reponse": "df.head()",
-                "explication": "Par défaut affiche 5 lignes, peut être modifié avec head(n)"
-            },
-            {
-                "question": "Comment filtrer les lignes ?",
-                "reponse": "df[df['colonne'] > valeur]",
-                "explication": "Utilise une condition booléenne pour filtrer"
-            },
-            {
-                "question": "Comment grouper et agréger ?",
-                "reponse": "df.groupby('col')['val'].sum()",
-                "explication": "Groupe par une colonne et applique une fonction d'agrégation"
-            }
-        ],
-        "Machine Learning - Concepts": [
-            {
-                "question": "Qu'est-ce que l'overfitting ?",
-                "reponse": "Modèle qui apprend trop bien les données d'entraînement et généralise mal",
-                "explication": "Le modèle mémorise le bruit au lieu d'apprendre les patterns"
-            },
-            {
-                "question": "Différence entre classification et régression ?",
-                "reponse": "Classification: prédire une catégorie. Régression: prédire une valeur numérique",
-                "explication": "Classification = sortie discrète, Régression = sortie continue"
-            },
-            {
-                "question": "À quoi sert la validation croisée ?",
-                "reponse": "Évaluer la performance du modèle de manière robuste en utilisant plusieurs splits",
-                "explication": "Réduit le biais lié au choix du split train/test"
-            }
-        ]
-    }
+    predefined_sets = load_pack("flashcard_sets")['sets']
     
     for set_name, cards in predefined_sets.items():
         with st.expander(f"📦 {set_name} ({len(cards)} cartes)"):
@@ -248,15 +238,12 @@ with tab4:
                 st.markdown("---")
             
             if st.button(f"📥 Importer ce set", key=f"import_{set_name}"):
-                for card in cards:
-                    flashcard = {
-                        'matiere': set_name.split(' - ')[0],
-                        'question': card['question'],
-                        'reponse': card['reponse'],
-                        'explication': card['explication'],
-                        'student_id': None,
-                        'difficulte': None
-                    }
-                    create_flashcard(flashcard)
+                matiere_set = set_name.split(' - ')[0]
+                imported = create_flashcards_bulk([
+                    {**card, 'matiere': matiere_set} for card in cards
+                ])
                 
-                st.success(f"✅ {len(cards)} flashcards importées !")
+                if imported:
+                    st.success(f"✅ {imported} flashcards importées !")
+                if imported < len(cards):
+                    st.info(f"ℹ️ {len(cards) - imported} flashcards déjà présentes ignorées")
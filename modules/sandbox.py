@@ -0,0 +1,280 @@
+"""
+Isolation d'un processus par les espaces de noms Linux (sans Streamlit)
+Utilisé par modules/code_runner pour exécuter le code des étudiants.
+
+isolate() place le processus appelant dans de nouveaux espaces de noms
+(utilisateurs, montages, PID, réseau, IPC) puis remplace sa racine par un
+système de fichiers minimal : Python, ses bibliothèques et les répertoires
+système en lecture seule, /tmp vide et /dev réduit à quelques fichiers.
+Le dépôt de l'application (base de données, configuration, clés d'API)
+n'y existe pas, le réseau est coupé et les processus du serveur sont
+invisibles. L'espace de noms utilisateur rend tout cela possible sans
+privilèges : le serveur n'a pas besoin d'être lancé en root.
+
+drop_privileges(), à appeler dans le premier processus fils créé après
+isolate(), retire toutes les capacités et ne garde de l'environnement que
+ENV_ALLOWLIST. Lancé en root, le serveur n'utilise pas d'espace de noms
+utilisateur et le processus passe sous SANDBOX_USER (« nobody » par défaut).
+
+AVAILABLE vaut False si le noyau ou la plateforme ne le permettent pas
+(autre système que Linux, espaces de noms utilisateur désactivés...).
+"""
+
+import ctypes
+import os
+import platform
+import signal
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import pwd
+except ImportError:
+    pwd = None
+
+# Utilisateur sans privilèges utilisé quand le serveur tourne en root
+SANDBOX_USER = os.environ.get("CODE_RUNNER_USER", "nobody")
+
+# Variables d'environnement transmises au code isolé (les autres, dont les clés d'API, sont supprimées)
+ENV_ALLOWLIST = ("LANG",)
+SANDBOX_PATH = "/usr/local/bin:/usr/bin:/bin"
+
+# Répertoires système montés en lecture seule (en plus de l'installation Python)
+SYSTEM_DIRS = ("/usr", "/bin", "/lib", "/lib32", "/lib64")
+DEVICES = ("/dev/null", "/dev/zero", "/dev/random", "/dev/urandom")
+
+# Taille maximale de /tmp, seul répertoire accessible en écriture
+TMP_SIZE_MB = 64
+
+# Répertoires du serveur qui ne doivent jamais apparaître dans la racine isolée
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+CLONE_NEWNS = 0x00020000
+CLONE_NEWIPC = 0x08000000
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWPID = 0x20000000
+CLONE_NEWNET = 0x40000000
+
+MS_RDONLY = 1
+MS_NOSUID = 2
+MS_NODEV = 4
+MS_NOEXEC = 8
+MS_REMOUNT = 32
+MS_NOATIME = 1024
+MS_NODIRATIME = 2048
+MS_BIND = 4096
+MS_REC = 16384
+MS_PRIVATE = 1 << 18
+MS_RELATIME = 1 << 21
+MNT_DETACH = 2
+
+PR_SET_PDEATHSIG = 1
+PR_SET_NO_NEW_PRIVS = 38
+CAPABILITY_VERSION_3 = 0x20080522
+
+# Numéro de l'appel système pivot_root (sans fonction dans la libc)
+SYS_PIVOT_ROOT = {"x86_64": 155, "aarch64": 41}.get(platform.machine())
+
+
+class _CapHeader(ctypes.Structure):
+    _fields_ = [("version", ctypes.c_uint32), ("pid", ctypes.c_int)]
+
+
+class _CapData(ctypes.Structure):
+    _fields_ = [("effective", ctypes.c_uint32), ("permitted", ctypes.c_uint32),
+                ("inheritable", ctypes.c_uint32)]
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux") or SYS_PIVOT_ROOT is None:
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.mount.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_char_p]
+        libc.umount2.argtypes = [ctypes.c_char_p, ctypes.c_int]
+        libc.unshare.argtypes = [ctypes.c_int]
+        libc.prctl.argtypes = [ctypes.c_int, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong]
+        libc.capset.argtypes = [ctypes.POINTER(_CapHeader), ctypes.POINTER(_CapData)]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+def _check(result: int, what: str):
+    if result != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"{what} : {os.strerror(errno)}")
+
+
+def _mount(source: Optional[str], target: str, fstype: Optional[str], flags: int, data: str = None):
+    encode = lambda value: value.encode() if value is not None else None
+    _check(_libc.mount(encode(source), encode(target), encode(fstype), flags, encode(data)),
+           f"mount {target}")
+
+
+def _sandbox_ids() -> Optional[Tuple[int, int]]:
+    """(uid, gid) de SANDBOX_USER, pour un serveur lancé en root"""
+    if pwd is None:
+        return None
+    try:
+        entry = pwd.getpwnam(SANDBOX_USER)
+    except KeyError:
+        return None
+    return (entry.pw_uid, entry.pw_gid) if entry.pw_uid != 0 else None
+
+
+def _is_within(path: str, parent: str) -> bool:
+    return path == parent or path.startswith(parent.rstrip("/") + "/")
+
+
+def _hidden_paths() -> List[str]:
+    return sorted({str(PROJECT_ROOT), os.path.abspath(os.getcwd())} - {"/"})
+
+
+def _readonly_paths() -> List[str]:
+    """Répertoires à monter : système, installation Python et sys.path (hors dépôt), sans doublon"""
+    candidates = [*SYSTEM_DIRS, sys.prefix, sys.base_prefix, sys.exec_prefix,
+                  *(entry for entry in sys.path if entry and os.path.isdir(entry))]
+    hidden = _hidden_paths()
+    paths = []
+    for path in sorted({os.path.abspath(candidate) for candidate in candidates}):
+        if os.path.lexists(path) and path not in hidden and not any(_is_within(path, kept) for kept in paths):
+            paths.append(path)
+    return paths
+
+
+def _bind_readonly(source: str, target: str):
+    """Montage lié en lecture seule (en conservant les options verrouillées de l'original)"""
+    _mount(source, target, None, MS_BIND | MS_REC)
+    f_flag = os.statvfs(source).f_flag
+    kept = f_flag & (MS_NOSUID | MS_NODEV | MS_NOEXEC | MS_NOATIME | MS_NODIRATIME)
+    if f_flag & os.ST_RELATIME:
+        kept |= MS_RELATIME
+    _mount(None, target, None, MS_BIND | MS_REMOUNT | MS_RDONLY | MS_NOSUID | kept)
+
+
+def _mount_point(root: str, path: str, is_file: bool = False) -> str:
+    target = root + path
+    if is_file:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        open(target, "a").close()
+    else:
+        os.makedirs(target, exist_ok=True)
+    return target
+
+
+def _build_root(root: str):
+    """Système de fichiers minimal monté sur root (un tmpfs propre à l'espace de noms)"""
+    _mount("tmpfs", root, "tmpfs", MS_NOSUID | MS_NODEV, "size=1m,mode=755")
+    hidden = _hidden_paths()
+
+    def bind(path: str):
+        if os.path.islink(path):
+            os.makedirs(os.path.dirname(root + path), exist_ok=True)
+            os.symlink(os.readlink(path), root + path)
+        else:
+            _bind_readonly(path, _mount_point(root, path))
+
+    # Les répertoires du serveur situés sous un répertoire monté (ex. /usr/src/app)
+    # sont recouverts par un tmpfs vide ; ce qui est listé à l'intérieur est remonté ensuite
+    paths = _readonly_paths()
+    inner = [path for path in paths if any(_is_within(path, h) for h in hidden)]
+    for path in paths:
+        if path not in inner:
+            bind(path)
+    for path in hidden:
+        if os.path.lexists(root + path):
+            _mount("tmpfs", root + path, "tmpfs", MS_NOSUID | MS_NODEV, "size=1m,mode=755")
+    for path in inner:
+        bind(path)
+
+    for device in DEVICES:
+        if os.path.exists(device):
+            _mount(device, _mount_point(root, device, is_file=True), None, MS_BIND)
+    _mount("tmpfs", _mount_point(root, "/tmp"), "tmpfs", MS_NOSUID | MS_NODEV,
+           f"size={TMP_SIZE_MB}m,mode=1777")
+    _mount(None, root, None, MS_REMOUNT | MS_RDONLY | MS_NOSUID | MS_NODEV)
+
+
+def _write(path: str, text: str):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _unshare() -> bool:
+    """Nouveaux espaces de noms ; renvoie True si un espace de noms utilisateur a été créé"""
+    use_userns = os.geteuid() != 0
+    uid, gid = os.getuid(), os.getgid()
+    flags = CLONE_NEWNS | CLONE_NEWPID | CLONE_NEWNET | CLONE_NEWIPC
+    _check(_libc.unshare(flags | (CLONE_NEWUSER if use_userns else 0)), "unshare")
+    if use_userns:
+        # Même identité qu'à l'extérieur : aucun autre utilisateur n'existe dans l'espace de noms
+        _write("/proc/self/setgroups", "deny")
+        _write("/proc/self/uid_map", f"{uid} {uid} 1")
+        _write("/proc/self/gid_map", f"{gid} {gid} 1")
+    # Aucun montage ne doit se propager vers le système hôte
+    _mount(None, "/", None, MS_REC | MS_PRIVATE)
+    return use_userns
+
+
+def isolate(root: str):
+    """
+    Isole le processus appelant et fait de root (répertoire vide) sa nouvelle racine
+
+    L'espace de PID ne s'applique qu'aux processus créés ensuite : le code
+    doit tourner dans un fils (os.fork) qui appelle drop_privileges().
+    """
+    if not AVAILABLE:
+        raise OSError("Isolation par espaces de noms indisponible sur ce serveur")
+    _unshare()
+    _build_root(root)
+    os.chdir(root)
+    _check(_libc.syscall(SYS_PIVOT_ROOT, b".", b"."), "pivot_root")
+    # L'ancienne racine, empilée sous la nouvelle, est détachée : elle n'est plus accessible
+    _check(_libc.umount2(b".", MNT_DETACH), "umount")
+    os.chdir("/tmp")
+
+
+def reset_environment():
+    """Ne garde que les variables de ENV_ALLOWLIST (plus PATH, HOME et TMPDIR)"""
+    kept = {name: os.environ[name] for name in ENV_ALLOWLIST if name in os.environ}
+    os.environ.clear()
+    os.environ.update(kept, PATH=SANDBOX_PATH, HOME="/tmp", TMPDIR="/tmp")
+
+
+def drop_privileges():
+    """Retire définitivement toute capacité au processus (fils d'un processus isolé)"""
+    _check(_libc.prctl(PR_SET_PDEATHSIG, signal.SIGKILL, 0, 0, 0), "prctl")
+    if os.geteuid() == 0:
+        uid, gid = SANDBOX_IDS
+        os.setgroups([])
+        os.setgid(gid)
+        os.setuid(uid)
+    else:
+        header = _CapHeader(CAPABILITY_VERSION_3, 0)
+        _check(_libc.capset(ctypes.byref(header), (_CapData * 2)()), "capset")
+    _check(_libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0), "prctl")
+    reset_environment()
+
+
+def _probe() -> bool:
+    """Vérifie dans un processus jetable que le noyau autorise les espaces de noms"""
+    if _libc is None or not hasattr(os, "fork") or (os.geteuid() == 0 and SANDBOX_IDS is None):
+        return False
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _unshare()
+        except BaseException:
+            os._exit(1)
+        os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    return os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+SANDBOX_IDS = _sandbox_ids()
+AVAILABLE = _probe()
@@ -0,0 +1,195 @@
+"""
+Recherche plein texte dans les contenus statiques (sans Streamlit)
+Snippets de code, tutoriels, datasets, liens de documentation et questions
+d'entretien sont découpés en mots (titre, description, code) puis rangés
+dans un index inversé. Le score BM25 de chaque couple (mot, document) est
+calculé à la construction : une requête se réduit à additionner quelques
+listes de postings, soit bien moins d'une milliseconde.
+
+L'index est construit une seule fois par processus (get_index) et partagé
+entre toutes les sessions et tous les reruns.
+"""
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import lru_cache
+from math import log
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from modules.content_packs import load_pack
+
+# Paramètres BM25
+K1 = 1.5
+B = 0.75
+
+# Poids des champs : un mot du titre compte trois fois
+FIELD_WEIGHTS = {'title': 3.0, 'body': 1.0, 'code': 1.0}
+
+# Nombre maximal de mots de l'index complétant un préfixe (recherche au fil de la frappe)
+PREFIX_EXPANSIONS = 10
+
+KIND_LABELS = {
+    'snippet': "💻 Snippet",
+    'tutoriel': "📘 Tutoriel",
+    'dataset': "📊 Dataset",
+    'documentation': "📚 Documentation",
+    'question': "🎤 Question d'entretien"
+}
+
+STOPWORDS = frozenset("""
+au aux avec ce ces dans de des du en et la le les leur lui ma mais me mes
+un une ou par pas pour qu que qui sa se ses son sur ta te tes ton tu vos
+votre est sont il elle ils on nous vous plus comme the and of to in for is
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:_[a-z0-9]+)*")
+
+
+def _fold(text: str) -> str:
+    """Minuscules sans accents (« Données » -> « donnees »)"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _stem(word: str) -> str:
+    """Racinisation minimale : pluriels en -s / -x"""
+    return word[:-1] if len(word) > 3 and word[-1] in 'sx' else word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Mots indexables d'un texte ou d'un code
+
+    Les identifiants composés sont gardés entiers et découpés
+    (read_csv -> read_csv, read, csv) ; les mots vides et les mots
+    d'une lettre sont ignorés.
+    """
+    tokens = []
+    for word in TOKEN_RE.findall(_fold(text or '')):
+        parts = [word] + word.split('_') if '_' in word else [word]
+        tokens.extend(_stem(part) for part in parts if len(part) > 1 and part not in STOPWORDS)
+    return tokens
+
+
+class Document(NamedTuple):
+    """Élément indexé ; item est l'entrée d'origine du pack de contenu"""
+    kind: str
+    title: str
+    body: str
+    code: str
+    item: Dict
+
+
+class SearchIndex:
+    """Index inversé avec scores BM25 précalculés"""
+
+    def __init__(self, documents: List[Document], k1: float = K1, b: float = B):
+        self.documents = documents
+        frequencies = defaultdict(list)
+        lengths = []
+
+        for doc_id, document in enumerate(documents):
+            counts = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(getattr(document, field)):
+                    counts[token] += weight
+            lengths.append(sum(counts.values()))
+            for token, frequency in counts.items():
+                frequencies[token].append((doc_id, frequency))
+
+        average = (sum(lengths) / len(lengths)) if lengths else 1.0
+        total = len(documents)
+        self.postings = {}
+        for token, entries in frequencies.items():
+            idf = log(1 + (total - len(entries) + 0.5) / (len(entries) + 0.5))
+            self.postings[token] = tuple(
+                (doc_id, idf * frequency * (k1 + 1)
+                 / (frequency + k1 * (1 - b + b * lengths[doc_id] / average)))
+                for doc_id, frequency in entries
+            )
+        self.vocabulary = sorted(self.postings)
+
+    def _terms(self, token: str) -> List[str]:
+        """Le mot lui-même s'il est indexé, sinon les mots qui le complètent"""
+        if token in self.postings:
+            return [token]
+        start = bisect_left(self.vocabulary, token)
+        terms = []
+        for term in self.vocabulary[start:start + PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query: str, limit: int = 10,
+               kinds: Optional[Iterable[str]] = None) -> List[Tuple[Document, float]]:
+        """
+        Documents les plus pertinents pour une requête
+
+        Args:
+            query: Texte libre
+            limit: Nombre maximal de résultats
+            kinds: Types de documents retenus (clés de KIND_LABELS), tous si None
+
+        Returns:
+            Liste (document, score) par score décroissant
+        """
+        kinds = set(kinds) if kinds is not None else None
+        scores = defaultdict(float)
+        for token in set(tokenize(query)):
+            for term in self._terms(token):
+                for doc_id, score in self.postings[term]:
+                    scores[doc_id] += score
+
+        if kinds is not None:
+            scores = {doc_id: score for doc_id, score in scores.items()
+                      if self.documents[doc_id].kind in kinds}
+        best = heapq.nlargest(limit, scores.items(), key=lambda entry: entry[1])
+        return [(self.documents[doc_id], score) for doc_id, score in best]
+
+
+def _documents() -> List[Document]:
+    """Tous les contenus indexés, depuis les packs content/*.json"""
+    resources = load_pack("resources")
+    documents = [
+        Document('snippet', snippet['titre'], snippet['categorie'], snippet['code'], snippet)
+        for snippet in load_pack("snippets")['snippets']
+    ]
+    documents += [
+        Document('tutoriel', tuto['titre'],
+                 ' '.join((tuto['categorie'], tuto['niveau'], tuto['description'])), '', tuto)
+        for tuto in resources['tutorials']
+    ]
+    documents += [
+        Document('dataset', dataset['nom'],
+                 ' '.join((dataset['domaine'], dataset['description'], dataset['use_case'], dataset['source'])),
+                 dataset['code'], dataset)
+        for dataset in resources['datasets']
+    ]
+    documents += [
+        Document('documentation', doc['nom'], doc['description'], '', doc)
+        for doc in resources['docs']
+    ]
+    documents += [
+        Document('question', question['question'],
+                 ' '.join((categorie, question['reponse'], question.get('conseils', ''))), '',
+                 {**question, 'categorie': categorie})
+        for categorie, questions in load_pack("interview")['questions'].items()
+        for question in questions
+    ]
+    return documents
+
+
+@lru_cache(maxsize=1)
+def get_index() -> SearchIndex:
+    """Index de tous les contenus (construit au premier appel)"""
+    return SearchIndex(_documents())
+
+
+def search(query: str, limit: int = 10,
+           kinds: Optional[Iterable[str]] = None) -> List[Tuple[Document, float]]:
+    """Recherche dans l'index partagé (voir SearchIndex.search)"""
+    return get_index().search(query, limit, kinds)
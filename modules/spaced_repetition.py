@@ -0,0 +1,68 @@
+"""
+Planification des révisions par répétition espacée (algorithme SM-2, sans Streamlit)
+Chaque flashcard conserve un facteur de facilité (ease), un intervalle en
+jours, un nombre de répétitions réussies et sa prochaine échéance (due_at).
+Une réponse « difficile » remet la carte en file quelques minutes plus tard ;
+les réponses réussies espacent les révisions de 1, 6 puis intervalle x ease jours.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict
+
+from modules.database import timestamp
+
+# Qualité de la réponse (échelle 0-5 de SM-2) pour chaque bouton de la page
+GRADES = {
+    "difficile": 2,
+    "moyen": 4,
+    "facile": 5
+}
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# Délai avant de revoir une carte ratée
+RELEARN_DELAY = timedelta(minutes=10)
+
+
+def schedule(card: Dict, difficulte: str, now: datetime = None) -> Dict:
+    """
+    Nouvel état de planification d'une carte après une révision
+
+    Args:
+        card: Flashcard (ease, interval_days, repetitions ; valeurs par défaut si absentes)
+        difficulte: Réponse de l'étudiant (clé de GRADES)
+        now: Instant de la révision (défaut : maintenant)
+
+    Returns:
+        ease, interval_days, repetitions, due_at (horodatage texte)
+    """
+    if difficulte not in GRADES:
+        raise ValueError(f"Difficulté inconnue : {difficulte}")
+    now = now or datetime.now()
+    quality = GRADES[difficulte]
+    ease = card.get('ease') or DEFAULT_EASE
+    interval = card.get('interval_days') or 0
+    repetitions = card.get('repetitions') or 0
+
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+    if quality < 3:
+        repetitions, interval = 0, 0
+        due_at = now + RELEARN_DELAY
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1
+        elif repetitions == 2:
+            interval = 6
+        else:
+            interval = round(interval * ease)
+        due_at = now + timedelta(days=interval)
+
+    return {
+        'ease': round(ease, 2),
+        'interval_days': interval,
+        'repetitions': repetitions,
+        'due_at': timestamp(due_at)
+    }
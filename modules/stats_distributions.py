@@ -0,0 +1,155 @@
+"""
+Évaluation des lois de probabilité pour l'onglet Distributions (Stats & Probas)
+Les grilles évaluées et les figures Plotly sont mémorisées dans des caches LRU
+bornés, partagés par toutes les sessions du serveur : déplacer un slider sur
+une valeur déjà vue (par soi ou par un autre étudiant) ne recalcule rien.
+
+Les tableaux et figures retournés sont partagés entre sessions et ne doivent
+pas être modifiés.
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+import plotly.graph_objects as go
+from scipy import stats
+
+# Nombre de points des grilles continues
+GRID_POINTS = 1000
+
+# Tailles des caches LRU (entrées)
+EVALUATION_CACHE_SIZE = 512
+FIGURE_CACHE_SIZE = 256
+
+DISTRIBUTIONS = {
+    "Normale": {
+        "discrete": False,
+        "params": ("mu", "sigma"),
+        "grid": lambda mu, sigma: (mu - 4*sigma, mu + 4*sigma, GRID_POINTS),
+        "density": lambda x, mu, sigma: stats.norm.pdf(x, mu, sigma)
+    },
+    "Binomiale": {
+        "discrete": True,
+        "params": ("n", "p"),
+        "grid": lambda n, p: (0, n + 1),
+        "density": lambda x, n, p: stats.binom.pmf(x, n, p)
+    },
+    "Poisson": {
+        "discrete": True,
+        "params": ("lambda",),
+        "grid": lambda lambda_val: (0, max(int(lambda_val * 3), int(stats.poisson.ppf(0.999, lambda_val)) + 1)),
+        "density": lambda x, lambda_val: stats.poisson.pmf(x, lambda_val)
+    },
+    "Exponentielle": {
+        "discrete": False,
+        "params": ("lambda",),
+        "grid": lambda lambda_val: (0, 10/lambda_val, GRID_POINTS),
+        "density": lambda x, lambda_val: stats.expon.pdf(x, scale=1/lambda_val)
+    },
+    "Uniforme": {
+        "discrete": False,
+        "params": ("a", "b"),
+        "grid": lambda a, b: (a - 1, b + 1, GRID_POINTS),
+        "density": lambda x, a, b: stats.uniform.pdf(x, a, b - a)
+    },
+    "Student (t)": {
+        "discrete": False,
+        "params": ("df",),
+        "grid": lambda df: (-5, 5, GRID_POINTS),
+        "density": lambda x, df: stats.t.pdf(x, df)
+    }
+}
+
+
+def normalize_params(params: Tuple) -> Tuple:
+    """
+    Rend les paramètres hachables et stables
+
+    Les sliders renvoient des flottants du type 0.30000000000000004 : on les
+    arrondit pour que deux positions identiques donnent la même clé de cache.
+    """
+    return tuple(round(float(v), 6) if isinstance(v, (float, np.floating)) else int(v) for v in params)
+
+
+def distribution_grid(distribution: str, params: Tuple) -> Tuple:
+    """Grille d'évaluation par défaut : (début, fin, nb_points) ou (début, fin) pour une loi discrète"""
+    spec = DISTRIBUTIONS[distribution]
+    return tuple(round(float(v), 6) if isinstance(v, float) else v for v in spec["grid"](*params))
+
+
+@lru_cache(maxsize=EVALUATION_CACHE_SIZE)
+def _evaluate(distribution: str, params: Tuple, grid: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+    spec = DISTRIBUTIONS[distribution]
+    x = np.arange(*grid) if spec["discrete"] else np.linspace(*grid)
+    y = spec["density"](x, *params)
+    # Tableaux partagés entre sessions : lecture seule
+    x.setflags(write=False)
+    y.setflags(write=False)
+    return x, y
+
+
+def evaluate_distribution(distribution: str, params: Tuple,
+                          grid: Tuple = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Évalue la densité (ou la loi de probabilité) d'une distribution sur une grille
+
+    Args:
+        distribution: Nom de la loi (clé de DISTRIBUTIONS)
+        params: Paramètres dans l'ordre de DISTRIBUTIONS[distribution]["params"]
+        grid: Grille explicite ; par défaut celle de distribution_grid
+
+    Returns:
+        (x, y) en lecture seule
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Distribution inconnue : {distribution}")
+    params = normalize_params(params)
+    if grid is None:
+        grid = distribution_grid(distribution, params)
+    return _evaluate(distribution, params, tuple(grid))
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def _figure(distribution: str, params: Tuple) -> go.Figure:
+    x, y = evaluate_distribution(distribution, params)
+    discrete = DISTRIBUTIONS[distribution]["discrete"]
+
+    fig = go.Figure()
+    if discrete:
+        fig.add_trace(go.Bar(x=x, y=y, name=distribution, marker_color='#667eea'))
+    else:
+        fig.add_trace(go.Scatter(x=x, y=y, fill='tozeroy', name=distribution, line=dict(color='#667eea', width=3)))
+
+    fig.update_layout(
+        title=f"Distribution {distribution}",
+        xaxis_title="x",
+        yaxis_title="Probabilité" if discrete else "Densité de probabilité",
+        height=500,
+        template="plotly_white"
+    )
+    return fig
+
+
+def distribution_figure(distribution: str, params: Tuple) -> go.Figure:
+    """
+    Figure Plotly d'une distribution (mémorisée)
+
+    La figure est partagée entre sessions : st.plotly_chart la sérialise
+    sans la modifier, mais il ne faut pas appeler update_layout dessus.
+    """
+    return _figure(distribution, normalize_params(params))
+
+
+def cache_info() -> Dict:
+    """Statistiques des caches (succès, échecs, taille)"""
+    return {
+        "evaluations": _evaluate.cache_info()._asdict(),
+        "figures": _figure.cache_info()._asdict()
+    }
+
+
+def clear_caches():
+    """Vide les caches de distributions"""
+    _evaluate.cache_clear()
+    _figure.cache_clear()
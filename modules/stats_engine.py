@@ -0,0 +1,277 @@
+"""
+Moteur de tests statistiques vectorisé (NumPy/SciPy, sans Streamlit)
+Chaque fonction accepte des scalaires ou des tableaux (diffusion NumPy) :
+un même appel teste une valeur saisie dans la page ou des centaines de
+milliers de lignes d'un fichier CSV.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+ALTERNATIVES = ["bilatéral", "unilatéral droite", "unilatéral gauche"]
+
+
+def _quantile(q: np.ndarray, df: np.ndarray = None) -> np.ndarray:
+    """
+    Quantiles de la loi normale (df=None) ou de Student
+
+    Les ppf sont coûteuses et un lot ne contient en pratique que quelques
+    couples (niveau, ddl) distincts : on ne les calcule qu'une fois chacun.
+    """
+    if df is None:
+        unique, inverse = np.unique(q, return_inverse=True)
+        return stats.norm.ppf(unique)[inverse].reshape(q.shape)
+
+    quantile = np.empty(q.shape)
+    for level in np.unique(q):
+        mask = q == level
+        unique_df, inverse = np.unique(df[mask], return_inverse=True)
+        quantile[mask] = stats.t.ppf(level, unique_df)[inverse]
+    return quantile
+
+
+def _decision(statistic: np.ndarray, alpha: np.ndarray, alternative,
+              df: np.ndarray = None) -> Dict[str, np.ndarray]:
+    """
+    p-value, valeur critique et décision pour une statistique Z (df=None) ou t
+
+    Les deux lois étant symétriques, chaque hypothèse alternative se ramène
+    à une seule queue droite : une seule évaluation de sf et de ppf par ligne.
+
+    Args:
+        statistic: Statistique(s) observée(s)
+        alpha: Niveau(x) de significativité
+        alternative: Hypothèse(s) alternative(s) (valeurs de ALTERNATIVES)
+        df: Degrés de liberté (test t)
+    """
+    alternative = np.broadcast_to(np.asarray(alternative), statistic.shape)
+    unknown = ~np.isin(alternative, ALTERNATIVES)
+    if unknown.any():
+        raise ValueError(f"Hypothèse alternative inconnue : {np.unique(alternative[unknown]).tolist()}")
+
+    two_sided = alternative == "bilatéral"
+    left = alternative == "unilatéral gauche"
+
+    # Statistique ramenée sur la queue droite
+    tail = np.where(two_sided, np.abs(statistic), np.where(left, -statistic, statistic))
+    sf = stats.norm.sf(tail) if df is None else stats.t.sf(tail, df)
+    p_value = np.where(two_sided, 2 * sf, sf)
+
+    quantile = _quantile(np.where(two_sided, 1 - alpha / 2, 1 - alpha), df)
+
+    return {
+        'p_value': p_value,
+        'critical': np.where(left, -quantile, quantile),
+        'reject': tail > quantile
+    }
+
+
+def z_test(x_bar, mu_0, sigma, n, alpha=0.05, alternative="bilatéral") -> Dict[str, np.ndarray]:
+    """
+    Test Z pour une moyenne (σ connu)
+
+    Returns:
+        Dictionnaire de tableaux : statistic, p_value, critical, reject
+    """
+    x_bar, mu_0, sigma, n, alpha = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (x_bar, mu_0, sigma, n, alpha))
+    )
+    statistic = (x_bar - mu_0) / (sigma / np.sqrt(n))
+    return {'statistic': statistic, **_decision(statistic, alpha, alternative)}
+
+
+def t_test(x_bar, mu_0, s, n, alpha=0.05, alternative="bilatéral") -> Dict[str, np.ndarray]:
+    """
+    Test t de Student pour une moyenne (σ inconnu, n-1 ddl)
+
+    Returns:
+        Dictionnaire de tableaux : statistic, df, p_value, critical, reject
+    """
+    x_bar, mu_0, s, n, alpha = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (x_bar, mu_0, s, n, alpha))
+    )
+    df = n - 1
+    statistic = (x_bar - mu_0) / (s / np.sqrt(n))
+    return {'statistic': statistic, 'df': df, **_decision(statistic, alpha, alternative, df)}
+
+
+def chi2_test(observed, expected=None, alpha=0.05, ddof=0) -> Dict[str, np.ndarray]:
+    """
+    Test du Chi² d'adéquation, ligne par ligne
+
+    Args:
+        observed: Effectifs observés, forme (k,) ou (lignes, k)
+        expected: Effectifs théoriques de même forme (défaut : équirépartition)
+        alpha: Niveau(x) de significativité
+        ddof: Degrés de liberté retirés en plus de k-1 (paramètres estimés)
+
+    Returns:
+        Dictionnaire de tableaux : statistic, df, p_value, critical, reject
+    """
+    observed = np.atleast_1d(np.asarray(observed, dtype=float))
+    if expected is None:
+        expected = np.broadcast_to(observed.mean(axis=-1, keepdims=True), observed.shape)
+    else:
+        expected = np.broadcast_to(np.asarray(expected, dtype=float), observed.shape)
+
+    statistic = ((observed - expected) ** 2 / expected).sum(axis=-1)
+    df = observed.shape[-1] - 1 - ddof
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), statistic.shape)
+    critical = stats.chi2.ppf(1 - alpha, df)
+
+    return {
+        'statistic': statistic,
+        'df': np.full(statistic.shape, df),
+        'p_value': stats.chi2.sf(statistic, df),
+        'critical': critical,
+        'reject': statistic > critical
+    }
+
+
+def chi2_independence(table, alpha=0.05) -> Dict:
+    """
+    Test du Chi² d'indépendance sur un tableau de contingence
+
+    Returns:
+        statistic, df, p_value, critical, reject et le tableau des effectifs théoriques
+    """
+    table = np.asarray(table, dtype=float)
+    if table.ndim != 2 or min(table.shape) < 2:
+        raise ValueError("Le tableau de contingence doit avoir au moins 2 lignes et 2 colonnes")
+    if (table.sum(axis=0) == 0).any() or (table.sum(axis=1) == 0).any():
+        raise ValueError("Chaque ligne et chaque colonne doit contenir au moins un effectif non nul")
+
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / table.sum()
+    statistic = float(((table - expected) ** 2 / expected).sum())
+    df = (table.shape[0] - 1) * (table.shape[1] - 1)
+    critical = float(stats.chi2.ppf(1 - alpha, df))
+
+    return {
+        'statistic': statistic,
+        'df': df,
+        'p_value': float(stats.chi2.sf(statistic, df)),
+        'critical': critical,
+        'reject': statistic > critical,
+        'expected': expected
+    }
+
+
+def confidence_interval(x_bar, s, n, confidence=0.95, known_sigma=True) -> Dict[str, np.ndarray]:
+    """
+    Intervalle de confiance pour une moyenne
+
+    La loi normale est utilisée si σ est connu ou si n ≥ 30, sinon la loi
+    de Student à n-1 ddl.
+
+    Returns:
+        Dictionnaire de tableaux : lower, upper, margin, critical, use_z
+    """
+    x_bar, s, n, confidence, known_sigma = np.broadcast_arrays(
+        np.asarray(x_bar, dtype=float), np.asarray(s, dtype=float), np.asarray(n, dtype=float),
+        np.asarray(confidence, dtype=float), np.asarray(known_sigma, dtype=bool)
+    )
+    alpha = 1 - confidence
+    use_z = known_sigma | (n >= 30)
+    critical = np.where(use_z, _quantile(1 - alpha / 2),
+                        _quantile(1 - alpha / 2, np.maximum(n - 1, 1)))
+    margin = critical * (s / np.sqrt(n))
+
+    return {
+        'lower': x_bar - margin,
+        'upper': x_bar + margin,
+        'margin': margin,
+        'critical': critical,
+        'use_z': use_z
+    }
+
+
+# Tests disponibles en mode lot : fonction et colonnes attendues dans le CSV.
+# Les colonnes optionnelles (alpha, alternative, confidence, known_sigma)
+# remplacent, ligne par ligne, les valeurs choisies dans la page.
+BATCH_TESTS = {
+    "Test Z (moyenne)": {
+        "function": z_test,
+        "columns": ["x_bar", "mu_0", "sigma", "n"],
+        "options": ["alpha", "alternative"]
+    },
+    "Test t de Student": {
+        "function": t_test,
+        "columns": ["x_bar", "mu_0", "s", "n"],
+        "options": ["alpha", "alternative"]
+    },
+    "Intervalle de confiance": {
+        "function": confidence_interval,
+        "columns": ["x_bar", "s", "n"],
+        "options": ["confidence", "known_sigma"]
+    }
+}
+
+
+# Valeurs acceptées pour une colonne booléenne du CSV (lue en texte ou en nombre)
+BOOLEAN_VALUES = {
+    'true': True, 'vrai': True, 'oui': True, 'yes': True, '1': True, '1.0': True,
+    'false': False, 'faux': False, 'non': False, 'no': False, '0': False, '0.0': False
+}
+
+
+def _parse_booleans(values: pd.Series) -> np.ndarray:
+    """
+    Colonne booléenne d'un CSV (true/false, vrai/faux, oui/non, 1/0)
+
+    Une colonne de texte ne peut pas être convertie par bool() : « False »
+    est une chaîne non vide, donc vraie.
+    """
+    parsed = values.astype(str).str.strip().str.lower().map(BOOLEAN_VALUES)
+    invalid = values[parsed.isna()]
+    if len(invalid):
+        raise ValueError(f"Colonne {values.name} : valeurs non reconnues "
+                         f"({', '.join(map(str, invalid.unique()[:5]))}), utilisez true/false ou 1/0")
+    return parsed.to_numpy(dtype=bool)
+
+
+def batch_template(test_type: str) -> pd.DataFrame:
+    """Exemple de fichier CSV pour le mode lot"""
+    examples = {
+        "Test Z (moyenne)": {"x_bar": [105.0, 98.0], "mu_0": [100.0, 100.0], "sigma": [15.0, 10.0], "n": [30, 50]},
+        "Test t de Student": {"x_bar": [105.0, 98.0], "mu_0": [100.0, 100.0], "s": [15.0, 10.0], "n": [25, 12]},
+        "Intervalle de confiance": {"x_bar": [105.0, 98.0], "s": [15.0, 10.0], "n": [30, 12]}
+    }
+    return pd.DataFrame(examples[test_type])
+
+
+def missing_columns(df: pd.DataFrame, test_type: str) -> List[str]:
+    """Colonnes obligatoires absentes du fichier"""
+    return [col for col in BATCH_TESTS[test_type]["columns"] if col not in df.columns]
+
+
+def run_batch(df: pd.DataFrame, test_type: str, **defaults) -> pd.DataFrame:
+    """
+    Applique un test à toutes les lignes d'un DataFrame en un seul appel vectorisé
+
+    Args:
+        df: Données (une ligne par test)
+        test_type: Clé de BATCH_TESTS
+        **defaults: Valeurs par défaut des options (alpha, alternative, confidence, known_sigma)
+
+    Returns:
+        Le DataFrame d'origine complété des colonnes de résultat
+    """
+    spec = BATCH_TESTS[test_type]
+    missing = missing_columns(df, test_type)
+    if missing:
+        raise ValueError(f"Colonnes manquantes : {', '.join(missing)}")
+
+    kwargs = {col: df[col].to_numpy(dtype=float) for col in spec["columns"]}
+    for option in spec["options"]:
+        if option == "known_sigma" and option in df.columns:
+            kwargs[option] = _parse_booleans(df[option])
+        elif option in df.columns:
+            kwargs[option] = df[option].to_numpy()
+        elif option in defaults:
+            kwargs[option] = defaults[option]
+
+    results = spec["function"](**kwargs)
+    return pd.concat([df.reset_index(drop=True), pd.DataFrame(results)], axis=1)
@@ -5,12 +5,33 @@ import plotly.graph_objects as go
 import plotly.express as px
 from scipy import stats
 import json
-from pathlib import Path
+import os
+import secrets
+import time
+
+from modules.stats_distributions import distribution_figure
+from modules.exercise_templates import TEMPLATES, problem_set
+from modules.monte_carlo import (
+    SOURCE_DISTRIBUTIONS, STATISTICS, coin_flips, sampling_distribution,
+    clt_reference, bootstrap_ci, draw_sample
+)
+from modules.power_analysis import (
+    DESIGNS, COHEN_EFFECTS, cohen_h, power, sample_size, power_curve
+)
+from modules.resampling import (
+    PERMUTATION_STATISTICS, data_fingerprint, numeric_columns, group_columns,
+    bootstrap_column, permutation_test_columns
+)
+from modules.dataset_store import list_datasets, load_dataset
+from modules.stats_engine import (
+    z_test, t_test, chi2_independence, confidence_interval,
+    BATCH_TESTS, ALTERNATIVES, batch_template, missing_columns, run_batch
+)
 
 st.title("📊 Statistiques & Probabilités")
 st.markdown("**Outils interactifs pour maîtriser les stats et probas**")
 
-tab1, tab2, tab3, tab4 = st.tabs(["📈 Distributions", "🧮 Calculateurs", "📝 Exercices", "📖 Formulaire"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Distributions", "🧮 Calculateurs", "🎲 Simulations", "📝 Exercices", "📖 Formulaire"])
 
 with tab1:
     st.header("Visualisation des Distributions")
@@ -28,58 +49,39 @@ with tab1:
         if distribution == "Normale":
             mu = st.slider("Moyenne (μ)", -10.0, 10.0, 0.0, 0.1)
             sigma = st.slider("Écart-type (σ)", 0.1, 5.0, 1.0, 0.1)
-            x = np.linspace(mu - 4*sigma, mu + 4*sigma, 1000)
-            y = stats.norm.pdf(x, mu, sigma)
+            params = (mu, sigma)
             st.latex(f"X \\sim N({mu}, {sigma}^2)")
             
         elif distribution == "Binomiale":
             n = st.slider("Nombre d'essais (n)", 1, 100, 20)
             p = st.slider("Probabilité de succès (p)", 0.0, 1.0, 0.5, 0.01)
-            x = np.arange(0, n+1)
-            y = stats.binom.pmf(x, n, p)
+            params = (n, p)
             st.latex(f"X \\sim B({n}, {p})")
             
         elif distribution == "Poisson":
             lambda_val = st.slider("Lambda (λ)", 0.1, 20.0, 5.0, 0.1)
-            x = np.arange(0, int(lambda_val * 3))
-            y = stats.poisson.pmf(x, lambda_val)
+            params = (lambda_val,)
             st.latex(f"X \\sim P({lambda_val})")
             
         elif distribution == "Exponentielle":
             lambda_val = st.slider("Lambda (λ)", 0.1, 5.0, 1.0, 0.1)
-            x = np.linspace(0, 10/lambda_val, 1000)
-            y = stats.expon.pdf(x, scale=1/lambda_val)
+            params = (lambda_val,)
             st.latex(f"X \\sim Exp({lambda_val})")
             
         elif distribution == "Uniforme":
             a = st.slider("Borne inférieure (a)", -10.0, 10.0, 0.0, 0.1)
             b = st.slider("Borne supérieure (b)", a+0.1, 20.0, 10.0, 0.1)
-            x = np.linspace(a-1, b+1, 1000)
-            y = stats.uniform.pdf(x, a, b-a)
+            params = (a, b)
             st.latex(f"X \\sim U({a}, {b})")
             
         elif distribution == "Student (t)":
             df = st.slider("Degrés de liberté (df)", 1, 30, 10)
-            x = np.linspace(-5, 5, 1000)
-            y = stats.t.pdf(x, df)
+            params = (df,)
             st.latex(f"X \\sim t({df})")
     
     with col1:
-        fig = go.Figure()
-        
-        if distribution in ["Binomiale", "Poisson"]:
-            fig.add_trace(go.Bar(x=x, y=y, name=distribution, marker_color='#667eea'))
-        else:
-            fig.add_trace(go.Scatter(x=x, y=y, fill='tozeroy', name=distribution, line=dict(color='#667eea', width=3)))
-        
-        fig.update_layout(
-            title=f"Distribution {distribution}",
-            xaxis_title="x",
-            yaxis_title="Densité de probabilité" if distribution not in ["Binomiale", "Poisson"] else "Probabilité",
-            height=500,
-            template="plotly_white"
-        )
-        
+        # Figure mémorisée par (distribution, paramètres) : partagée entre sessions
+        fig = distribution_figure(distribution, params)
         st.plotly_chart(fig, width="stretch")
         
         if distribution == "Normale":
@@ -94,7 +96,7 @@ with tab2:
     
     test_type = st.selectbox(
         "Choisissez un test :",
-        ["Test Z (moyenne)", "Test t de Student", "Test du Chi²", "Intervalle de confiance", "Taille d'échantillon"]
+        ["Test Z (moyenne)", "Test t de Student", "Test du Chi²", "Intervalle de confiance", "Taille d'échantillon", "Tests en lot (CSV)", "Bootstrap & permutation (données)"]
     )
     
     if test_type == "Test Z (moyenne)":
@@ -110,22 +112,13 @@ with tab2:
         
         with col2:
             alpha = st.select_slider("Niveau de significativité (α)", options=[0.01, 0.05, 0.1], value=0.05)
-            alternative = st.radio("Hypothèse alternative", ["bilatéral", "unilatéral droite", "unilatéral gauche"])
-        
-        z_stat = (x_bar - mu_0) / (sigma / np.sqrt(n))
-        
-        if alternative == "bilatéral":
-            p_value = 2 * (1 - stats.norm.cdf(abs(z_stat)))
-            z_critical = stats.norm.ppf(1 - alpha/2)
-            reject = abs(z_stat) > z_critical
-        elif alternative == "unilatéral droite":
-            p_value = 1 - stats.norm.cdf(z_stat)
-            z_critical = stats.norm.ppf(1 - alpha)
-            reject = z_stat > z_critical
-        else:
-            p_value = stats.norm.cdf(z_stat)
-            z_critical = stats.norm.ppf(alpha)
-            reject = z_stat < z_critical
+            alternative = st.radio("Hypothèse alternative", ALTERNATIVES)
+        
+        result = z_test(x_bar, mu_0, sigma, n, alpha, alternative)
+        z_stat = float(result['statistic'])
+        p_value = float(result['p_value'])
+        z_critical = float(result['critical'])
+        reject = bool(result['reject'])
         
         st.markdown("---")
         st.subheader("Résultats")
@@ -155,23 +148,13 @@ with tab2:
         
         with col2:
             alpha = st.select_slider("Niveau de significativité (α)", options=[0.01, 0.05, 0.1], value=0.05)
-            alternative = st.radio("Hypothèse alternative", ["bilatéral", "unilatéral droite", "unilatéral gauche"], key="t_test")
+            alternative = st.radio("Hypothèse alternative", ALTERNATIVES, key="t_test")
         
         df = n - 1
-        t_stat = (x_bar - mu_0) / (s / np.sqrt(n))
-        
-        if alternative == "bilatéral":
-            p_value = 2 * (1 - stats.t.cdf(abs(t_stat), df))
-            t_critical = stats.t.ppf(1 - alpha/2, df)
-            reject = abs(t_stat) > t_critical
-        elif alternative == "unilatéral droite":
-            p_value = 1 - stats.t.cdf(t_stat, df)
-            t_critical = stats.t.ppf(1 - alpha, df)
-            reject = t_stat > t_critical
-        else:
-            p_value = stats.t.cdf(t_stat, df)
-            t_critical = stats.t.ppf(alpha, df)
-            reject = t_stat < t_critical
+        result = t_test(x_bar, mu_0, s, n, alpha, alternative)
+        t_stat = float(result['statistic'])
+        p_value = float(result['p_value'])
+        reject = bool(result['reject'])
         
         st.markdown("---")
         st.subheader("Résultats")
@@ -201,19 +184,11 @@ with tab2:
             confidence = st.select_slider("Niveau de confiance", options=[0.90, 0.95, 0.99], value=0.95)
             known_sigma = st.checkbox("Écart-type population connu (utiliser Z)", value=True)
         
-        alpha = 1 - confidence
-        
-        if known_sigma or n >= 30:
-            z_critical = stats.norm.ppf(1 - alpha/2)
-            margin_error = z_critical * (s / np.sqrt(n))
-            distribution_used = "Z (loi normale)"
-        else:
-            t_critical = stats.t.ppf(1 - alpha/2, n-1)
-            margin_error = t_critical * (s / np.sqrt(n))
-            distribution_used = f"t (Student avec {n-1} ddl)"
-        
-        lower = x_bar - margin_error
-        upper = x_bar + margin_error
+        result = confidence_interval(x_bar, s, n, confidence, known_sigma)
+        lower = float(result['lower'])
+        upper = float(result['upper'])
+        margin_error = float(result['margin'])
+        distribution_used = "Z (loi normale)" if result['use_z'] else f"t (Student avec {n-1} ddl)"
         
         st.markdown("---")
         st.subheader("Résultats")
@@ -221,79 +196,548 @@ with tab2:
         st.success(f"**Intervalle de confiance à {confidence*100}% :** [{lower:.2f}, {upper:.2f}]")
         st.info(f"**Marge d'erreur :** ±{margin_error:.2f}")
         st.info(f"**Distribution utilisée :** {distribution_used}")
+    
+    elif test_type == "Taille d'échantillon":
+        st.subheader("Taille d'échantillon et puissance")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            design = st.selectbox("Plan d'expérience", list(DESIGNS.keys()))
+            effect_name = DESIGNS[design]["effect"]
+            k = 3
+            
+            if design in ["Proportion (1 échantillon)", "Deux proportions"]:
+                p1 = st.number_input("Proportion de référence (p₀)" if design == "Proportion (1 échantillon)" else "Proportion groupe A",
+                                     value=0.10, min_value=0.001, max_value=0.999, step=0.01, format="%.3f")
+                p2 = st.number_input("Proportion attendue (p₁)" if design == "Proportion (1 échantillon)" else "Proportion groupe B",
+                                     value=0.15, min_value=0.001, max_value=0.999, step=0.01, format="%.3f")
+                effect = float(cohen_h(p1, p2))
+                st.caption(f"Taille d'effet : h = {effect:.3f}")
+            else:
+                conventions = COHEN_EFFECTS[effect_name]
+                effect = st.number_input(f"Taille d'effet ({effect_name})", value=conventions["moyen"],
+                                         min_value=0.01, max_value=3.0, step=0.01)
+                st.caption(" | ".join(f"{label} : {value}" for label, value in conventions.items()))
+                if design == "ANOVA (k groupes)":
+                    k = st.number_input("Nombre de groupes (k)", value=3, min_value=2, max_value=20)
+        
+        with col2:
+            alpha = st.select_slider("Niveau de significativité (α)", options=[0.01, 0.05, 0.1], value=0.05, key="power_alpha")
+            target_power = st.select_slider("Puissance visée (1 - β)", options=[0.8, 0.85, 0.9, 0.95], value=0.8)
+            alternative = "bilatéral" if design == "ANOVA (k groupes)" else st.radio(
+                "Hypothèse alternative", ["bilatéral", "unilatéral"], key="power_alternative"
+            )
+        
+        if effect <= 0:
+            st.error("❌ La taille d'effet doit être strictement positive (proportions identiques ?)")
+        else:
+            n_required = int(sample_size(design, effect, alpha, target_power, alternative, k)[0])
+            groups = k if design == "ANOVA (k groupes)" else DESIGNS[design]["groups"]
+            
+            st.markdown("---")
+            st.subheader("Résultats")
+            
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Effectif par groupe", f"{n_required:,}")
+            col2.metric("Effectif total", f"{n_required * groups:,}")
+            col3.metric("Puissance obtenue", f"{float(power(design, effect, n_required, alpha, alternative, k)):.3f}")
+            
+            conventions = COHEN_EFFECTS[effect_name]
+            curves = {f"Effet choisi ({effect:.2f})": effect}
+            curves.update({f"Effet {label} ({value})": value for label, value in conventions.items()})
+            
+            n_max = int(min(max(n_required * 2, 20), 100_000))
+            fig = go.Figure()
+            for label, value in curves.items():
+                curve = power_curve(design, value, n_max, alpha, alternative, k)
+                fig.add_trace(go.Scatter(x=curve['n'], y=curve['power'], name=label,
+                                         line=dict(width=4 if label.startswith("Effet choisi") else 2)))
+            fig.add_hline(y=target_power, line_dash="dash", line_color="red", annotation_text=f"Puissance {target_power}")
+            fig.add_vline(x=n_required, line_dash="dot", line_color="gray")
+            fig.update_layout(
+                title="Courbes de puissance",
+                xaxis_title="Effectif par groupe (n)",
+                yaxis_title="Puissance",
+                yaxis_range=[0, 1.02],
+                height=450,
+                template="plotly_white"
+            )
+            st.plotly_chart(fig, width="stretch")
+            
+            st.markdown("**Effectif par groupe selon α et la puissance :**")
+            grid = pd.DataFrame(
+                {f"1-β = {pw}": [int(sample_size(design, effect, a, pw, alternative, k)[0]) for a in [0.01, 0.05, 0.1]]
+                 for pw in [0.8, 0.85, 0.9, 0.95]},
+                index=[f"α = {a}" for a in [0.01, 0.05, 0.1]]
+            )
+            st.dataframe(grid, width="stretch")
+    
+    elif test_type == "Test du Chi²":
+        st.subheader("Test du Chi² d'indépendance")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            n_rows = st.number_input("Nombre de modalités (lignes)", value=2, min_value=2, max_value=6)
+            n_cols = st.number_input("Nombre de modalités (colonnes)", value=2, min_value=2, max_value=6)
+        
+        with col2:
+            alpha = st.select_slider("Niveau de significativité (α)", options=[0.01, 0.05, 0.1], value=0.05, key="chi2_alpha")
+        
+        st.markdown("**Tableau de contingence (effectifs observés) :**")
+        default_table = pd.DataFrame(
+            np.full((n_rows, n_cols), 10),
+            index=[f"Ligne {i+1}" for i in range(n_rows)],
+            columns=[f"Colonne {j+1}" for j in range(n_cols)]
+        )
+        default_table.iloc[0, 0] = 20
+        table = st.data_editor(default_table, key=f"chi2_table_{n_rows}_{n_cols}")
+        
+        try:
+            result = chi2_independence(table.to_numpy(), alpha)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+        else:
+            st.markdown("---")
+            st.subheader("Résultats")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Statistique χ²", f"{result['statistic']:.4f}")
+            col2.metric("P-value", f"{result['p_value']:.4f}")
+            col3.metric("ddl", f"{result['df']}")
+            col4.metric("Décision", "Rejeter H₀" if result['reject'] else "Ne pas rejeter H₀")
+            
+            if result['reject']:
+                st.error(f"✅ **Conclusion :** On rejette H₀ au niveau {alpha}. Les deux variables sont liées.")
+            else:
+                st.success(f"❌ **Conclusion :** On ne rejette pas H₀ au niveau {alpha}. Pas de dépendance significative.")
+            
+            st.markdown("**Effectifs théoriques sous H₀ :**")
+            st.dataframe(pd.DataFrame(result['expected'], index=table.index, columns=table.columns).round(2))
+            
+            if (result['expected'] < 5).any():
+                st.warning("⚠️ Certains effectifs théoriques sont inférieurs à 5 : le test est peu fiable.")
+    
+    elif test_type == "Tests en lot (CSV)":
+        st.subheader("Tester toutes les lignes d'un fichier")
+        st.markdown("Chaque ligne du fichier est un test ; tous les tests sont calculés en une seule passe.")
+        
+        batch_test = st.selectbox("Test à appliquer", list(BATCH_TESTS.keys()))
+        spec = BATCH_TESTS[batch_test]
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"**Colonnes obligatoires :** {', '.join(spec['columns'])}")
+            st.markdown(f"**Colonnes optionnelles :** {', '.join(spec['options'])}")
+            st.download_button(
+                "📄 Télécharger un modèle CSV",
+                data=batch_template(batch_test).to_csv(index=False),
+                file_name="modele_tests.csv",
+                mime="text/csv"
+            )
+        
+        with col2:
+            if "confidence" in spec["options"]:
+                defaults = {
+                    "confidence": st.select_slider("Niveau de confiance", options=[0.90, 0.95, 0.99], value=0.95, key="batch_confidence"),
+                    "known_sigma": st.checkbox("Écart-type population connu (utiliser Z)", value=True, key="batch_sigma")
+                }
+            else:
+                defaults = {
+                    "alpha": st.select_slider("Niveau de significativité (α)", options=[0.01, 0.05, 0.1], value=0.05, key="batch_alpha"),
+                    "alternative": st.radio("Hypothèse alternative", ALTERNATIVES, key="batch_alternative")
+                }
+        
+        uploaded = st.file_uploader("Fichier CSV", type=["csv"], key="batch_file")
+        
+        if uploaded is not None:
+            data = pd.read_csv(uploaded)
+            missing = missing_columns(data, batch_test)
+            
+            if missing:
+                st.error(f"❌ Colonnes manquantes : {', '.join(missing)}")
+            else:
+                try:
+                    results = run_batch(data, batch_test, **defaults)
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    col1, col2 = st.columns(2)
+                    col1.metric("Tests calculés", f"{len(results):,}")
+                    if "reject" in results.columns:
+                        col2.metric("H₀ rejetée", f"{results['reject'].mean()*100:.1f}%")
+                    else:
+                        col2.metric("Marge d'erreur moyenne", f"±{results['margin'].mean():.2f}")
+                    
+                    st.dataframe(results.head(1000), width="stretch")
+                    st.download_button(
+                        "📥 Télécharger les résultats (CSV)",
+                        data=results.to_csv(index=False),
+                        file_name="resultats_tests.csv",
+                        mime="text/csv"
+                    )
+    
+    elif test_type == "Bootstrap & permutation (données)":
+        st.subheader("Bootstrap et tests de permutation sur vos données")
+        st.markdown("Pas besoin de saisir les statistiques résumées : le calcul part des données brutes.")
+        
+        source_type = st.radio("Source des données", ["Fichier CSV", "Dataset généré"], horizontal=True)
+        data, fingerprint = None, None
+        
+        if source_type == "Fichier CSV":
+            uploaded = st.file_uploader("Fichier CSV", type=["csv"], key="resampling_file")
+            if uploaded is not None:
+                content = uploaded.getvalue()
+                data = pd.read_csv(uploaded)
+                fingerprint = data_fingerprint(content)
+        else:
+            stored = list_datasets()
+            if not stored:
+                st.info("Aucun dataset enregistré : générez-en un dans le Générateur de Datasets.")
+            else:
+                labels = {f"{d['dataset_type']} — {d['n_rows']:,} lignes": d['dataset_key'] for d in stored}
+                choice = st.selectbox("Dataset", list(labels.keys()))
+                fingerprint = labels[choice]
+                data = load_dataset(fingerprint)
+        
+        if data is not None:
+            numeric = numeric_columns(data)
+            if not numeric:
+                st.error("❌ Aucune colonne numérique dans ces données")
+            else:
+                method = st.radio("Méthode", ["Intervalle de confiance bootstrap", "Test de permutation (2 groupes)"])
+                column = st.selectbox("Variable analysée", numeric)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    n_resamples = st.select_slider("Nombre de rééchantillonnages (B)", options=[1_000, 5_000, 10_000, 50_000], value=10_000)
+                with col2:
+                    parallel = st.checkbox("Répartir sur plusieurs processus", value=False, key="resampling_parallel")
+                workers = (os.cpu_count() or 1) if parallel else 1
+                
+                if len(data) > 100_000:
+                    st.warning(f"⚠️ {len(data):,} lignes : chaque rééchantillonnage tire {len(data):,} indices, le calcul peut prendre du temps.")
+                
+                if method == "Intervalle de confiance bootstrap":
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        statistic = st.selectbox("Statistique", list(STATISTICS.keys()), key="resampling_statistic")
+                    with col2:
+                        confidence = st.select_slider("Niveau de confiance", options=[0.90, 0.95, 0.99], value=0.95, key="resampling_confidence")
+                    
+                    if st.button("▶️ Calculer l'intervalle", type="primary"):
+                        start = time.perf_counter()
+                        try:
+                            result = bootstrap_column(data, fingerprint, column, statistic, n_resamples, confidence, workers=workers)
+                        except ValueError as e:
+                            st.error(f"❌ {e}")
+                        else:
+                            elapsed = time.perf_counter() - start
+                            
+                            col1, col2, col3, col4 = st.columns(4)
+                            col1.metric(f"{statistic.capitalize()} observée", f"{result['estimate']:.4f}")
+                            col2.metric(f"IC à {confidence*100:.0f}%", f"[{result['lower']:.3f}, {result['upper']:.3f}]")
+                            col3.metric("Erreur standard", f"{result['se']:.4f}")
+                            col4.metric("Temps de calcul", f"{elapsed:.2f} s")
+                            if result['cached']:
+                                st.caption("⚡ Résultat servi depuis le cache")
+                            
+                            fig = go.Figure()
+                            fig.add_trace(go.Histogram(x=result['distribution'], nbinsx=60, marker_color='#667eea', name="Bootstrap"))
+                            fig.add_vline(x=result['lower'], line_dash="dash", line_color="red")
+                            fig.add_vline(x=result['upper'], line_dash="dash", line_color="red")
+                            fig.update_layout(
+                                title=f"Distribution bootstrap de la {statistic} de {column} (n = {result['n']:,})",
+                                xaxis_title=statistic,
+                                yaxis_title="Effectif",
+                                height=400,
+                                template="plotly_white"
+                            )
+                            st.plotly_chart(fig, width="stretch")
+                
+                else:
+                    candidates = [c for c in group_columns(data) if c != column]
+                    if not candidates:
+                        st.error("❌ Aucune colonne catégorielle (2 à 20 modalités) pour former les groupes")
+                    else:
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            group_column = st.selectbox("Colonne de groupe", candidates)
+                            statistic = st.selectbox("Statistique comparée", list(PERMUTATION_STATISTICS.keys()))
+                        with col2:
+                            levels = sorted(data[group_column].astype(str).unique().tolist())
+                            group_a = st.selectbox("Groupe A", levels, index=0)
+                            group_b = st.selectbox("Groupe B", [l for l in levels if l != group_a])
+                            alpha = st.select_slider("Niveau de significativité (α)", options=[0.01, 0.05, 0.1], value=0.05, key="permutation_alpha")
+                        
+                        if st.button("▶️ Lancer le test", type="primary"):
+                            start = time.perf_counter()
+                            try:
+                                result = permutation_test_columns(data, fingerprint, column, group_column, (group_a, group_b),
+                                                                  statistic, n_resamples, workers=workers)
+                            except ValueError as e:
+                                st.error(f"❌ {e}")
+                            else:
+                                elapsed = time.perf_counter() - start
+                                
+                                col1, col2, col3, col4 = st.columns(4)
+                                col1.metric(statistic.capitalize(), f"{result['observed']:.4f}")
+                                col2.metric("P-value", f"{result['p_value']:.4f}")
+                                col3.metric("Effectifs", f"{result['n_a']:,} / {result['n_b']:,}")
+                                col4.metric("Temps de calcul", f"{elapsed:.2f} s")
+                                if result['cached']:
+                                    st.caption("⚡ Résultat servi depuis le cache")
+                                
+                                if result['p_value'] < alpha:
+                                    st.error(f"✅ **Conclusion :** On rejette H₀ au niveau {alpha}. Les groupes {group_a} et {group_b} diffèrent significativement.")
+                                else:
+                                    st.success(f"❌ **Conclusion :** On ne rejette pas H₀ au niveau {alpha}. Pas de différence significative.")
+                                
+                                fig = go.Figure()
+                                fig.add_trace(go.Histogram(x=result['distribution'], nbinsx=60, marker_color='#667eea', name="Permutations"))
+                                fig.add_vline(x=result['observed'], line_color="red", annotation_text="observé")
+                                fig.update_layout(
+                                    title=f"Distribution sous H₀ ({n_resamples:,} permutations)",
+                                    xaxis_title=statistic,
+                                    yaxis_title="Effectif",
+                                    height=400,
+                                    template="plotly_white"
+                                )
+                                st.plotly_chart(fig, width="stretch")
 
 with tab3:
+    st.header("Simulations Monte-Carlo")
+    st.markdown("Vérifiez les résultats théoriques en simulant des millions de tirages.")
+    
+    simulation = st.selectbox(
+        "Choisissez une simulation :",
+        ["Pile ou face (loi des grands nombres)", "Distribution d'échantillonnage (TLC)", "Intervalle de confiance bootstrap"]
+    )
+    
+    parallel = st.checkbox(
+        "Répartir les calculs sur plusieurs processus",
+        value=False,
+        help="Utile au-delà de 10⁸ tirages ; le démarrage des processus coûte environ une seconde."
+    )
+    workers = (os.cpu_count() or 1) if parallel else 1
+    
+    def live_updater(render, steps: int = 10):
+        """Rafraîchit le graphique et la barre de progression une dizaine de fois par simulation"""
+        progress_bar = st.progress(0.0)
+        chart = st.empty()
+        last = {'step': -1}
+        
+        def update(done, total, partial):
+            step = int(done / total * steps)
+            if step != last['step']:
+                last['step'] = step
+                progress_bar.progress(done / total, text=f"{done:,} / {total:,}")
+                chart.plotly_chart(render(partial), width="stretch")
+        
+        return update
+    
+    if simulation == "Pile ou face (loi des grands nombres)":
+        col1, col2 = st.columns([2, 1])
+        
+        with col2:
+            st.subheader("Paramètres")
+            n_flips = st.select_slider(
+                "Nombre de lancers",
+                options=[100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000],
+                value=1_000_000,
+                format_func=lambda v: f"{v:,}"
+            )
+            p = st.slider("Probabilité de pile (p)", 0.05, 0.95, 0.5, 0.05)
+            n_paths = st.slider("Nombre de trajectoires", 1, 10, 3)
+            seed = st.number_input("Graine", value=42, min_value=0, key="coin_seed")
+        
+        start = time.perf_counter()
+        result = coin_flips(n_flips, p, n_paths, seed=seed)
+        elapsed = time.perf_counter() - start
+        
+        with col1:
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(x=result['n'], y=result['upper'], line=dict(width=0), showlegend=False))
+            fig.add_trace(go.Scatter(x=result['n'], y=result['lower'], fill='tonexty', line=dict(width=0),
+                                     fillcolor='rgba(102, 126, 234, 0.15)', name="Bande à 95 %"))
+            for i, path in enumerate(result['proportion']):
+                fig.add_trace(go.Scatter(x=result['n'], y=path, name=f"Trajectoire {i+1}"))
+            fig.add_hline(y=p, line_dash="dash", line_color="red", annotation_text=f"p = {p}")
+            fig.update_layout(
+                title="Proportion de pile au fil des lancers",
+                xaxis_title="Nombre de lancers",
+                yaxis_title="Proportion de pile",
+                xaxis_type="log",
+                height=500,
+                template="plotly_white"
+            )
+            st.plotly_chart(fig, width="stretch")
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Proportion finale (trajectoire 1)", f"{result['final'][0]:.5f}")
+        col2.metric("Écart à p", f"{abs(result['final'][0] - p):.5f}")
+        col3.metric("Temps de calcul", f"{elapsed*1000:.0f} ms")
+        st.info("**Loi des grands nombres :** la proportion observée converge vers p ; l'écart décroît en 1/√n.")
+    
+    elif simulation == "Distribution d'échantillonnage (TLC)":
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            source = st.selectbox("Loi des observations", list(SOURCE_DISTRIBUTIONS.keys()), index=2)
+            statistic = st.selectbox("Statistique", list(STATISTICS.keys()))
+        
+        with col2:
+            n_per_sample = st.slider("Taille de chaque échantillon (n)", 1, 200, 30)
+            n_samples = st.select_slider(
+                "Nombre d'échantillons",
+                options=[1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+                value=100_000,
+                format_func=lambda v: f"{v:,}"
+            )
+            seed = st.number_input("Graine", value=42, min_value=0, key="clt_seed")
+        
+        st.caption(f"Tirages au total : {n_per_sample * n_samples:,}")
+        clt_mean, clt_se = clt_reference(source, n_per_sample)
+        
+        def render_sampling(partial):
+            edges = partial['edges']
+            centers = (edges[:-1] + edges[1:]) / 2
+            width = edges[1] - edges[0]
+            density = partial['counts'] / (partial['n_samples'] * width)
+            
+            fig = go.Figure()
+            fig.add_trace(go.Bar(x=centers, y=density, width=width, name="Simulation", marker_color='#667eea'))
+            if statistic == "moyenne":
+                fig.add_trace(go.Scatter(
+                    x=centers, y=stats.norm.pdf(centers, clt_mean, clt_se),
+                    name="Loi normale (TLC)", line=dict(color='red', width=3)
+                ))
+            fig.update_layout(
+                title=f"Distribution de la {statistic} ({partial['n_samples']:,} échantillons de taille {n_per_sample})",
+                xaxis_title=statistic,
+                yaxis_title="Densité",
+                bargap=0,
+                height=450,
+                template="plotly_white"
+            )
+            return fig
+        
+        if st.button("▶️ Lancer la simulation", type="primary", key="run_clt"):
+            start = time.perf_counter()
+            result = sampling_distribution(
+                source, statistic, n_per_sample, n_samples, seed=seed,
+                workers=workers, progress=live_updater(render_sampling)
+            )
+            elapsed = time.perf_counter() - start
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric(f"Moyenne de la {statistic}", f"{result['mean']:.4f}")
+            col2.metric(f"Écart-type de la {statistic}", f"{result['std']:.4f}")
+            col3.metric("Tirages", f"{result['n_draws']:,}")
+            col4.metric("Temps de calcul", f"{elapsed:.2f} s")
+            
+            if statistic == "moyenne":
+                st.info(f"**Théorème central limite :** x̄ ≈ N({clt_mean:.4f}, {clt_se:.4f}²) — "
+                        f"simulé : moyenne {result['mean']:.4f}, écart-type {result['std']:.4f}")
+    
+    elif simulation == "Intervalle de confiance bootstrap":
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            source = st.selectbox("Loi des observations", list(SOURCE_DISTRIBUTIONS.keys()), index=5, key="boot_source")
+            statistic = st.selectbox("Statistique", list(STATISTICS.keys()), key="boot_statistic")
+            n_observed = st.slider("Taille de l'échantillon observé (n)", 10, 1000, 100)
+        
+        with col2:
+            n_boot = st.select_slider(
+                "Nombre de rééchantillonnages (B)",
+                options=[1_000, 10_000, 100_000],
+                value=10_000,
+                format_func=lambda v: f"{v:,}"
+            )
+            confidence = st.select_slider("Niveau de confiance", options=[0.90, 0.95, 0.99], value=0.95, key="boot_confidence")
+            seed = st.number_input("Graine", value=42, min_value=0, key="boot_seed")
+        
+        data = draw_sample(source, n_observed, seed=seed)
+        
+        def render_bootstrap(values):
+            fig = go.Figure()
+            fig.add_trace(go.Histogram(x=values, nbinsx=60, name="Bootstrap", marker_color='#667eea'))
+            fig.update_layout(
+                title=f"Distribution bootstrap de la {statistic} ({len(values):,} rééchantillonnages)",
+                xaxis_title=statistic,
+                yaxis_title="Effectif",
+                height=450,
+                template="plotly_white"
+            )
+            return fig
+        
+        if st.button("▶️ Lancer le bootstrap", type="primary", key="run_bootstrap"):
+            start = time.perf_counter()
+            result = bootstrap_ci(data, statistic, n_boot, confidence, seed=seed,
+                                  workers=workers, progress=live_updater(render_bootstrap))
+            elapsed = time.perf_counter() - start
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Estimation", f"{result['estimate']:.4f}")
+            col2.metric(f"IC à {confidence*100:.0f}%", f"[{result['lower']:.3f}, {result['upper']:.3f}]")
+            col3.metric("Erreur standard", f"{result['se']:.4f}")
+            col4.metric("Temps de calcul", f"{elapsed:.2f} s")
+            
+            if statistic == "moyenne":
+                true_mean = SOURCE_DISTRIBUTIONS[source]["mean"]
+                covered = result['lower'] <= true_mean <= result['upper']
+                st.info(f"**Vraie moyenne de la loi :** {true_mean:.4f} — "
+                        f"{'contenue' if covered else 'non contenue'} dans l'intervalle.")
+
+with tab4:
     st.header("Exercices Pratiques")
     
-    DATA_FILE = Path("data/stats_exercises.json")
+    st.markdown("Chaque série est générée à partir de modèles : les valeurs changent d'une série à l'autre, "
+                "les réponses sont calculées automatiquement.")
+    
+    if 'exercise_seed' not in st.session_state:
+        st.session_state.exercise_seed = secrets.randbelow(1_000_000)
     
-    exercises = [
-        {
-            "id": 1,
-            "niveau": "B1",
-            "question": "Une variable aléatoire X suit une loi normale N(100, 15²). Quelle est la probabilité que X soit supérieure à 115 ?",
-            "options": ["0.16", "0.32", "0.68", "0.84"],
-            "correct": 0,
-            "explication": "P(X > 115) = P(Z > 1) = 1 - Φ(1) ≈ 1 - 0.84 = 0.16"
-        },
-        {
-            "id": 2,
-            "niveau": "B1",
-            "question": "On lance 20 fois une pièce équilibrée. Quelle est la probabilité d'obtenir exactement 10 fois pile ?",
-            "options": ["0.176", "0.25", "0.5", "0.10"],
-            "correct": 0,
-            "explication": "X ~ B(20, 0.5). P(X=10) = C(20,10) × 0.5²⁰ ≈ 0.176"
-        },
-        {
-            "id": 3,
-            "niveau": "B2",
-            "question": "Un test statistique donne une p-value de 0.03. Au seuil α=0.05, quelle est la décision ?",
-            "options": ["Rejeter H₀", "Ne pas rejeter H₀", "Impossible à décider", "Refaire le test"],
-            "correct": 0,
-            "explication": "p-value (0.03) < α (0.05), donc on rejette l'hypothèse nulle H₀"
-        },
-        {
-            "id": 4,
-            "niveau": "B2",
-            "question": "Pour un échantillon de taille n=25 avec s=10, quelle distribution utiliser pour l'IC de la moyenne ?",
-            "options": ["Loi de Student", "Loi normale", "Loi du Chi²", "Loi de Poisson"],
-            "correct": 0,
-            "explication": "Pour n<30 et σ inconnu, on utilise la loi de Student avec n-1=24 degrés de liberté"
-        },
-        {
-            "id": 5,
-            "niveau": "B3",
-            "question": "Quel test utiliser pour comparer les moyennes de 3 groupes indépendants ?",
-            "options": ["ANOVA", "Test t de Student", "Test Z", "Test du Chi²"],
-            "correct": 0,
-            "explication": "L'ANOVA (Analysis of Variance) est utilisée pour comparer plus de 2 moyennes"
-        }
-    ]
+    col1, col2, col3 = st.columns([1, 1, 1])
     
-    niveau_filter = st.selectbox("Filtrer par niveau", ["Tous", "B1", "B2", "B3"])
+    with col1:
+        niveau_filter = st.selectbox("Filtrer par niveau", ["Tous", "B1", "B2", "B3"])
+    with col2:
+        seed = st.number_input("Numéro de série", min_value=0, max_value=999_999,
+                               value=st.session_state.exercise_seed,
+                               help="Partagez ce numéro pour retrouver exactement la même série")
+        st.session_state.exercise_seed = int(seed)
+    with col3:
+        st.write("")
+        if st.button("🔄 Nouvelle série"):
+            st.session_state.exercise_seed = secrets.randbelow(1_000_000)
+            st.rerun()
     
-    filtered_exercises = exercises if niveau_filter == "Tous" else [e for e in exercises if e["niveau"] == niveau_filter]
+    filtered_exercises = problem_set(st.session_state.exercise_seed, None if niveau_filter == "Tous" else niveau_filter)
     
-    for ex in filtered_exercises:
-        with st.expander(f"📝 Exercice {ex['id']} - Niveau {ex['niveau']}"):
+    for i, ex in enumerate(filtered_exercises, 1):
+        with st.expander(f"📝 Exercice {i} - Niveau {ex['niveau']} - {TEMPLATES[ex['type']]['titre']}"):
             st.markdown(f"**Question :** {ex['question']}")
             
             answer = st.radio(
                 "Votre réponse :",
                 ex["options"],
-                key=f"ex_{ex['id']}"
+                key=f"ex_{ex['exercise_id']}"
             )
             
-            if st.button("Vérifier", key=f"btn_{ex['id']}"):
+            if st.button("Vérifier", key=f"btn_{ex['exercise_id']}"):
                 selected_index = ex["options"].index(answer)
-                if selected_index == ex["correct"]:
+                if selected_index == ex["correct_index"]:
                     st.success("✅ Bonne réponse !")
                     st.info(f"**Explication :** {ex['explication']}")
                 else:
-                    st.error(f"❌ Mauvaise réponse. La bonne réponse est : {ex['options'][ex['correct']]}")
+                    st.error(f"❌ Mauvaise réponse. La bonne réponse est : {ex['options'][ex['correct_index']]}")
                     st.info(f"**Explication :** {ex['explication']}")
 
-with tab4:
+with tab5:
     st.header("📖 Formulaire de Statistiques")
     
     col1, col2 = st.columns(2)